@@ -397,6 +397,19 @@ TOOL_DISK_USAGE = {
     }
 }
 
+TOOL_COUNT_LINES = {
+    "name": "count_lines",
+    "description": "Count lines and files per file extension under a directory (like find | xargs wc -l, without the shell). Skips .git, node_modules, venvs, binaries and .gitignore'd paths.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Directory to count"},
+            "include": {"type": "array", "items": {"type": "string"}, "description": "Optional filename globs to count, e.g. ['*.py', '*.ts'] (default: all text files)"}
+        },
+        "required": ["path"]
+    }
+}
+
 TOOL_COMPRESS = {
     "name": "compress",
     "description": "Compress files/directories into a zip or tar.gz archive.",
@@ -12,38 +12,243 @@
 ╚══════════════════════════════════════════════════════════════╝
 """
 
+import io
+import os
+import re
+import sys
 import json
 import time
+import hashlib
+import atexit
+import queue
+import string
+import tempfile
+import threading
 import subprocess
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from utils.event_bus import event_bus
 from utils.agent_monitor import agent_monitor
+from agents.agent_tools import TOOL_DONE, TOOL_STUCK
 
 
 # ─────────────────────────────────────────────
 #  iMessage progress helper
 # ─────────────────────────────────────────────
 
+# Single-pass escape table for AppleScript string literals
+_ESC = str.maketrans({"\\": "\\\\", '"': '\\"', "\r": "\\r", "\n": "\\n"})
+
+# Sender handler, compiled once to a .scpt so osascript never re-parses it
+_SCPT_SOURCE = """
+on run {phone, msg}
+    tell application "Messages"
+        set targetService to 1st account whose service type = iMessage
+        send msg to participant phone of targetService
+    end tell
+end run
+"""
+# Named by the source's hash, so an edit to _SCPT_SOURCE never loads a stale build
+_SCPT_PATH = os.path.join(
+    tempfile.gettempdir(),
+    f"tars_progress_{hashlib.sha1(_SCPT_SOURCE.encode()).hexdigest()[:12]}.scpt",
+)
+
+# One line per message — the interactive interpreter runs each line as it arrives
+_TMPL = string.Template(
+    'tell application "Messages" to send "$msg" to participant "$phone" of '
+    '(1st account whose service type = iMessage)\n'
+)
+_RUN_TMPL = string.Template('run script tarsProgress with parameters {"$phone", "$msg"}\n')
+
+
+def _compiled_script():
+    """Path to the precompiled sender script, building it on first use (None if osacompile fails)."""
+    if os.path.exists(_SCPT_PATH):
+        return _SCPT_PATH
+    # Build beside the target and rename, so no process ever loads a half-written file
+    tmp = f"{_SCPT_PATH}.{os.getpid()}.tmp"
+    try:
+        subprocess.run(["osacompile", "-o", tmp, "-e", _SCPT_SOURCE],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15)
+        os.replace(tmp, _SCPT_PATH)
+    except Exception:
+        return None
+    return _SCPT_PATH
+
+
+class _OsaWorker:
+    """
+    One long-lived `osascript -i` process shared by every agent.
+
+    Spawning osascript costs 100-500ms per call, and progress updates
+    fire several times per agent run. The interactive interpreter stays
+    up, loads the precompiled sender once, and we feed it one line per
+    message over stdin. Falls back to a one-shot osascript if the worker
+    can't be started.
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._tmpl = _TMPL
+        self._lock = threading.Lock()
+
+    def _ensure(self):
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["osascript", "-i"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            scpt = _compiled_script()
+            if scpt:
+                self._proc.stdin.write(
+                    f'set tarsProgress to load script (POSIX file "{scpt.translate(_ESC)}")\n')
+                self._tmpl = _RUN_TMPL
+            else:
+                self._tmpl = _TMPL
+        return self._proc
+
+    def send(self, phone, message):
+        with self._lock:
+            try:
+                proc = self._ensure()
+                proc.stdin.write(self._tmpl.substitute(
+                    phone=phone.translate(_ESC), msg=message.translate(_ESC)))
+                proc.stdin.flush()
+                return
+            except Exception:
+                self._proc = None
+        self._send_once(phone, message)
+
+    @staticmethod
+    def _send_once(phone, message):
+        scpt = _compiled_script()
+        if scpt:
+            argv = ["osascript", scpt, phone, message]
+        else:
+            # Use argv to avoid AppleScript injection — message never enters eval context
+            script = f'''
+            on run argv
+                set msg to item 1 of argv
+                tell application "Messages"
+                    set targetService to 1st account whose service type = iMessage
+                    set targetBuddy to participant "{phone}" of targetService
+                    send msg to targetBuddy
+                end tell
+            end run
+            '''
+            argv = ["osascript", "-e", script, message]
+        try:
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10)
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                try:
+                    self._proc.stdin.close()
+                except Exception:
+                    pass
+            self._proc = None
+
+
+_osa_worker = _OsaWorker()
+
+
+_TRANSIENT_RE = re.compile(r"tool_use_failed|rate[_ ]?limit", re.I)
+_TRANSIENT_STATUS = frozenset((408, 429, 500, 502, 503, 504))
+
+
+def _is_transient(err):
+    """Retryable LLM error? Typed status code first, message scan as fallback."""
+    if getattr(err, "status_code", None) in _TRANSIENT_STATUS:
+        return True
+    return _TRANSIENT_RE.search(str(err)) is not None
+
+
+def _trunc(s, n):
+    """Cap s at n chars — returns s itself (no copy) when it already fits."""
+    return s if len(s) <= n else s[:n]
+
+
+def _short_input(inp):
+    """≤120-char preview of tool input without serializing huge string fields."""
+    clipped = {k: (v[:60] + "…" if isinstance(v, str) and len(v) > 60 else v)
+               for k, v in inp.items()}
+    return json.dumps(clipped)[:120]
+
+
+# One pool for every agent's concurrent read-only tool calls. Agents are
+# created per task, so a pool each would leave idle threads behind them.
+_tool_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-tool")
+
+
+def _flush(buf):
+    """Write everything buffered in buf to stdout in one call, then reset it."""
+    data = buf.getvalue()
+    if data:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+        buf.seek(0)
+        buf.truncate()
+
+
+_notify_q = queue.Queue()
+_drain_thread = None
+_drain_lock = threading.Lock()
+
+
+def _drain():
+    """Background sender — coalesces bursts into one iMessage per phone."""
+    while True:
+        batch = [_notify_q.get()]
+        time.sleep(0.2)  # let a burst (e.g. done right after a step update) pile up
+        while True:
+            try:
+                batch.append(_notify_q.get_nowait())
+            except queue.Empty:
+                break
+        by_phone = {}
+        for phone, message in batch:
+            by_phone.setdefault(phone, []).append(message)
+        try:
+            for phone, messages in by_phone.items():
+                _osa_worker.send(phone, "\n---\n".join(messages))
+        finally:
+            for _ in batch:
+                _notify_q.task_done()
+
+
+def _shutdown_progress(timeout=3.0):
+    """At exit: give queued updates up to timeout to go out, then stop the worker."""
+    deadline = time.monotonic() + timeout
+    with _notify_q.all_tasks_done:
+        while _notify_q.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _notify_q.all_tasks_done.wait(remaining)
+    _osa_worker.close()
+
+
+atexit.register(_shutdown_progress)
+
+
 def _send_progress(phone, message):
-    """Send a short iMessage progress update (bypasses rate limit)."""
+    """Queue a short iMessage progress update (bypasses rate limit, never blocks)."""
+    global _drain_thread
     if not phone:
         return
-    # Use argv to avoid AppleScript injection — message never enters eval context
-    script = f'''
-    on run argv
-        set msg to item 1 of argv
-        tell application "Messages"
-            set targetService to 1st account whose service type = iMessage
-            set targetBuddy to participant "{phone}" of targetService
-            send msg to targetBuddy
-        end tell
-    end run
-    '''
-    try:
-        subprocess.run(["osascript", "-e", script, message],
-                       capture_output=True, text=True, timeout=10)
-    except Exception:
-        pass
+    if _drain_thread is None:
+        with _drain_lock:
+            if _drain_thread is None:
+                _drain_thread = threading.Thread(target=_drain, daemon=True, name="agent-notify")
+                _drain_thread.start()
+    _notify_q.put((phone, message))
 
 
 class BaseAgent(ABC):
@@ -56,8 +261,19 @@ class BaseAgent(ABC):
       - system_prompt     (str)  — The agent's system prompt
       - tools            (list) — Tool definitions (Anthropic schema)
       - _dispatch(name, inp) → str  — Route tool calls to handlers
+
+    Subclasses may list read-only tools in `parallel_tools`; when one
+    response asks for several of them they are dispatched concurrently.
     """
 
+    __slots__ = (
+        "client", "model", "max_steps", "phone", "update_every",
+        "_kill_event", "_pool", "_agent_key",
+    )
+
+    # Tools with no side effects that may run concurrently within one step
+    parallel_tools = frozenset()
+
     def __init__(self, llm_client, model, max_steps=40, phone=None, update_every=3, kill_event=None):
         self.client = llm_client
         self.model = model
@@ -65,6 +281,8 @@ class BaseAgent(ABC):
         self.phone = phone
         self.update_every = update_every
         self._kill_event = kill_event  # Shared threading.Event — set when kill word received
+        self._pool = _tool_pool  # Shared; never shut down per agent
+        self._agent_key = self.agent_name.lower().split()[0]  # "browser", "coder", … for event payloads
 
     # ── Abstract properties/methods subclasses must implement ──
 
@@ -97,6 +315,24 @@ class BaseAgent(ABC):
         """Route a tool call to the actual handler. Return result as string."""
         ...
 
+    @property
+    def _tools_cached(self):
+        """Tool list assembled once per subclass (done/stuck appended if missing).
+
+        Every step hands the client the exact same list object instead of
+        whatever `tools` rebuilds on each access.
+        """
+        cls = type(self)
+        cached = cls.__dict__.get("_tool_schemas")
+        if cached is None:
+            cached = list(self.tools)
+            names = {t["name"] for t in cached}
+            for terminal in (TOOL_DONE, TOOL_STUCK):
+                if terminal["name"] not in names:
+                    cached.append(terminal)
+            cls._tool_schemas = cached
+        return cached
+
     # ── Optional hooks subclasses can override ──
 
     def _on_start(self, task: str):
@@ -115,6 +351,12 @@ class BaseAgent(ABC):
         """Called when agent calls stuck(). Override for cleanup."""
         pass
 
+    def _on_finish(self):
+        """Called on every exit from run() — done, stuck, kill switch, API
+        error, max steps or an exception. Override for cleanup that must
+        always happen (e.g., stopping background threads)."""
+        pass
+
     # ── Core agent loop ──
 
     def _notify(self, msg):
@@ -138,24 +380,36 @@ class BaseAgent(ABC):
                 stuck   (bool)  — Whether the agent got stuck (for escalation)
                 stuck_reason (str) — Why it got stuck (if stuck=True)
         """
-        print(f"  {self.agent_emoji} {self.agent_name}: {task[:80]}...")
-        self._notify(f"{self.agent_emoji} {self.agent_name} starting: {task[:300]}")
+        try:
+            return self._run(task, context)
+        finally:
+            self._on_finish()
+
+    def _run(self, task, context):
+        print(f"  {self.agent_emoji} {self.agent_name}: {_trunc(task, 80)}...")
+        self._notify(f"{self.agent_emoji} {self.agent_name} starting: {_trunc(task, 300)}")
 
         # Let subclass do setup
         self._on_start(task)
 
         # Build initial message with optional context
-        user_content = f"Complete this task:\n\n{task}"
         if context:
-            user_content += f"\n\n## Additional Context from Brain\n{context}"
+            user_content = f"Complete this task:\n\n{task}\n\n## Additional Context from Brain\n{context}"
+        else:
+            user_content = f"Complete this task:\n\n{task}"
 
         messages = [{"role": "user", "content": user_content}]
 
+        # Fixed for the whole run — bind once instead of re-reading per step
+        _system = self.system_prompt
+        _tools = self._tools_cached
+        _model = self.model
+        _create = self.client.create
+
         for step in range(1, self.max_steps + 1):
             print(f"  🧠 [{self.agent_name}] Step {step}/{self.max_steps}...")
-            agent_key = self.agent_name.lower().split()[0]
-            event_bus.emit("agent_step", {"agent": agent_key, "step": step})
-            agent_monitor.on_step(agent_key, step)
+            event_bus.emit("agent_step", {"agent": self._agent_key, "step": step})
+            agent_monitor.on_step(self._agent_key, step)
 
             # ── Kill switch check — abort immediately ──
             if self._kill_event and self._kill_event.is_set():
@@ -174,21 +428,19 @@ class BaseAgent(ABC):
             last_err = None
             for _api_try in range(3):
                 try:
-                    response = self.client.create(
-                        model=self.model,
+                    response = _create(
+                        model=_model,
                         max_tokens=4096,
-                        system=self.system_prompt,
-                        tools=self.tools,
+                        system=_system,
+                        tools=_tools,
                         messages=messages,
                     )
                     break
                 except Exception as e:
                     last_err = e
-                    err_str = str(e)
-                    # Groq tool_use_failed is transient — retry
-                    if "tool_use_failed" in err_str or "rate_limit" in err_str.lower():
-                        import time as _t
-                        _t.sleep(1.0 * (_api_try + 1))
+                    # Groq tool_use_failed / rate limits / 5xx are transient — retry
+                    if _is_transient(e):
+                        time.sleep(_api_try + 1)
                         print(f"    ⟳ Retrying LLM call ({_api_try + 2}/3)...")
                         continue
                     break  # Non-transient error, stop retrying
@@ -207,10 +459,29 @@ class BaseAgent(ABC):
 
             assistant_content = response.content
             tool_results = []
+            text_parts = []
+            buf = io.StringIO()  # this step's log lines, written out in one go
+
+            # Independent read-only calls in the same response run side by side.
+            # Only the leading run of them: a read after a write (or after
+            # done/stuck, which may end the step) must wait its turn.
+            futures = {}
+            if self.parallel_tools:
+                batch = []
+                for b in assistant_content:
+                    if b.type != "tool_use":
+                        continue
+                    if b.name not in self.parallel_tools:
+                        break
+                    batch.append(b)
+                if len(batch) > 1:
+                    futures = {b.id: self._pool.submit(self._dispatch, b.name, b.input) for b in batch}
 
             for block in assistant_content:
-                if block.type == "text" and block.text.strip():
-                    print(f"    💭 {block.text[:200]}")
+                if block.type == "text":
+                    text_parts.append(block.text)
+                    if block.text.strip():
+                        buf.write(f"    💭 {block.text[:200]}\n")
 
                 elif block.type == "tool_use":
                     name = block.name
@@ -236,7 +507,7 @@ class BaseAgent(ABC):
 
                         if real_tool_steps < min_steps and is_vague:
                             # Reject — force agent to actually do work
-                            print(f"  ⚠️ [{self.agent_name}] Rejected premature done (only {real_tool_steps} real steps, vague summary)")
+                            buf.write(f"  ⚠️ [{self.agent_name}] Rejected premature done (only {real_tool_steps} real steps, vague summary)\n")
                             tool_results.append({
                                 "type": "tool_result",
                                 "tool_use_id": tid,
@@ -251,7 +522,8 @@ class BaseAgent(ABC):
                             })
                             continue
 
-                        print(f"  ✅ [{self.agent_name}] Done: {summary[:200]}")
+                        buf.write(f"  ✅ [{self.agent_name}] Done: {summary[:200]}\n")
+                        _flush(buf)
                         self._notify(f"✅ {self.agent_name} done: {summary[:500]}")
                         self._on_done(summary)
                         return {
@@ -265,7 +537,8 @@ class BaseAgent(ABC):
                     # ── Terminal tool: stuck ──
                     if name == "stuck":
                         reason = inp.get("reason", "Unknown reason.")
-                        print(f"  ❌ [{self.agent_name}] Stuck: {reason[:200]}")
+                        buf.write(f"  ❌ [{self.agent_name}] Stuck: {reason[:200]}\n")
+                        _flush(buf)
                         self._notify(f"⚠️ {self.agent_name} stuck: {reason[:500]}")
                         self._on_stuck(reason)
                         return {
@@ -277,11 +550,12 @@ class BaseAgent(ABC):
                         }
 
                     # ── Regular tool: dispatch ──
-                    inp_short = json.dumps(inp)[:120]
-                    print(f"    🔧 {name}({inp_short})")
-                    result = self._dispatch(name, inp)
-                    result_str = str(result)[:8000]
-                    print(f"      → {result_str[:200]}")
+                    buf.write(f"    🔧 {name}({_short_input(inp)})\n")
+                    _flush(buf)  # tools may print on their own — keep ordering
+                    fut = futures.get(tid)
+                    result = fut.result() if fut is not None else self._dispatch(name, inp)
+                    result_str = _trunc(result if isinstance(result, str) else str(result), 8000)
+                    buf.write(f"      → {_trunc(result_str, 200)}\n")
 
                     tool_results.append({
                         "type": "tool_result",
@@ -294,16 +568,16 @@ class BaseAgent(ABC):
 
                     # Periodic progress update
                     if step % self.update_every == 0:
-                        short = result_str[:200] + ("..." if len(result_str) > 200 else "")
+                        short = result_str if len(result_str) <= 200 else result_str[:200] + "..."
                         self._notify(f"{self.agent_emoji} Step {step}: {name}\n→ {short}")
 
             # No tool calls — nudge the agent
             if not tool_results:
                 if response.stop_reason == "end_turn":
-                    texts = [b.text for b in assistant_content if b.type == "text"]
-                    txt = " ".join(texts).strip()
+                    txt = " ".join(text_parts).strip()
                     if txt:
-                        print(f"  ⚠️ [{self.agent_name}] Text-only: {txt[:200]}")
+                        buf.write(f"  ⚠️ [{self.agent_name}] Text-only: {txt[:200]}\n")
+                    _flush(buf)
                     messages.append({"role": "assistant", "content": assistant_content})
                     messages.append({
                         "role": "user",
@@ -311,6 +585,7 @@ class BaseAgent(ABC):
                     })
                     continue
 
+            _flush(buf)
             messages.append({"role": "assistant", "content": assistant_content})
             messages.append({"role": "user", "content": tool_results})
 
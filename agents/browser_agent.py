@@ -12,6 +12,8 @@
 ╚══════════════════════════════════════════════════════════════╝
 """
 
+import time
+
 from agents.base_agent import BaseAgent
 from agents.agent_tools import TOOL_DONE, TOOL_STUCK
 
@@ -29,7 +31,7 @@ from hands.browser import (
 #  Browser-Specific Tool Definitions
 # ─────────────────────────────────────────────
 
-BROWSER_TOOLS = [
+BROWSER_TOOLS = (
     {
         "name": "look",
         "description": "Look at the current page. Shows all visible fields, buttons, dropdowns, links, and checkboxes with their selectors. ALWAYS do this first before interacting.",
@@ -127,7 +129,28 @@ BROWSER_TOOLS = [
     },
     TOOL_DONE,
     TOOL_STUCK,
-]
+)
+
+
+# ─────────────────────────────────────────────
+#  Chrome activation guard
+# ─────────────────────────────────────────────
+
+_CHROME_ACTIVATE_TTL = 60.0  # seconds
+_chrome_activated_at = None
+
+
+def _ensure_chrome_active():
+    """Activate Chrome at most once per TTL across back-to-back tasks.
+
+    Every act_* call re-checks the CDP connection anyway, so skipping
+    the start-of-task activation inside the window is safe.
+    """
+    global _chrome_activated_at
+    now = time.monotonic()
+    if _chrome_activated_at is None or now - _chrome_activated_at > _CHROME_ACTIVATE_TTL:
+        _activate_chrome()
+        _chrome_activated_at = now
 
 
 # ─────────────────────────────────────────────
@@ -214,48 +237,68 @@ Skipping ANY of these steps = potential hallucination. Do NOT shortcut."""
 class BrowserAgent(BaseAgent):
     """Autonomous browser agent — controls Chrome physically like a human."""
 
-    @property
-    def agent_name(self):
-        return "Browser Agent"
-
-    @property
-    def agent_emoji(self):
-        return "🌐"
-
-    @property
-    def system_prompt(self):
-        return BROWSER_SYSTEM_PROMPT
+    __slots__ = ()
 
-    @property
-    def tools(self):
-        return BROWSER_TOOLS
+    # Read-only constants — plain class attributes satisfy the abstract
+    # properties on BaseAgent without a descriptor call on every access.
+    agent_name = "Browser Agent"
+    agent_emoji = "🌐"
+    system_prompt = BROWSER_SYSTEM_PROMPT
+    tools = BROWSER_TOOLS
 
     def _on_start(self, task):
         """Activate Chrome before starting."""
-        _activate_chrome()
+        _ensure_chrome_active()
+
+    # Tools that take no input — called directly, no wrapper, checked first
+    _NOARG = {
+        "look":       act_inspect_page,
+        "read":       act_read_page,
+        "url":        act_read_url,
+        "tabs":       act_get_tabs,
+        "close_tab":  act_close_tab,
+        "back":       act_back,
+        "forward":    act_forward,
+        "refresh":    act_refresh,
+        "screenshot": act_screenshot,
+    }
+
+    # Tool name → handler taking the raw input dict. Built once at import;
+    # each act_* is bound as a default arg so the call is a LOAD_FAST.
+    _ARG = {
+        "goto":       lambda inp, _f=act_goto: _f(inp["url"]),
+        "click":      lambda inp, _f=act_click: _f(inp["target"]),
+        "type":       lambda inp, _f=act_fill: _f(inp["selector"], inp["text"]),
+        "select":     lambda inp, _f=act_select_option: _f(inp["dropdown"], inp["option"]),
+        "key":        lambda inp, _f=act_press_key: _f(inp["name"]),
+        "scroll":     lambda inp, _f=act_scroll: _f(inp.get("direction", "down")),
+        "wait":       lambda inp, _f=act_wait: _f(inp.get("seconds", 2)),
+        "wait_for":   lambda inp, _f=act_wait_for_text: _f(inp["text"]),
+        "switch_tab": lambda inp, _f=act_switch_tab: _f(inp["number"]),
+        "js":         lambda inp, _f=act_run_js: _f(inp["code"]),
+    }
 
     def _dispatch(self, name, inp):
-        """Route browser tool calls."""
+        """Route browser tool calls.
+
+        Dict lookup rather than `match name:` — CPython compiles string
+        cases to a chain of equality tests, so later tools (js, switch_tab)
+        would pay for every case ahead of them; the tables are O(1) for all.
+        """
+        # The error boundary lives here, at the tool boundary: act_* raise,
+        # so internal callers (act_google, flight booking) see failures
         try:
-            if name == "look":       return act_inspect_page()
-            if name == "goto":       return act_goto(inp["url"])
-            if name == "click":      return act_click(inp["target"])
-            if name == "type":       return act_fill(inp["selector"], inp["text"])
-            if name == "select":     return act_select_option(inp["dropdown"], inp["option"])
-            if name == "key":        return act_press_key(inp["name"])
-            if name == "scroll":     return act_scroll(inp.get("direction", "down"))
-            if name == "read":       return act_read_page()
-            if name == "url":        return act_read_url()
-            if name == "wait":       return act_wait(inp.get("seconds", 2))
-            if name == "wait_for":   return act_wait_for_text(inp["text"])
-            if name == "tabs":       return act_get_tabs()
-            if name == "switch_tab": return act_switch_tab(inp["number"])
-            if name == "close_tab":  return act_close_tab()
-            if name == "back":       return act_back()
-            if name == "forward":    return act_forward()
-            if name == "refresh":    return act_refresh()
-            if name == "screenshot": return act_screenshot()
-            if name == "js":         return act_run_js(inp["code"])
-            return f"Unknown browser tool: {name}"
+            fn = self._NOARG.get(name)
+            if fn is not None:
+                return fn()
+            fn = self._ARG.get(name)
+            if fn is None:
+                return f"Unknown browser tool: {name}"
+            try:
+                return fn(inp)
+            except KeyError as e:
+                if e.args and e.args[0] not in inp:
+                    return f"ERROR: missing required input {e}"
+                raise  # A KeyError from inside the action itself
         except Exception as e:
-            return f"ERROR: {e}"
+            return f"ERROR: {type(e).__name__}: {e}"
@@ -12,8 +12,6 @@
 """
 
 import os
-import subprocess
-import shutil
 
 from agents.base_agent import BaseAgent
 from agents.agent_tools import (
@@ -23,6 +21,13 @@ from agents.agent_tools import (
 )
 from hands.terminal import run_terminal
 from hands.file_manager import read_file, write_file, list_directory
+from hands.fast_search import search_content, find_files, clear_cache as clear_search_cache
+
+# Files search_files looks inside for content matches
+_SEARCH_GLOBS = (
+    "*.py", "*.js", "*.ts", "*.html", "*.css", "*.json",
+    "*.yaml", "*.yml", "*.md", "*.txt",
+)
 
 
 # ─────────────────────────────────────────────
@@ -77,6 +82,12 @@ CODER_SYSTEM_PROMPT = """You are TARS Coder Agent — the world's best software
 class CoderAgent(BaseAgent):
     """Autonomous coding agent — writes, debugs, tests, and deploys code."""
 
+    __slots__ = ()
+
+    parallel_tools = frozenset((
+        "read_file", "list_dir", "search_files",
+    ))
+
     @property
     def agent_name(self):
         return "Coder Agent"
@@ -99,6 +110,8 @@ class CoderAgent(BaseAgent):
 
     def _dispatch(self, name, inp):
         """Route coder tool calls to actual handlers."""
+        if name not in self.parallel_tools:
+            clear_search_cache()  # May have changed files
         try:
             if name == "run_command":
                 result = run_terminal(inp["command"], timeout=inp.get("timeout", 60))
@@ -158,14 +171,17 @@ class CoderAgent(BaseAgent):
             with open(path, "r", encoding="utf-8") as f:
                 content = f.read()
 
-            if old_string not in content:
+            # One find() locates the edit; a second, from just past it, is
+            # enough to rule out a duplicate — count() only on the error path
+            idx = content.find(old_string)
+            if idx < 0:
                 return f"ERROR: old_string not found in {path}. Use read_file to see current contents."
 
-            count = content.count(old_string)
-            if count > 1:
+            if content.find(old_string, idx + max(len(old_string), 1)) >= 0:
+                count = content.count(old_string)
                 return f"ERROR: old_string found {count} times in {path}. Make it more specific (include surrounding lines)."
 
-            new_content = content.replace(old_string, new_string, 1)
+            new_content = content[:idx] + new_string + content[idx + len(old_string):]
             with open(path, "w", encoding="utf-8") as f:
                 f.write(new_content)
 
@@ -178,20 +194,12 @@ class CoderAgent(BaseAgent):
     def _search_files(self, pattern, directory, content_search):
         """Search files by name or content."""
         try:
-            directory = os.path.expanduser(directory)
             if content_search:
                 # Grep for content
-                result = run_terminal(
-                    f"grep -rn --include='*.py' --include='*.js' --include='*.ts' --include='*.html' --include='*.css' --include='*.json' --include='*.yaml' --include='*.yml' --include='*.md' --include='*.txt' '{pattern}' '{directory}' 2>/dev/null | head -50",
-                    timeout=15
-                )
-                return result.get("content", "(no results)")
+                result = search_content(pattern, directory, include=_SEARCH_GLOBS, limit=50)
             else:
                 # Find by filename pattern
-                result = run_terminal(
-                    f"find '{directory}' -name '{pattern}' -not -path '*/node_modules/*' -not -path '*/.git/*' -not -path '*/venv/*' 2>/dev/null | head -50",
-                    timeout=15
-                )
-                return result.get("content", "(no results)")
-        except Exception as e:
+                result = find_files(pattern, directory, limit=50)
+            return result.get("content", "(no results)")
+        except OSError as e:
             return f"ERROR searching: {e}"
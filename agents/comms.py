@@ -12,11 +12,28 @@
 
 import time
 import threading
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 
-@dataclass
+_HANDOFF_TEMPLATE = (
+    "=== HANDOFF FROM {FROM} AGENT ===\n"
+    "Previous agent ({FROM_LOWER}) worked on this task and provides context:\n"
+    "{CTX}\n"
+    "{TASK_LINE}\n"
+    "{SCRATCHPAD}"
+    "=== END HANDOFF ==="
+)
+
+
+# Agent names come from a small fixed set — upper-case each one once
+_agent_name_upper = lru_cache(maxsize=16)(str.upper)
+
+
+@dataclass(slots=True)
 class AgentMessage:
     """A message passed between agents via the brain."""
     from_agent: str
@@ -25,6 +42,9 @@ class AgentMessage:
     msg_type: str = "info"       # info, request, result, handoff, scratchpad
     timestamp: float = field(default_factory=time.time)
     metadata: Dict = field(default_factory=dict)
+    preview: str = field(default="", repr=False)    # First PREVIEW_LEN chars of content
+    formatted: str = field(default="", repr=False)  # Log line, rendered once at send()
+    digest: int = field(default=0, repr=False)      # hash() of the full content, for repeats
 
 
 @dataclass
@@ -48,25 +68,67 @@ class AgentComms:
     downstream agents don't have to re-discover information.
     """
 
+    MAX_MESSAGES = 2048         # Log window — older messages fall off the front
+    PREVIEW_LEN = 200           # Chars of content kept for the conversation log
+    STORE_FULL_CONTENT = False  # Keep only the preview — nothing reads full bodies back
+
     def __init__(self):
-        self._messages: List[AgentMessage] = []
+        self._messages: Deque[AgentMessage] = deque(maxlen=self.MAX_MESSAGES)
         self._handoff_context: Dict[str, str] = {}  # agent → context from prev agent
         self._scratchpad: Dict[str, ScratchpadEntry] = {}  # key → entry
         self._scratchpad_lock = threading.Lock()
+        # Guards _messages and _handoff_context. deque.append alone is atomic,
+        # but readers iterate the deque and would trip over a concurrent append.
+        self._messages_lock = threading.Lock()
 
     def send(self, from_agent: str, to_agent: str, content: str,
              msg_type: str = "info", metadata: Dict = None) -> AgentMessage:
-        """Record a message from one agent to another."""
-        msg = AgentMessage(
-            from_agent=from_agent,
-            to_agent=to_agent,
-            content=content,
-            msg_type=msg_type,
-            metadata=metadata or {},
-        )
-        self._messages.append(msg)
+        """Record a message from one agent to another.
+
+        Long LLM outputs are cut to PREVIEW_LEN up front unless
+        STORE_FULL_CONTENT is set, so a full log window stays small.
+
+        A repeat of the previous message (same sender, recipient, type,
+        metadata and full content) is folded into it: metadata["count"] goes
+        up, the timestamp moves forward, and the log line shows "(×N)".
+        The caller's metadata dict is copied, never written to.
+        """
+        preview = content[:self.PREVIEW_LEN]
+        stored = content if self.STORE_FULL_CONTENT else preview
+        digest = hash(content)
+        metadata = dict(metadata) if metadata else {}
+        with self._messages_lock:
+            if self._messages:
+                last = self._messages[-1]
+                if (last.digest == digest and last.content == stored
+                        and last.from_agent == from_agent
+                        and last.to_agent == to_agent and last.msg_type == msg_type
+                        and {k: v for k, v in last.metadata.items() if k != "count"} == metadata):
+                    count = last.metadata.get("count", 1) + 1
+                    last.metadata["count"] = count
+                    last.timestamp = time.time()
+                    last.formatted = self._format(last, f" (×{count})")
+                    return last
+
+            msg = AgentMessage(
+                from_agent=from_agent,
+                to_agent=to_agent,
+                content=stored,
+                msg_type=msg_type,
+                metadata=metadata,
+                preview=preview,
+                digest=digest,
+            )
+            msg.formatted = self._format(msg)
+            self._messages.append(msg)
         return msg
 
+    @staticmethod
+    def _format(msg: AgentMessage, suffix: str = "") -> str:
+        """Render the conversation-log line for a message."""
+        ts = time.strftime("%H:%M:%S", time.localtime(msg.timestamp))
+        return f"[{ts}] {msg.from_agent} → {msg.to_agent} ({msg.msg_type}): {msg.preview}{suffix}"
+
     # ─── Structured Scratchpad ───────────────────────
 
     def write_scratchpad(self, key: str, value: Any, data_type: str,
@@ -131,19 +193,16 @@ class AgentComms:
         # Include scratchpad summary if there's data
         scratchpad_info = self.get_scratchpad_summary()
         
-        handoff_text = (
-            f"=== HANDOFF FROM {from_agent.upper()} AGENT ===\n"
-            f"Previous agent ({from_agent}) worked on this task and provides context:\n"
-            f"{context}\n"
-            f"{'Task for you: ' + task if task else ''}\n"
-        )
-        
-        if scratchpad_info:
-            handoff_text += f"\n{scratchpad_info}\n"
-        
-        handoff_text += "=== END HANDOFF ==="
+        handoff_text = _HANDOFF_TEMPLATE.format_map({
+            "FROM": _agent_name_upper(from_agent),
+            "FROM_LOWER": from_agent,
+            "CTX": context,
+            "TASK_LINE": f"Task for you: {task}" if task else "",
+            "SCRATCHPAD": f"\n{scratchpad_info}\n" if scratchpad_info else "",
+        })
 
-        self._handoff_context[to_agent] = handoff_text
+        with self._messages_lock:
+            self._handoff_context[to_agent] = handoff_text
 
         self.send(
             from_agent=from_agent,
@@ -160,7 +219,8 @@ class AgentComms:
         
         v2: Always includes scratchpad summary if available.
         """
-        ctx = self._handoff_context.pop(agent_name, None)
+        with self._messages_lock:
+            ctx = self._handoff_context.pop(agent_name, None)
         
         # Even without an explicit handoff, include scratchpad if populated
         if not ctx:
@@ -171,29 +231,40 @@ class AgentComms:
 
     def get_messages(self, agent: str = None, msg_type: str = None,
                      limit: int = 20) -> List[AgentMessage]:
-        """Get recent messages, optionally filtered."""
-        msgs = self._messages
-        if agent:
-            msgs = [m for m in msgs if m.from_agent == agent or m.to_agent == agent]
-        if msg_type:
-            msgs = [m for m in msgs if m.msg_type == msg_type]
-        return msgs[-limit:]
+        """Get recent messages, optionally filtered.
+
+        Walks newest-first and stops once `limit` matches are found,
+        then returns them oldest-first.
+        """
+        if limit <= 0:
+            return []
+
+        def matches(m):
+            return ((not agent or m.from_agent == agent or m.to_agent == agent)
+                    and (not msg_type or m.msg_type == msg_type))
+
+        with self._messages_lock:
+            result = list(islice((m for m in reversed(self._messages) if matches(m)), limit))
+        result.reverse()
+        return result
 
     def get_conversation_log(self) -> str:
         """Get a formatted log of all agent communications."""
-        if not self._messages:
+        # Last 30 messages — islice from the right end of the deque so we
+        # never step over the older entries, then restore oldest-first order
+        with self._messages_lock:
+            tail = [m.formatted for m in islice(reversed(self._messages), 30)]
+        if not tail:
             return "No inter-agent communications yet."
-
-        lines = ["=== Agent Communication Log ==="]
-        for msg in self._messages[-30:]:  # Last 30 messages
-            ts = time.strftime("%H:%M:%S", time.localtime(msg.timestamp))
-            lines.append(f"[{ts}] {msg.from_agent} → {msg.to_agent} ({msg.msg_type}): {msg.content[:200]}")
-        return "\n".join(lines)
+        tail.append("=== Agent Communication Log ===")
+        tail.reverse()
+        return "\n".join(tail)
 
     def clear(self):
         """Clear all messages, handoff context, and scratchpad."""
-        self._messages.clear()
-        self._handoff_context.clear()
+        with self._messages_lock:
+            self._messages.clear()
+            self._handoff_context.clear()
         with self._scratchpad_lock:
             self._scratchpad.clear()
 
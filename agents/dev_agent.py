@@ -24,11 +24,24 @@ Key Settings (auto-configured in VS Code):
 """
 
 import os
+import re
 import json
+import shlex
+import stat
+import hashlib
+import shutil
 import subprocess
 import time as _time
 import glob
-from datetime import datetime
+import array
+import tempfile
+import threading
+import queue
+import select
+import atexit
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from agents.base_agent import BaseAgent
 from agents.agent_tools import (
@@ -38,6 +51,9 @@ from agents.agent_tools import (
 )
 from hands.terminal import run_terminal
 from hands.file_manager import read_file, list_directory
+from hands.fast_search import (
+    search_content, search_many, find_files, clear_cache as clear_search_cache,
+)
 
 
 # -------------------------------------------
@@ -50,36 +66,38 @@ VSCODE_SETTINGS_PATH = os.path.expanduser(
 VSCODE_STORAGE_PATH = os.path.expanduser(
     "~/Library/Application Support/Code/User/workspaceStorage"
 )
+VSCODE_CLI_CACHE_PATH = os.path.expanduser("~/.cache/tars/vscode_cli_path")
+VSCODE_CLI_CACHE_TTL = 7 * 24 * 3600  # Re-run discovery at least weekly
+PROJECT_SCAN_CACHE_PATH = os.path.expanduser("~/.cache/tars/project_scan.json")
+PROJECT_SCAN_CACHE_TTL = 3600             # Rescan a project at least hourly
+PROJECT_SCAN_CACHE_MAX_BYTES = 1 << 20    # Oldest entries dropped past 1MB
+PROJECT_SCAN_CACHE_MAX_ENTRIES = 32
 
 
 # -------------------------------------------
 #  VS Code CLI -- auto-discover
 # -------------------------------------------
 
-def _find_vscode_cli():
+def _discover_vscode_cli():
     """Find the VS Code CLI binary, even under AppTranslocation."""
     # 1. Check PATH
-    result = subprocess.run(["which", "code"], capture_output=True, text=True)
-    if result.returncode == 0 and result.stdout.strip():
-        return result.stdout.strip()
+    on_path = shutil.which("code")
+    if on_path:
+        return on_path
 
     # 2. Standard install location
     standard = "/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code"
     if os.path.exists(standard):
         return standard
 
-    # 3. AppTranslocation (macOS moves apps here on first launch)
-    try:
-        result = subprocess.run(
-            ["find", "/private/var/folders", "-name", "code",
-             "-path", "*/Visual Studio Code.app/*/bin/*"],
-            capture_output=True, text=True, timeout=10,
-        )
-        for line in result.stdout.strip().splitlines():
-            if line.endswith("/bin/code") and os.path.isfile(line):
-                return line
-    except Exception:
-        pass
+    # 3. AppTranslocation (macOS moves apps here on first launch) — the
+    # layout is fixed, so a glob replaces a `find` over all of /private/var/folders
+    for line in glob.glob(
+        "/private/var/folders/*/*/T/AppTranslocation/*/*/"
+        "Visual Studio Code.app/Contents/Resources/app/bin/code"
+    ):
+        if os.path.isfile(line):
+            return line
 
     # 4. Homebrew
     brew_path = "/usr/local/bin/code"
@@ -89,6 +107,74 @@ def _find_vscode_cli():
     return None
 
 
+def _write_cache_file(path, text):
+    """Atomically replace a file under ~/.cache/tars (best effort)."""
+    try:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix="." + os.path.basename(path) + ".")
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _find_vscode_cli():
+    """Resolve the VS Code CLI, via the on-disk cache when it is still valid.
+
+    Discovery probes PATH and several install locations; a warm cache hit
+    is one stat of the cache file plus one of the cached path. Misses are
+    not cached so a later install is picked up.
+    """
+    try:
+        if _time.time() - os.stat(VSCODE_CLI_CACHE_PATH).st_mtime < VSCODE_CLI_CACHE_TTL:
+            with open(VSCODE_CLI_CACHE_PATH) as f:
+                cached = f.read().strip()
+            if cached and os.path.exists(cached):
+                return cached
+    except OSError:
+        pass
+
+    path = _discover_vscode_cli()
+    if path:
+        _write_cache_file(VSCODE_CLI_CACHE_PATH, path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def get_vscode_cli():
+    """VS Code CLI path (or None), resolved on first use, once per process."""
+    return _find_vscode_cli()
+
+
+_CHAT_ARGS = ("chat", "-m", "agent")
+_CONTEXT_FILE_TTL = 10  # Seconds an add_files existence check stays valid
+
+
+@lru_cache(maxsize=64)
+def _context_file_args(files, bucket):
+    """`-a` arguments for the add_files that exist, as a flat tuple.
+
+    The LLM tends to pass the same context files on every launch; keying on
+    the file tuple plus a time bucket skips the stat() calls for repeats,
+    and the bucket rolling over every _CONTEXT_FILE_TTL seconds retires
+    stale answers.
+    """
+    args = []
+    for f in files:
+        if os.path.exists(f):
+            args += ("-a", f)
+    return tuple(args)
+
+
+def __getattr__(name):
+    # VSCODE_CLI stays importable but no longer costs anything at import time
+    if name == "VSCODE_CLI":
+        return get_vscode_cli()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _ensure_yolo_mode():
     """Ensure VS Code has YOLO mode enabled for full autonomy."""
     try:
@@ -117,10 +203,592 @@ def _ensure_yolo_mode():
         print(f"    [Dev Agent] Warning: Could not update VS Code settings: {e}")
 
 
-VSCODE_CLI = _find_vscode_cli()
+# Directories never worth snapshotting for change detection
+_SNAPSHOT_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "venv", ".venv", "__pycache__",
+    ".next", "dist", "build", ".tox", ".mypy_cache", ".pytest_cache",
+    "target", ".gradle",
+})
+
+# Full-path forms of the skip set, for filesystem events that arrive as
+# absolute paths: one C-level regex search instead of relpath + split +
+# set intersection per event. Files: a skip dir anywhere above the name.
+# Dirs: the dir itself may be the skip dir.
+_SKIP_NAMES_ALT = "|".join(re.escape(d) for d in sorted(_SNAPSHOT_SKIP_DIRS))
+_SKIP_FILE_PATH_RE = re.compile(rf"/(?:{_SKIP_NAMES_ALT})/")
+_SKIP_DIR_PATH_RE = re.compile(rf"/(?:{_SKIP_NAMES_ALT})(?:/|$)")
+
 _ensure_yolo_mode()
 
 
+class _Snapshot:
+    """File mtimes/sizes for one project, stored column-wise.
+
+    Paths live in a list and mtimes/sizes in typed arrays (8 bytes each)
+    instead of a 2-key dict per file; `index` maps path → row. Rows are
+    updated in place, and a removed path just leaves the index — its row
+    becomes dead until the next full snapshot replaces the object.
+    """
+
+    __slots__ = ("paths", "mtimes", "sizes", "index")
+
+    def __init__(self):
+        self.paths = []
+        self.mtimes = array.array("d")
+        self.sizes = array.array("Q")
+        self.index = {}
+
+    def add(self, path, mtime, size):
+        self.index[path] = len(self.paths)
+        self.paths.append(path)
+        self.mtimes.append(mtime)
+        self.sizes.append(size)
+
+    def set(self, path, mtime, size):
+        """Record path's current stat; return its previous mtime or None."""
+        row = self.index.get(path)
+        if row is None:
+            self.add(path, mtime, size)
+            return None
+        old = self.mtimes[row]
+        self.mtimes[row] = mtime
+        self.sizes[row] = size
+        return old
+
+    def discard(self, path):
+        """Forget path; True if it was present."""
+        return self.index.pop(path, None) is not None
+
+    def mtime(self, path):
+        return self.mtimes[self.index[path]]
+
+    def size(self, path):
+        return self.sizes[self.index[path]]
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+
+# -------------------------------------------
+#  Project scan cache (persists across sessions)
+# -------------------------------------------
+
+_SIGNATURE_IGNORE = frozenset({".git", "__pycache__"})  # Churn without changing the scan
+
+
+def _tree_signature(path, depth=2):
+    """blake2b over (relpath, mtime_ns, size) of entries down to depth levels.
+
+    Entries are hashed in sorted order, so any add, remove, rename, touch or
+    resize — in either direction, not just a newer mtime — changes it. Dirs
+    in _SCAN_SKIP_DIRS count as entries but aren't descended into. Raises
+    OSError if path itself can't be listed.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    stack = [("", 1)]
+    while stack:
+        rel, level = stack.pop()
+        try:
+            with os.scandir(os.path.join(path, rel)) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            if not rel:
+                raise
+            continue
+        for entry in reversed(entries):
+            if entry.name in _SIGNATURE_IGNORE:
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            child = os.path.join(rel, entry.name)
+            h.update(f"{child}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+            if (level < depth and stat.S_ISDIR(st.st_mode)
+                    and entry.name not in _SCAN_SKIP_DIRS):
+                stack.append((child, level + 1))
+    return h.hexdigest()
+
+
+def _project_scan_key(path):
+    """Cheap fingerprint of a project's state for scan-cache validation.
+
+    The checked-out ref (from .git/HEAD) plus the mtime of the file it
+    points at — moves on commit/checkout — and a signature of the top two
+    levels of the tree. Dir mtimes move when entries are added or removed,
+    so that covers changes a level further down as well.
+    """
+    parts = []
+    try:
+        parts.append(_tree_signature(path))
+        git_dir = os.path.join(path, ".git")
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        parts.append(head)
+        if head.startswith("ref: "):
+            ref = os.path.join(git_dir, head[5:])
+            if not os.path.exists(ref):
+                ref = os.path.join(git_dir, "packed-refs")
+            parts.append(str(os.stat(ref).st_mtime))
+    except OSError:
+        pass
+    return "|".join(parts)
+
+
+_GIT_SPLIT = "--tars-git-status--"
+
+
+def _git_sections(path):
+    """Recent Commits / Git Status scan sections for path (failures omitted).
+
+    Both git commands go out as one probe, split on a marker line, so the
+    scan pays one round trip to the probe shell instead of two.
+    """
+    path = shlex.quote(path)
+    r = _cached_terminal(
+        f"git -C {path} log --oneline -5 2>/dev/null; echo '{_GIT_SPLIT}'; "
+        f"git -C {path} status --short 2>/dev/null | head -20",
+        timeout=5, runner=_probe_terminal,
+    )
+    content = r.get("content", "")
+    if _GIT_SPLIT not in content:
+        return []
+    log, status = (part.strip() for part in content.split(_GIT_SPLIT, 1))
+    sections = []
+    if log:
+        sections.append(f"### Recent Commits\n```\n{log}\n```\n")
+    if status:
+        sections.append(f"### Git Status\n```\n{status}\n```\n")
+    return sections
+
+
+def _load_project_scan_cache():
+    """{path: {"key", "ts", "scan"}} from disk, oldest first; {} if unusable."""
+    try:
+        with open(PROJECT_SCAN_CACHE_PATH) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_project_scan_cache(cache):
+    """Write the cache, evicting least-recently-used entries past the caps."""
+    while len(cache) > PROJECT_SCAN_CACHE_MAX_ENTRIES:
+        del cache[next(iter(cache))]
+    text = json.dumps(cache)
+    while len(text) > PROJECT_SCAN_CACHE_MAX_BYTES and cache:
+        del cache[next(iter(cache))]
+        text = json.dumps(cache)
+    _write_cache_file(PROJECT_SCAN_CACHE_PATH, text)
+
+
+# Top-level marker file → tech, in report order
+_STACK_MARKERS = {
+    "package.json": "Node.js",
+    "tsconfig.json": "TypeScript",
+    "requirements.txt": "Python (pip)",
+    "pyproject.toml": "Python (pyproject)",
+    "setup.py": "Python (setup.py)",
+    "Cargo.toml": "Rust",
+    "go.mod": "Go",
+    "Gemfile": "Ruby",
+    "next.config.js": "Next.js",
+    "next.config.mjs": "Next.js",
+    "next.config.ts": "Next.js",
+    "vite.config.ts": "Vite",
+    "vite.config.js": "Vite",
+    "Dockerfile": "Docker",
+    "docker-compose.yml": "Docker Compose",
+    "docker-compose.yaml": "Docker Compose",
+    "tailwind.config.js": "Tailwind CSS",
+    "tailwind.config.ts": "Tailwind CSS",
+    "Podfile": "CocoaPods",
+}
+
+
+# Files search_files and search_symbols look inside for content matches
+_SEARCH_GLOBS = (
+    "*.py", "*.js", "*.ts", "*.tsx", "*.jsx", "*.html",
+    "*.css", "*.json", "*.yaml",
+)
+
+# Git report diff bounds — generated lockfiles are pure noise for review
+_DIFF_MAX_BYTES = 32768
+_DIFF_EXCLUDES = " ".join(
+    f"':(exclude){p}'" for p in (
+        "*.lock", "package-lock.json", "pnpm-lock.yaml", "*.min.js", "*.map",
+    )
+)
+
+
+def _parse_porcelain_v2(data):
+    """Split `git status --porcelain=v2 -z` output into (staged, unstaged, untracked).
+
+    Staged/unstaged entries are "<code> <path>" using the X/Y status letter;
+    renames read "R <new> <- <old>", conflicts are listed as unstaged "U".
+    """
+    staged, unstaged, untracked = [], [], []
+    records = iter(data.split("\0"))
+    for rec in records:
+        kind = rec[:1]
+        if kind == "1":
+            fields = rec.split(" ", 8)
+            xy, path = fields[1], fields[8]
+        elif kind == "2":
+            fields = rec.split(" ", 9)
+            xy, path = fields[1], f"{fields[9]} <- {next(records, '')}"
+        elif kind == "u":
+            unstaged.append(f"U {rec.split(' ', 10)[10]}")
+            continue
+        elif kind == "?":
+            untracked.append(rec[2:])
+            continue
+        else:
+            continue
+        if xy[0] != ".":
+            staged.append(f"{xy[0]} {path}")
+        if xy[1] != ".":
+            unstaged.append(f"{xy[1]} {path}")
+    return staged, unstaged, untracked
+
+
+# -------------------------------------------
+#  Filesystem scans (os.scandir, no subprocess)
+# -------------------------------------------
+
+def _walk_project_files(root):
+    """Yield (path, stat) for every file under root outside _SNAPSHOT_SKIP_DIRS.
+
+    Walks with os.scandir directly: the directory/file split comes from the
+    dirent type (no stat), and each file costs a single stat through its
+    DirEntry instead of os.walk's listing plus a separate os.stat.
+    """
+    skip_dirs = _SNAPSHOT_SKIP_DIRS
+    stack = [root]
+    pop, push = stack.pop, stack.append
+    while stack:
+        try:
+            it = os.scandir(pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        # Like os.walk: symlinked dirs are neither
+                        # descended into nor recorded
+                        if entry.name not in skip_dirs and not entry.is_symlink():
+                            push(entry.path)
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, st
+
+
+# Directories whose contents project scans ignore (the dir itself may show):
+# VCS data, dependency trees, caches and build output
+_SCAN_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "venv", ".venv", "__pycache__", ".next", "dist", "build",
+})
+# Never walked at all, not even to count files — vendored or regenerable trees
+_COUNT_SKIP_DIRS = frozenset({".git", "node_modules", "venv", ".venv", ".next"})
+
+
+def _scan_recent(path, max_age=120, skip=_SCAN_SKIP_DIRS, limit=None):
+    """Regular files under path modified within max_age seconds.
+
+    Skipped dirs are pruned before descending; only regular files are
+    stat'ed (d_type tells files from dirs for free). Stops at limit.
+    """
+    cutoff = _time.time() - max_age
+    found = []
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip:
+                            stack.append(entry.path)
+                    elif (entry.is_file(follow_symlinks=False)
+                          and entry.stat(follow_symlinks=False).st_mtime > cutoff):
+                        found.append(entry.path)
+                        if limit is not None and len(found) >= limit:
+                            return found
+                except OSError:
+                    continue
+    return found
+
+
+def _dir_entries(path):
+    try:
+        with os.scandir(path) as it:
+            return iter(list(it))
+    except OSError:
+        return iter(())
+
+
+def _scan_project(path, max_depth=3, limit=80, tree_skip=_SCAN_SKIP_DIRS,
+                  count_skip=_COUNT_SKIP_DIRS, by_ext=None):
+    """Structure listing and total file count from one walk.
+
+    The listing is pre-order down to max_depth, like `find -maxdepth`, cut
+    at limit lines; tree_skip dirs are listed but not expanded. The walk
+    carries on past both to count regular files, pruning count_skip dirs.
+    by_ext, if given, is a Counter that also gets per-extension counts.
+    """
+    lines = [path]
+    count = 0
+    stack = [(_dir_entries(path), 1, True)]
+    while stack:
+        it, depth, listed = stack[-1]
+        entry = next(it, None)
+        if entry is None:
+            stack.pop()
+            continue
+        if listed and len(lines) < limit:
+            lines.append(entry.path)
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in count_skip:
+                    expand = listed and depth < max_depth and entry.name not in tree_skip
+                    stack.append((_dir_entries(entry.path), depth + 1, expand))
+            elif entry.is_file(follow_symlinks=False):
+                count += 1
+                if by_ext is not None:
+                    by_ext[os.path.splitext(entry.name)[1].lower()] += 1
+        except OSError:
+            continue
+    return lines, count
+
+
+# -------------------------------------------
+#  Read-only shell probes (persistent shell + short-TTL cache)
+# -------------------------------------------
+
+class _PersistentShell:
+    """One long-lived /bin/sh for the agent's own read-only probes.
+
+    Each command runs in a subshell `( ... )` fed through the shell's stdin,
+    so only a fork is paid per call — no exec, no shell startup — and a
+    `cd` inside one command can't leak into the next. Output (stdout and
+    stderr merged) is framed by a per-process random token followed by the
+    exit status. A timeout kills the shell; the next call starts a new one.
+
+    Only for fixed, internal commands — LLM-supplied ones stay on
+    run_terminal and its safety checks.
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._token = b""
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            ["/bin/sh"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, bufsize=0,
+            env={**os.environ, "TERM": "dumb"},
+        )
+        self._token = os.urandom(8).hex().encode()
+
+    def run(self, command, timeout=10):
+        """Return (exit code, output). Raises subprocess.TimeoutExpired."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            proc, token = self._proc, self._token
+            try:
+                proc.stdin.write(
+                    b"( " + command.encode() + b"\n) </dev/null 2>&1; "
+                    b"printf '\\n%s %d\\n' " + token + b" $?\n"
+                )
+            except OSError:
+                self._proc = None
+                raise
+            fd = proc.stdout.fileno()
+            buf = bytearray()
+            deadline = _time.monotonic() + timeout
+            while True:
+                end = buf.find(b"\n" + token + b" ")
+                if end != -1 and buf.endswith(b"\n"):
+                    code = int(buf[end + len(token) + 2:-1] or 0)
+                    return code, bytes(buf[:end]).decode(errors="replace")
+                remaining = deadline - _time.monotonic()
+                ready = select.select([fd], [], [], max(remaining, 0))[0]
+                chunk = os.read(fd, 65536) if ready else b""
+                if not chunk:
+                    self.close_locked()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                buf += chunk
+
+    def close_locked(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(1)
+            except Exception:
+                pass
+            self._proc = None
+
+    def close(self):
+        with self._lock:
+            self.close_locked()
+
+
+_probe_shell = _PersistentShell()
+atexit.register(_probe_shell.close)
+
+
+def _probe_terminal(command, timeout=10):
+    """run_terminal-shaped result from the persistent probe shell."""
+    try:
+        code, output = _probe_shell.run(command, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {
+            "success": False,
+            "error": True,
+            "content": f"Command timed out after {timeout}s: {command}",
+        }
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Failed to run command: {e}"}
+    return {
+        "success": code == 0,
+        "content": output.strip() or "(no output)",
+        "exit_code": code,
+        "error": code != 0,
+    }
+
+
+_CMD_CACHE_TTL = 3.0   # Seconds a read-only command's output is reused
+_CMD_CACHE_MAX = 64
+_cmd_cache = OrderedDict()  # (command, cwd) → (monotonic ts, run_terminal result)
+_cmd_cache_lock = threading.Lock()
+
+# `git <sub>` commands that never touch the repo or worktree
+_READONLY_GIT = frozenset({"status", "log", "show", "rev-parse", "ls-files", "blame"})
+
+
+def _cached_terminal(command, timeout=10, ttl=_CMD_CACHE_TTL, runner=None):
+    """run_terminal for idempotent read-only commands, memoized for ttl seconds.
+
+    Never pass anything that mutates state or returns bulky output (full
+    git diff) — callers that run a mutating command clear the cache.
+    Internal probes pass runner=_probe_terminal to skip the fork+exec.
+    """
+    key = (command, os.getcwd())
+    now = _time.monotonic()
+    with _cmd_cache_lock:
+        hit = _cmd_cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            _cmd_cache.move_to_end(key)
+            return hit[1]
+    result = (runner or run_terminal)(command, timeout=timeout)
+    with _cmd_cache_lock:
+        _cmd_cache[key] = (now, result)
+        _cmd_cache.move_to_end(key)
+        while len(_cmd_cache) > _CMD_CACHE_MAX:
+            _cmd_cache.popitem(last=False)
+    return result
+
+
+def _clear_cmd_cache():
+    with _cmd_cache_lock:
+        _cmd_cache.clear()
+
+
+# -------------------------------------------
+#  Project change feed (optional: watchdog)
+# -------------------------------------------
+
+class _ChangeFeed:
+    """Collects paths touched under a project root from filesystem events.
+
+    Backed by watchdog (FSEvents on macOS, inotify on Linux). Acts as its
+    own event handler — the observer only ever calls dispatch(). A change
+    report then stats just the dirty paths instead of rewalking the tree.
+    """
+
+    __slots__ = ("root", "_observer", "_lock", "_files", "_dirs")
+
+    def __init__(self, root):
+        self.root = root
+        self._observer = None
+        self._lock = threading.Lock()
+        self._files = set()   # file paths created/modified/deleted/moved
+        self._dirs = set()    # directories deleted or moved (in or out)
+
+    def dispatch(self, event):
+        """watchdog callback (observer thread)."""
+        etype = event.event_type
+        if etype not in ("created", "modified", "deleted", "moved"):
+            return
+        if event.is_directory:
+            # Dir "modified" just means a child changed — that child has its
+            # own event. Deletes/moves may not report each child, so the
+            # whole subtree gets rechecked.
+            if etype == "modified":
+                return
+            target, skip_re = self._dirs, _SKIP_DIR_PATH_RE
+        else:
+            target, skip_re = self._files, _SKIP_FILE_PATH_RE
+        paths = [event.src_path]
+        if etype == "moved":
+            paths.append(event.dest_path)
+        root = self.root.rstrip(os.sep)
+        with self._lock:
+            for p in paths:
+                p = os.fsdecode(p)
+                # Only the part below the root counts — a project living
+                # under e.g. ~/build/ must not filter itself out
+                start = len(root) if p.startswith(root) else 0
+                if skip_re.search(p, start) is None:
+                    target.add(p)
+
+    def drain(self):
+        """Return and reset (dirty files, dirty dirs)."""
+        with self._lock:
+            files, self._files = self._files, set()
+            dirs, self._dirs = self._dirs, set()
+        return files, dirs
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+
+def _start_change_feed(root):
+    """Watch root for changes; None if watchdog is missing or the watch fails."""
+    try:
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+    feed = _ChangeFeed(root)
+    try:
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(feed, root, recursive=True)
+        observer.start()
+    except Exception:
+        return None
+    feed._observer = observer
+    return feed
+
+
 # -------------------------------------------
 #  Tool Definitions
 # -------------------------------------------
@@ -246,6 +914,14 @@ TOOL_WAIT_AND_REPORT = {
                 "description": "If Agent Mode seems stuck, send Cmd+Enter to continue (default true).",
                 "default": True,
             },
+            "skip_if_idle": {
+                "type": "boolean",
+                "description": (
+                    "Return at once, without re-running the diff, if Agent Mode is idle "
+                    "and nothing changed since the last report (default true)."
+                ),
+                "default": True,
+            },
         },
         "required": ["project_path"],
     },
@@ -350,6 +1026,38 @@ TOOL_PROJECT_SCAN = {
     },
 }
 
+TOOL_SEARCH_SYMBOLS = {
+    "name": "search_symbols",
+    "description": (
+        "Find several exact strings (identifiers, names) in a project's source "
+        "files in one pass. Faster than repeated search_files calls when "
+        "tracing related symbols; results are grouped per string."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "patterns": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Exact strings to look for (not regexes)",
+            },
+            "directory": {
+                "type": "string",
+                "description": "Directory to search in (default: current dir)",
+            },
+            "whole_word": {
+                "type": "boolean",
+                "description": (
+                    "Only match whole identifiers, e.g. to find references "
+                    "before a rename: 'user' won't match 'username'"
+                ),
+                "default": False,
+            },
+        },
+        "required": ["patterns"],
+    },
+}
+
 TOOL_OPEN_PROJECT = {
     "name": "open_project",
     "description": (
@@ -444,6 +1152,41 @@ You do NOT write code yourself. Claude Opus 4 in VS Code Agent Mode is your deve
 class DevAgent(BaseAgent):
     """Full-autonomous VS Code Agent Mode orchestrator."""
 
+    __slots__ = (
+        "_imessage_sender", "_imessage_reader",
+        "_project_cache", "_snapshots", "_vscode_cli", "_agent_launches",
+        "_launch_timestamps", "_stuck_count", "_last_reports",
+        "_notify_q", "_notify_worker", "_notify_lock", "_watchers",
+    )
+
+    parallel_tools = frozenset((
+        "read_file", "list_dir", "search_files", "search_symbols", "read_chat_output",
+    ))
+
+    # Built once: every access to `tools` returns this same tuple
+    _TOOLS = (
+        TOOL_VSCODE_AGENT,
+        TOOL_WAIT_AND_REPORT,
+        TOOL_READ_CHAT_OUTPUT,
+        TOOL_CONTINUE_SESSION,
+        TOOL_PRESS_BUTTON,
+        TOOL_OPEN_PROJECT,
+        TOOL_PROJECT_SCAN,
+        TOOL_ASK_USER,
+        TOOL_NOTIFY_USER,
+        TOOL_RUN_COMMAND,
+        TOOL_READ_FILE,
+        TOOL_LIST_DIR,
+        TOOL_SEARCH_FILES,
+        TOOL_SEARCH_SYMBOLS,
+        TOOL_GIT,
+        TOOL_DONE,
+        TOOL_STUCK,
+    )
+
+    NOTIFY_DEBOUNCE = 0.2  # Seconds to gather notify_user calls into one iMessage
+    NOTIFY_BATCH_MAX = 8   # Most notify_user calls joined into a single iMessage
+
     def __init__(self, llm_client, model, max_steps=60, phone=None,
                  update_every=5, kill_event=None,
                  imessage_sender=None, imessage_reader=None):
@@ -457,13 +1200,17 @@ class DevAgent(BaseAgent):
         )
         self._imessage_sender = imessage_sender
         self._imessage_reader = imessage_reader
-        self._session_start = datetime.now()
-        self._project_cache = {}
+        self._project_cache = _load_project_scan_cache()
         self._snapshots = {}
-        self._vscode_cli = VSCODE_CLI
+        self._vscode_cli = get_vscode_cli()
         self._agent_launches = 0
         self._launch_timestamps = []
         self._stuck_count = 0
+        self._last_reports = {}      # project path → time of its last full report
+        self._notify_q = queue.Queue()  # notify_user messages for the sender thread
+        self._notify_worker = None
+        self._notify_lock = threading.Lock()
+        self._watchers = {}          # project path → _ChangeFeed (when watchdog is available)
 
     # ---- Identity ----
 
@@ -486,24 +1233,7 @@ class DevAgent(BaseAgent):
 
     @property
     def tools(self):
-        return [
-            TOOL_VSCODE_AGENT,
-            TOOL_WAIT_AND_REPORT,
-            TOOL_READ_CHAT_OUTPUT,
-            TOOL_CONTINUE_SESSION,
-            TOOL_PRESS_BUTTON,
-            TOOL_OPEN_PROJECT,
-            TOOL_PROJECT_SCAN,
-            TOOL_ASK_USER,
-            TOOL_NOTIFY_USER,
-            TOOL_RUN_COMMAND,
-            TOOL_READ_FILE,
-            TOOL_LIST_DIR,
-            TOOL_SEARCH_FILES,
-            TOOL_GIT,
-            TOOL_DONE,
-            TOOL_STUCK,
-        ]
+        return self._TOOLS
 
     # ===== Tool Dispatch =====
 
@@ -517,11 +1247,13 @@ class DevAgent(BaseAgent):
                 )
 
             elif name == "wait_and_report":
+                clear_search_cache()  # Agent Mode has been editing the tree
                 return self._wait_and_report(
                     inp["project_path"],
                     inp.get("max_wait", 300),
                     inp.get("poll_interval", 15),
                     inp.get("auto_unstick", True),
+                    inp.get("skip_if_idle", True),
                 )
 
             elif name == "read_chat_output":
@@ -561,6 +1293,8 @@ class DevAgent(BaseAgent):
                 return self._notify_user(inp["message"])
 
             elif name == "run_command":
+                _clear_cmd_cache()  # Arbitrary command — cached probes may be stale
+                clear_search_cache()
                 result = run_terminal(
                     inp["command"],
                     timeout=inp.get("timeout", 60),
@@ -582,9 +1316,21 @@ class DevAgent(BaseAgent):
                     inp.get("content_search", False),
                 )
 
+            elif name == "search_symbols":
+                return self._search_many_literal(
+                    inp["patterns"], inp.get("directory", os.getcwd()),
+                    inp.get("whole_word", False),
+                )
+
             elif name == "git":
                 cmd_str = inp["command"]
-                result = run_terminal(f"git {cmd_str}", timeout=30)
+                sub = cmd_str.split(None, 1)[0] if cmd_str.strip() else ""
+                if sub in _READONLY_GIT:
+                    result = _cached_terminal(f"git {cmd_str}", timeout=30)
+                else:
+                    _clear_cmd_cache()
+                    clear_search_cache()
+                    result = run_terminal(f"git {cmd_str}", timeout=30)
                 return result.get("content", str(result))
 
             return f"Unknown tool: {name}"
@@ -602,13 +1348,13 @@ class DevAgent(BaseAgent):
             )
 
         # Build the command
-        cmd = [self._vscode_cli, "chat", "-m", "agent"]
+        cmd = [self._vscode_cli, *_CHAT_ARGS]
 
         # Add context files
         if add_files:
-            for f in add_files:
-                if os.path.exists(f):
-                    cmd.extend(["-a", f])
+            cmd.extend(_context_file_args(
+                tuple(add_files), int(_time.time() // _CONTEXT_FILE_TTL),
+            ))
 
         # Reuse existing window
         cmd.append("-r")
@@ -618,18 +1364,36 @@ class DevAgent(BaseAgent):
 
         # Open the project first if specified
         if project_path:
-            self._snapshots[project_path] = self._take_snapshot(project_path)
+            # Watch first, then snapshot: anything touched in between is
+            # merely rechecked, never missed
+            feed = self._watchers.get(project_path)
+            if feed is None:
+                feed = _start_change_feed(project_path)
+                if feed is not None:
+                    self._watchers[project_path] = feed
+            if feed is not None:
+                feed.drain()
+            # Start the open without waiting, so the snapshot walk overlaps
+            # VS Code coming up; then wait for the CLI hand-off and a live
+            # renderer instead of a fixed 2s sleep
             try:
-                subprocess.run(
+                opener = subprocess.Popen(
                     [self._vscode_cli, project_path, "-r"],
-                    capture_output=True, text=True, timeout=10,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
                 )
-                _time.sleep(2)
             except Exception:
-                pass
+                opener = None
+            self._snapshots[project_path] = self._take_snapshot(project_path)
+            if opener is not None:
+                try:
+                    opener.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    pass
+                self._wait_for_vscode_window(timeout=2.0)
 
         self._agent_launches += 1
         self._launch_timestamps.append(_time.time())
+        self._last_reports.clear()
         launch_num = self._agent_launches
         self._stuck_count = 0
         print(f"    [Dev Agent] Launching Agent Mode #{launch_num}: {prompt[:120]}...")
@@ -669,12 +1433,24 @@ class DevAgent(BaseAgent):
 
     # ===== Wait and Report (Smart Polling) =====
 
-    def _wait_and_report(self, project_path, max_wait=300, poll_interval=15, auto_unstick=True):
+    def _wait_and_report(self, project_path, max_wait=300, poll_interval=15,
+                         auto_unstick=True, skip_if_idle=True):
         """Poll until Agent Mode finishes, then report changes."""
         project_path = os.path.expanduser(project_path)
         if not os.path.isdir(project_path):
             return f"ERROR: Not a directory: {project_path}"
 
+        # Polled again with VS Code idle and no file touched since the last
+        # full report: the diff would only repeat it, so skip the whole poll
+        last_report = self._last_reports.get(project_path)
+        if (skip_if_idle and last_report is not None
+                and not self._is_vscode_active()
+                and not _scan_recent(project_path, max_age=_time.time() - last_report, limit=1)):
+            return (
+                "Agent Mode appears idle — skipping full diff scan. "
+                "No files changed since the last report."
+            )
+
         start_time = _time.time()
         idle_count = 0
         last_file_count = 0
@@ -714,17 +1490,23 @@ class DevAgent(BaseAgent):
 
         total_time = int(_time.time() - start_time)
 
-        # Now gather the report
+        # Now gather the report. Git, the snapshot walk and the chat log
+        # read are independent I/O waits — run git and chat on the agent's
+        # tool pool while this thread walks the tree, then assemble in order.
+        self._last_reports[project_path] = _time.time()
         sections = [f"## Agent Mode Report (ran for {total_time}s)\n"]
+        git_future = self._pool.submit(self._get_git_report, project_path)
+        chat_future = self._pool.submit(self._read_chat_output, last_n_requests=2)
+        file_report = self._get_file_change_report(project_path)
 
         # Git diff
-        sections.append(self._get_git_report(project_path))
+        sections.append(git_future.result())
 
         # File snapshot comparison
-        sections.append(self._get_file_change_report(project_path))
+        sections.append(file_report)
 
         # Chat output summary
-        chat_summary = self._read_chat_output(last_n_requests=2)
+        chat_summary = chat_future.result()
         if chat_summary and "No chat session" not in chat_summary:
             sections.append(f"### Agent Mode Output\n{chat_summary}\n")
 
@@ -738,12 +1520,33 @@ class DevAgent(BaseAgent):
 
         return "\n".join(sections)
 
+    def _wait_for_vscode_window(self, timeout=2.0, interval=0.1):
+        """Poll until a VS Code renderer process exists; False on timeout.
+
+        Already-running VS Code (the common case) returns on the first check.
+        Polls go through the persistent probe shell rather than spawning a
+        fresh pgrep each tick.
+        """
+        deadline = _time.monotonic() + timeout
+        while True:
+            try:
+                code, _ = _probe_shell.run(
+                    "pgrep -f 'Code Helper \\(Renderer\\)' >/dev/null", timeout=2,
+                )
+                if code == 0:
+                    return True
+            except Exception:
+                return False
+            if _time.monotonic() >= deadline:
+                return False
+            _time.sleep(interval)
+
     def _is_vscode_active(self):
         """Check if VS Code is actively using CPU."""
         try:
-            r = run_terminal(
+            r = _cached_terminal(
                 "ps aux | grep 'Code Helper (Renderer)' | grep -v grep | awk '{print $3}'",
-                timeout=5,
+                timeout=5, runner=_probe_terminal,
             )
             cpu_vals = r.get("content", "").strip()
             if cpu_vals:
@@ -756,15 +1559,7 @@ class DevAgent(BaseAgent):
     def _count_recent_files(self, project_path, minutes=1):
         """Count files modified in the last N minutes."""
         try:
-            r = run_terminal(
-                f"find '{project_path}' -type f -mmin -{minutes} "
-                f"-not -path '*/.git/*' -not -path '*/node_modules/*' "
-                f"-not -path '*/venv/*' -not -path '*/__pycache__/*' "
-                f"2>/dev/null | wc -l",
-                timeout=5,
-            )
-            count_str = r.get("content", "0").strip()
-            return int(count_str)
+            return len(_scan_recent(project_path, max_age=minutes * 60))
         except Exception:
             return 0
 
@@ -772,43 +1567,41 @@ class DevAgent(BaseAgent):
         """Get git diff report for the project."""
         sections = []
         try:
-            r = run_terminal(
-                f"cd '{project_path}' && git diff --stat 2>/dev/null",
-                timeout=10,
-            )
-            diff_stat = r.get("content", "").strip()
-            if diff_stat:
-                sections.append(f"### Git Diff (unstaged)\n```\n{diff_stat}\n```")
-
-            r = run_terminal(
-                f"cd '{project_path}' && git diff --cached --stat 2>/dev/null",
-                timeout=10,
-            )
-            cached = r.get("content", "").strip()
-            if cached:
-                sections.append(f"### Git Diff (staged)\n```\n{cached}\n```")
-
-            r = run_terminal(
-                f"cd '{project_path}' && git ls-files --others --exclude-standard 2>/dev/null | head -20",
-                timeout=10,
+            # One shell + one repo discovery for everything; a single
+            # `git status --porcelain=v2 -z` pass covers staged, unstaged and
+            # untracked instead of three separate index/worktree scans.
+            # Status goes last: its NUL-separated records can't be confused
+            # with the section markers when we split at most twice.
+            # Runs on the persistent probe shell rather than via run_terminal,
+            # whose output truncation could cut through a separator.
+            # The diff is bounded in the pipe: lockfiles are excluded, and
+            # head stops git via SIGPIPE after 300 lines / _DIFF_MAX_BYTES
+            # (one minified line can otherwise be megabytes).
+            script = (
+                f"cd {shlex.quote(project_path)} 2>/dev/null || exit 0; {{ "
+                "git log --oneline -5 --since='30 minutes ago'; printf '\\0SEC\\0'; "
+                f"git --no-pager diff --no-ext-diff -- . {_DIFF_EXCLUDES} "
+                f"| head -300 | head -c {_DIFF_MAX_BYTES}; printf '\\0SEC\\0'; "
+                "git status --porcelain=v2 -z --untracked-files=normal; "
+                "} 2>/dev/null"
             )
-            untracked = r.get("content", "").strip()
+            _, out = _probe_shell.run(script, timeout=20)
+            parts = out.split("\0SEC\0", 2)
+            recent, diff_content, status = (parts + [""] * 3)[:3]
+            recent, diff_content = recent.strip(), diff_content.strip()
+            staged, unstaged, untracked = _parse_porcelain_v2(status)
+
+            if unstaged:
+                body = "\n".join(unstaged)
+                sections.append(f"### Git Diff (unstaged)\n```\n{body}\n```")
+            if staged:
+                body = "\n".join(staged)
+                sections.append(f"### Git Diff (staged)\n```\n{body}\n```")
             if untracked:
-                sections.append(f"### New Files\n```\n{untracked}\n```")
-
-            r = run_terminal(
-                f"cd '{project_path}' && git log --oneline -5 --since='30 minutes ago' 2>/dev/null",
-                timeout=5,
-            )
-            recent = r.get("content", "").strip()
+                body = "\n".join(untracked[:20])
+                sections.append(f"### New Files\n```\n{body}\n```")
             if recent:
                 sections.append(f"### Recent Commits\n```\n{recent}\n```")
-
-            r = run_terminal(
-                f"cd '{project_path}' && git diff 2>/dev/null | head -300",
-                timeout=10,
-            )
-            diff_content = r.get("content", "").strip()
             if diff_content:
                 sections.append(f"### Diff Detail (first 300 lines)\n```diff\n{diff_content}\n```")
         except Exception as e:
@@ -822,23 +1615,19 @@ class DevAgent(BaseAgent):
         if not baseline:
             return ""
 
-        current = self._take_snapshot(project_path)
-        modified = []
-        new_files = []
-        deleted = []
-
-        for fpath, info in current.items():
-            if fpath in baseline:
-                if info["mtime"] != baseline[fpath]["mtime"]:
-                    modified.append(os.path.relpath(fpath, project_path))
-            else:
-                new_files.append(os.path.relpath(fpath, project_path))
-
-        for fpath in baseline:
-            if fpath not in current:
-                deleted.append(os.path.relpath(fpath, project_path))
-
-        self._snapshots[project_path] = current
+        feed = self._watchers.get(project_path)
+        if feed is not None:
+            modified, new_files, deleted = self._apply_change_feed(
+                feed, baseline, project_path,
+            )
+        else:
+            # No change feed: one walk, compared against and folded into the
+            # existing baseline rather than building a second snapshot to diff
+            changes = self._refresh_snapshot(baseline, project_path)
+            modified, new_files, deleted = (
+                sorted(os.path.relpath(p, project_path) for p in group)
+                for group in changes
+            )
 
         if not (modified or new_files or deleted):
             return ""
@@ -852,6 +1641,45 @@ class DevAgent(BaseAgent):
             lines.append(f"Deleted ({len(deleted)}): {', '.join(deleted[:10])}")
         return "\n".join(lines)
 
+    def _apply_change_feed(self, feed, baseline, project_path):
+        """Classify the feed's dirty paths against baseline, updating it in place.
+
+        Only dirty paths are stat'ed. The baseline is still what tells a new
+        file from a modified one — editors that save via rename-over report a
+        "created" event for a file that already existed.
+        """
+        files, dirs = feed.drain()
+        for d in dirs:
+            prefix = d + os.sep
+            files.update(p for p in baseline if p.startswith(prefix))
+            if os.path.isdir(d):
+                files.update(self._take_snapshot(d))
+
+        modified = []
+        new_files = []
+        deleted = []
+        for fpath in sorted(files):
+            rel = os.path.relpath(fpath, project_path)
+            try:
+                st = os.stat(fpath)
+            except OSError:
+                if baseline.discard(fpath):
+                    deleted.append(rel)
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                continue
+            old_mtime = baseline.set(fpath, st.st_mtime, st.st_size)
+            if old_mtime is None:
+                new_files.append(rel)
+            elif old_mtime != st.st_mtime:
+                modified.append(rel)
+        return modified, new_files, deleted
+
+    def _stop_watchers(self):
+        for feed in self._watchers.values():
+            feed.stop()
+        self._watchers.clear()
+
     # ===== Chat Session Reader =====
 
     def _read_chat_output(self, last_n_requests=3):
@@ -996,28 +1824,39 @@ class DevAgent(BaseAgent):
 
     def _take_snapshot(self, project_path):
         """Capture file mtimes for change detection."""
-        snapshot = {}
-        skip_dirs = {
-            ".git", "node_modules", "venv", "__pycache__",
-            ".next", "dist", "build", ".tox", ".mypy_cache",
-        }
-        try:
-            for root, dirs, files in os.walk(project_path):
-                dirs[:] = [d for d in dirs if d not in skip_dirs]
-                for f in files:
-                    fpath = os.path.join(root, f)
-                    try:
-                        st = os.stat(fpath)
-                        snapshot[fpath] = {
-                            "mtime": st.st_mtime,
-                            "size": st.st_size,
-                        }
-                    except OSError:
-                        pass
-        except Exception:
-            pass
+        snapshot = _Snapshot()
+        add = snapshot.add
+        for path, st in _walk_project_files(project_path):
+            add(path, st.st_mtime, st.st_size)
         return snapshot
 
+    def _refresh_snapshot(self, baseline, project_path):
+        """Re-walk project_path and update baseline in place.
+
+        Returns (modified, new_files, deleted) as absolute paths. Rows are
+        compared and overwritten as the walk goes, so no second snapshot is
+        built; a bytearray marks which baseline rows were seen, and unseen
+        live rows are the deletions.
+        """
+        index, mtimes, sizes = baseline.index, baseline.mtimes, baseline.sizes
+        seen = bytearray(len(baseline.paths))
+        modified, new_files = [], []
+        for path, st in _walk_project_files(project_path):
+            row = index.get(path)
+            if row is None:
+                baseline.add(path, st.st_mtime, st.st_size)
+                new_files.append(path)
+                continue
+            seen[row] = 1
+            if mtimes[row] != st.st_mtime:
+                mtimes[row] = st.st_mtime
+                sizes[row] = st.st_size
+                modified.append(path)
+        deleted = [p for p, row in index.items() if row < len(seen) and not seen[row]]
+        for p in deleted:
+            baseline.discard(p)
+        return modified, new_files, deleted
+
     # ===== VS Code Project =====
 
     def _open_project(self, path, new_window=False):
@@ -1044,6 +1883,9 @@ class DevAgent(BaseAgent):
         if not self._imessage_sender or not self._imessage_reader:
             return "ERROR: iMessage not configured for this session."
 
+        # Queued notifications go out first so the user reads them in order
+        self._flush_notifications()
+
         tagged = f"Dev Agent:\n{message}"
         try:
             self._imessage_sender.send(tagged)
@@ -1063,135 +1905,153 @@ class DevAgent(BaseAgent):
             return f"ERROR waiting for reply: {e}"
 
     def _notify_user(self, message):
-        """Send one-way status update via iMessage."""
+        """Queue a one-way status update for the background sender.
+
+        Each send is an AppleScript round-trip to Messages, so the agent loop
+        never waits on it: a worker thread joins calls that land within
+        NOTIFY_DEBOUNCE of each other (up to NOTIFY_BATCH_MAX) and sends them
+        as one iMessage.
+        """
         if not self._imessage_sender:
             return "ERROR: iMessage not configured for this session."
 
-        tagged = f"Dev Agent:\n{message}"
-        try:
-            self._imessage_sender.send(tagged)
-            print(f"    [Dev Agent] Notified user: {message[:100]}...")
-            return "Notification sent."
-        except Exception as e:
-            return f"ERROR sending notification: {e}"
+        self._ensure_notify_worker()
+        self._notify_q.put(message)
+        print(f"    [Dev Agent] Notified user: {message[:100]}...")
+        return "Notification queued."
+
+    def _ensure_notify_worker(self):
+        with self._notify_lock:
+            if self._notify_worker is None or not self._notify_worker.is_alive():
+                self._notify_worker = threading.Thread(
+                    target=self._notify_loop, name="dev-notify", daemon=True,
+                )
+                self._notify_worker.start()
+
+    def _notify_loop(self):
+        """Sender thread: drain the queue in batches, one iMessage per batch.
+
+        A threading.Event on the queue is a flush request — the batch gathered
+        so far is sent immediately and the event is set once it has gone out.
+        """
+        q = self._notify_q
+        while True:
+            item = q.get()
+            batch, flushed = [], []
+            if isinstance(item, threading.Event):
+                flushed.append(item)
+            else:
+                batch.append(item)
+                deadline = _time.monotonic() + self.NOTIFY_DEBOUNCE
+                while len(batch) < self.NOTIFY_BATCH_MAX:
+                    remaining = deadline - _time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = q.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        flushed.append(item)
+                        break
+                    batch.append(item)
+            if batch:
+                try:
+                    self._imessage_sender.send("Dev Agent:\n" + "\n---\n".join(batch))
+                except Exception as e:
+                    print(f"    [Dev Agent] Warning: could not send notification: {e}")
+            for event in flushed:
+                event.set()
+
+    def _flush_notifications(self, timeout=10):
+        """Block until every notification queued so far has been sent."""
+        worker = self._notify_worker
+        if worker is None or not worker.is_alive():
+            return
+        done = threading.Event()
+        self._notify_q.put(done)
+        done.wait(timeout)
+
+    def _on_done(self, summary):
+        self._flush_notifications()
+
+    def _on_stuck(self, reason):
+        self._flush_notifications()
+
+    def _on_finish(self):
+        # Every exit, not just done/stuck: a kill, API error or max-steps run
+        # would otherwise leave a recursive Observer thread behind for good
+        self._stop_watchers()
 
     # ===== Project Intelligence =====
 
     def _project_scan(self, path):
         """Quick project scan: structure, tech stack, git state."""
-        path = os.path.expanduser(path)
+        # realpath, so trailing slashes and symlinked aliases share an entry
+        path = os.path.realpath(os.path.expanduser(path))
         if not os.path.isdir(path):
             return f"ERROR: Not a directory: {path}"
 
-        if path in self._project_cache:
-            return self._project_cache[path]
+        key = _project_scan_key(path)
+        cached = self._project_cache.get(path)
+        if (cached and cached.get("key") == key
+                and _time.time() - cached.get("ts", 0) < PROJECT_SCAN_CACHE_TTL):
+            # Re-insert so dict order stays least- to most-recently used
+            self._project_cache[path] = self._project_cache.pop(path)
+            return cached["scan"]
 
         sections = [f"## Project: {path}\n"]
 
-        # Detect tech stack
-        stack = []
-        stack_map = {
-            "package.json": "Node.js",
-            "tsconfig.json": "TypeScript",
-            "requirements.txt": "Python (pip)",
-            "pyproject.toml": "Python (pyproject)",
-            "setup.py": "Python (setup.py)",
-            "Cargo.toml": "Rust",
-            "go.mod": "Go",
-            "Gemfile": "Ruby",
-            "next.config.js": "Next.js",
-            "next.config.mjs": "Next.js",
-            "next.config.ts": "Next.js",
-            "vite.config.ts": "Vite",
-            "vite.config.js": "Vite",
-            "Dockerfile": "Docker",
-            "docker-compose.yml": "Docker Compose",
-            "docker-compose.yaml": "Docker Compose",
-            "tailwind.config.js": "Tailwind CSS",
-            "tailwind.config.ts": "Tailwind CSS",
-            "Podfile": "CocoaPods",
-        }
-        for filename, tech in stack_map.items():
-            if os.path.exists(os.path.join(path, filename)):
-                if tech not in stack:
-                    stack.append(tech)
+        # Detect tech stack — one directory listing, then set lookups
+        try:
+            top = set(os.listdir(path))
+        except OSError:
+            top = set()
+        stack = list(dict.fromkeys(
+            tech for filename, tech in _STACK_MARKERS.items() if filename in top
+        ))
         if stack:
             sections.append(f"Stack: {', '.join(stack)}\n")
 
-        # Directory tree
-        try:
-            r = run_terminal(
-                f"find '{path}' -maxdepth 3 "
-                f"-not -path '*/node_modules/*' -not -path '*/.git/*' "
-                f"-not -path '*/venv/*' -not -path '*/__pycache__/*' "
-                f"| head -80",
-                timeout=10,
-            )
-            tree = r.get("content", "")
+        # Git probes and the tree walk touch disjoint things (the probe shell,
+        # the filesystem), so the probes run while the walk does
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dev-scan") as pool:
+            git_sections = pool.submit(_git_sections, path)
+
+            # Directory tree — the same walk counts files for the footer
+            by_ext = Counter()
+            lines, count = _scan_project(path, max_depth=3, limit=80, by_ext=by_ext)
+            tree = "\n".join(lines)
             if tree:
                 sections.append(f"### Structure\n```\n{tree}\n```\n")
-        except Exception:
-            pass
-
-        # Recent git history
-        try:
-            r = run_terminal(
-                f"cd '{path}' && git log --oneline -5 2>/dev/null",
-                timeout=5,
-            )
-            log = r.get("content", "").strip()
-            if log:
-                sections.append(f"### Recent Commits\n```\n{log}\n```\n")
 
-            r = run_terminal(
-                f"cd '{path}' && git status --short 2>/dev/null | head -20",
-                timeout=5,
-            )
-            status = r.get("content", "").strip()
-            if status:
-                sections.append(f"### Git Status\n```\n{status}\n```\n")
-        except Exception:
-            pass
+            sections.extend(git_sections.result())
 
-        # File count
-        try:
-            r = run_terminal(
-                f"find '{path}' -type f "
-                f"-not -path '*/.git/*' -not -path '*/node_modules/*' "
-                f"-not -path '*/venv/*' 2>/dev/null | wc -l",
-                timeout=5,
-            )
-            count = r.get("content", "").strip()
-            sections.append(f"Total files: {count}\n")
-        except Exception:
-            pass
+        top_ext = ", ".join(f"{ext} {n}" for ext, n in by_ext.most_common(6) if ext)
+        sections.append(f"Total files: {count}" + (f" ({top_ext})" if top_ext else "") + "\n")
 
         scan = "\n".join(sections)
-        self._project_cache[path] = scan
+        self._project_cache.pop(path, None)
+        self._project_cache[path] = {"key": key, "ts": _time.time(), "scan": scan}
+        _save_project_scan_cache(self._project_cache)
         return scan
 
     def _search_files(self, pattern, directory, content_search):
         """Search for files by name or content."""
         try:
-            directory = os.path.expanduser(directory)
             if content_search:
-                r = run_terminal(
-                    f"grep -rn "
-                    f"--include='*.py' --include='*.js' --include='*.ts' "
-                    f"--include='*.tsx' --include='*.jsx' --include='*.html' "
-                    f"--include='*.css' --include='*.json' --include='*.yaml' "
-                    f"'{pattern}' '{directory}' 2>/dev/null | head -30",
-                    timeout=15,
-                )
-                return r.get("content", "(no results)")
+                r = search_content(pattern, directory, include=_SEARCH_GLOBS, limit=30)
             else:
-                r = run_terminal(
-                    f"find '{directory}' -name '{pattern}' "
-                    f"-not -path '*/node_modules/*' -not -path '*/.git/*' "
-                    f"-not -path '*/venv/*' "
-                    f"2>/dev/null | head -30",
-                    timeout=15,
-                )
-                return r.get("content", "(no results)")
-        except Exception as e:
+                r = find_files(pattern, directory, limit=30)
+            return r.get("content", "(no results)")
+        except OSError as e:
+            return f"ERROR: {e}"
+
+    def _search_many_literal(self, patterns, directory, whole_word=False):
+        """Search contents for several exact strings in one walk."""
+        try:
+            r = search_many(patterns, directory, include=_SEARCH_GLOBS, limit=30,
+                            whole_word=whole_word)
+            return r.get("content", "(no results)")
+        except OSError as e:
             return f"ERROR: {e}"
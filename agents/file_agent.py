@@ -9,17 +9,19 @@
 
 import os
 import shutil
-import subprocess
 
 from agents.base_agent import BaseAgent
 from agents.agent_tools import (
     TOOL_READ_FILE, TOOL_WRITE_FILE, TOOL_LIST_DIR, TOOL_SEARCH_FILES,
     TOOL_MOVE, TOOL_COPY, TOOL_DELETE, TOOL_TREE, TOOL_DISK_USAGE,
-    TOOL_COMPRESS, TOOL_EXTRACT_ARCHIVE, TOOL_RUN_COMMAND,
+    TOOL_COUNT_LINES, TOOL_COMPRESS, TOOL_EXTRACT_ARCHIVE, TOOL_RUN_COMMAND,
     TOOL_DONE, TOOL_STUCK,
 )
-from hands.terminal import run_terminal
+from hands.terminal import run_terminal, run_argv
 from hands.file_manager import read_file, write_file, move_file, delete_file, list_directory
+from hands.fast_search import (
+    search_content, find_files, tree, count_lines, clear_cache as clear_search_cache,
+)
 
 
 # ─────────────────────────────────────────────
@@ -37,6 +39,7 @@ FILE_AGENT_PROMPT = """You are TARS File Agent — the world's best file managem
 - Delete files (carefully)
 - Show directory tree structure
 - Check disk usage
+- Count lines of code per file type
 - Compress files into zip/tar archives
 - Extract archives
 - Run shell commands for advanced operations
@@ -53,7 +56,7 @@ FILE_AGENT_PROMPT = """You are TARS File Agent — the world's best file managem
 3. Use `tree` to get an overview before reorganizing
 4. Prefer `move` over copy+delete
 5. Use `search_files` to find things instead of manually listing every directory
-6. For large-scale operations, use `run_command` with find/xargs for efficiency
+6. For large-scale operations, use `run_command` with find/xargs for efficiency — but use `count_lines` rather than `find | xargs wc -l`
 7. Never delete system files or hidden config files unless explicitly asked
 8. When organizing, follow common conventions (src/, docs/, tests/, etc.)
 9. Call `done` with a summary of all changes made
@@ -64,6 +67,12 @@ FILE_AGENT_PROMPT = """You are TARS File Agent — the world's best file managem
 class FileAgent(BaseAgent):
     """Autonomous file management agent — organizes, finds, and manages files."""
 
+    __slots__ = ()
+
+    parallel_tools = frozenset((
+        "read_file", "list_dir", "search_files", "tree", "disk_usage", "count_lines",
+    ))
+
     @property
     def agent_name(self):
         return "File Agent"
@@ -81,12 +90,14 @@ class FileAgent(BaseAgent):
         return [
             TOOL_READ_FILE, TOOL_WRITE_FILE, TOOL_LIST_DIR, TOOL_SEARCH_FILES,
             TOOL_MOVE, TOOL_COPY, TOOL_DELETE, TOOL_TREE, TOOL_DISK_USAGE,
-            TOOL_COMPRESS, TOOL_EXTRACT_ARCHIVE, TOOL_RUN_COMMAND,
+            TOOL_COUNT_LINES, TOOL_COMPRESS, TOOL_EXTRACT_ARCHIVE, TOOL_RUN_COMMAND,
             TOOL_DONE, TOOL_STUCK,
         ]
 
     def _dispatch(self, name, inp):
         """Route file management tool calls."""
+        if name not in self.parallel_tools:
+            clear_search_cache()  # May have changed files
         try:
             if name == "read_file":
                 result = read_file(inp["path"])
@@ -124,6 +135,10 @@ class FileAgent(BaseAgent):
             elif name == "disk_usage":
                 return self._disk_usage(inp["path"])
 
+            elif name == "count_lines":
+                result = count_lines(inp["path"], include=inp.get("include"))
+                return result.get("content", str(result))
+
             elif name == "compress":
                 return self._compress(inp["paths"], inp["output"])
 
@@ -141,19 +156,12 @@ class FileAgent(BaseAgent):
     def _search_files(self, pattern, directory, content_search):
         """Search files by name or content."""
         try:
-            directory = os.path.expanduser(directory)
             if content_search:
-                result = run_terminal(
-                    f"grep -rn '{pattern}' '{directory}' --include='*' 2>/dev/null | head -50",
-                    timeout=15
-                )
+                result = search_content(pattern, directory, limit=50)
             else:
-                result = run_terminal(
-                    f"find '{directory}' -name '{pattern}' -not -path '*/.git/*' -not -path '*/node_modules/*' -not -path '*/venv/*' 2>/dev/null | head -50",
-                    timeout=15
-                )
+                result = find_files(pattern, directory, limit=50)
             return result.get("content", "(no results)")
-        except Exception as e:
+        except OSError as e:
             return f"ERROR searching: {e}"
 
     def _copy(self, source, destination):
@@ -172,29 +180,26 @@ class FileAgent(BaseAgent):
 
     def _tree(self, path, depth):
         """Show directory tree."""
-        result = run_terminal(
-            f"find '{os.path.expanduser(path)}' -maxdepth {depth} -not -path '*/.git/*' -not -path '*/node_modules/*' -not -path '*/venv/*' | head -100 | sed 's|[^/]*/|  |g'",
-            timeout=10
-        )
+        result = tree(path, depth, limit=100)
         return result.get("content", "(empty)")
 
     def _disk_usage(self, path):
         """Get disk usage."""
-        result = run_terminal(f"du -sh '{os.path.expanduser(path)}' 2>/dev/null", timeout=10)
+        result = run_argv(["du", "-sh", "--", os.path.expanduser(path)], timeout=10)
         return result.get("content", "unknown")
 
     def _compress(self, paths, output):
         """Compress files into archive."""
         try:
-            paths_str = " ".join(f"'{os.path.expanduser(p)}'" for p in paths)
+            sources = [os.path.expanduser(p) for p in paths]
             output = os.path.expanduser(output)
             if output.endswith(".zip"):
-                cmd = f"zip -r '{output}' {paths_str}"
+                cmd = ["zip", "-r", output, *sources]
             elif output.endswith(".tar.gz") or output.endswith(".tgz"):
-                cmd = f"tar -czf '{output}' {paths_str}"
+                cmd = ["tar", "-czf", output, "--", *sources]
             else:
-                cmd = f"tar -cf '{output}' {paths_str}"
-            result = run_terminal(cmd, timeout=120)
+                cmd = ["tar", "-cf", output, "--", *sources]
+            result = run_argv(cmd, timeout=120)
             if result.get("success"):
                 return f"✅ Compressed to {output}"
             return result.get("content", "Compression failed")
@@ -208,14 +213,14 @@ class FileAgent(BaseAgent):
             destination = os.path.expanduser(destination)
             os.makedirs(destination, exist_ok=True)
             if archive.endswith(".zip"):
-                cmd = f"unzip -o '{archive}' -d '{destination}'"
+                cmd = ["unzip", "-o", archive, "-d", destination]
             elif archive.endswith(".tar.gz") or archive.endswith(".tgz"):
-                cmd = f"tar -xzf '{archive}' -C '{destination}'"
+                cmd = ["tar", "-xzf", archive, "-C", destination]
             elif archive.endswith(".tar"):
-                cmd = f"tar -xf '{archive}' -C '{destination}'"
+                cmd = ["tar", "-xf", archive, "-C", destination]
             else:
                 return f"Unknown archive format: {archive}"
-            result = run_terminal(cmd, timeout=120)
+            result = run_argv(cmd, timeout=120)
             if result.get("success"):
                 return f"✅ Extracted {archive} to {destination}"
             return result.get("content", "Extraction failed")
@@ -621,6 +621,11 @@ RESEARCH_SYSTEM_PROMPT = (
 class ResearchAgent(BaseAgent):
     """Autonomous research agent v2.0 -- world-class deep research and synthesis."""
 
+    __slots__ = (
+        "_notes", "_comparisons", "_sources_visited", "_research_plan",
+        "_search_count", "_pages_read", "_browser_errors",
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._notes = {}
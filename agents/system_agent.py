@@ -117,6 +117,8 @@ SYSTEM_AGENT_PROMPT = """You are TARS System Agent — the world's most powerful
 class SystemAgent(BaseAgent):
     """Autonomous system agent — controls macOS with 60+ tools."""
 
+    __slots__ = ()
+
     @property
     def agent_name(self):
         return "System Agent"
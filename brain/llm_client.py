@@ -532,6 +532,60 @@ class RetryStreamWrapper:
         return self._backoff_fn(attempt, base=1.0, cap=30.0)
 
 
+# ─────────────────────────────────────────────
+#  Anthropic prompt caching
+# ─────────────────────────────────────────────
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _with_prompt_cache(system, messages):
+    """Add Anthropic cache_control breakpoints to the system prompt and latest turn.
+
+    Agent loops resend the whole history every step; with the prefix
+    cached the server skips re-prefilling it. The caller's list is not
+    mutated — only the last message is copied, so breakpoints don't pile up.
+    """
+    if isinstance(system, str) and system:
+        system = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+    if messages:
+        last = messages[-1]
+        content = last.get("content")
+        if isinstance(content, str) and content:
+            content = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            content = content[:-1] + [dict(content[-1], cache_control=_EPHEMERAL)]
+        else:
+            return system, messages
+        messages = messages[:-1] + [dict(last, content=content)]
+    return system, messages
+
+
+# ─────────────────────────────────────────────
+#  Shared HTTP connection pool
+# ─────────────────────────────────────────────
+
+_http_clients = {}  # SDK module name → shared DefaultHttpxClient
+
+
+def _shared_http_client(sdk):
+    """One keep-alive connection pool per SDK, shared by every LLMClient.
+
+    Brain, fallback and agent clients otherwise each open their own pool
+    and pay a fresh TCP+TLS handshake. Uses the SDK's own DefaultHttpxClient
+    (the SDKs pin their own httpx flavour); HTTP/2 when `h2` is installed.
+    """
+    client = _http_clients.get(sdk.__name__)
+    if client is None:
+        try:
+            import h2  # noqa: F401
+            kwargs = {"http2": True}
+        except ImportError:
+            kwargs = {}
+        client = _http_clients[sdk.__name__] = sdk.DefaultHttpxClient(**kwargs)
+    return client
+
+
 # ─────────────────────────────────────────────
 #  Main LLM Client
 # ─────────────────────────────────────────────
@@ -561,15 +615,31 @@ class LLMClient:
 
         if provider == "anthropic":
             import anthropic
-            self._client = anthropic.Anthropic(api_key=api_key)
+            self._client = anthropic.Anthropic(api_key=api_key, http_client=_shared_http_client(anthropic))
             self._mode = "anthropic"
         else:
+            import openai
             from openai import OpenAI
             base_url = kwargs.get("base_url") or self.PROVIDER_URLS.get(provider)
             if not base_url:
                 raise ValueError(f"Unknown provider '{provider}'. Use: anthropic, groq, together, openrouter, openai — or pass base_url=")
-            self._client = OpenAI(api_key=api_key, base_url=base_url)
+            self._client = OpenAI(api_key=api_key, base_url=base_url, http_client=_shared_http_client(openai))
             self._mode = "openai"
+        self._tool_cache = {}  # id(tools) → (tools, converted) for the OpenAI path
+
+    def _openai_tools(self, tools):
+        """Convert Anthropic tool schemas once per tools list.
+
+        Agents hand us the same cached list on every step, so the
+        conversion only runs on the first call for each agent class.
+        """
+        cached = self._tool_cache.get(id(tools))
+        if cached is None or cached[0] is not tools:
+            if len(self._tool_cache) >= 32:
+                self._tool_cache.clear()
+            cached = (tools, _anthropic_to_openai_tools(tools))
+            self._tool_cache[id(tools)] = cached
+        return cached[1]
 
     # ── Non-streaming call (used by agents) ──
 
@@ -594,6 +664,7 @@ class LLMClient:
         temperature=0 by default for deterministic tool calls.
         """
         if self._mode == "anthropic":
+            system, messages = _with_prompt_cache(system, messages)
             resp = self._client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
@@ -604,7 +675,7 @@ class LLMClient:
             )
             return self._wrap_anthropic_response(resp)
         else:
-            openai_tools = _anthropic_to_openai_tools(tools)
+            openai_tools = self._openai_tools(tools)
             openai_messages = _convert_history_for_openai(messages, system)
 
             max_retries = 5
@@ -672,7 +743,7 @@ class LLMClient:
                 kwargs["temperature"] = temperature
             return self._client.messages.stream(**kwargs)
         else:
-            openai_tools = _anthropic_to_openai_tools(tools)
+            openai_tools = self._openai_tools(tools)
             openai_messages = _convert_history_for_openai(messages, system)
             kwargs = dict(
                 model=model,
@@ -34,7 +34,9 @@ from hands.cdp import CDP, CDP_PORT
 # ═══════════════════════════════════════════════════════
 
 _cdp = None
-_browser_lock = threading.Lock()  # Serializes all browser operations across agents
+# Serializes browser operations across agents. Re-entrant: act_google runs
+# act_goto and act_read_page, which take it again on the same thread.
+_browser_lock = threading.RLock()
 
 
 def _with_browser_lock(func):
@@ -886,14 +888,32 @@ def act_wait(seconds=2):
 
 
 def act_wait_for_text(text, timeout=10):
-    """Wait for specific text to appear on the page."""
+    """Wait for specific text to appear on the page.
+
+    Adaptive polling: starts at 100ms and backs off while the page text
+    is unchanged, snapping back to fast polls as soon as it changes
+    (SPA content streaming in). One final check always runs at the deadline.
+    """
     _ensure()
     safe = text.replace("\\", "\\\\").replace("'", "\\'")
-    for _ in range(int(timeout) * 4):
-        found = _js(f"document.body && document.body.innerText.indexOf('{safe}') !== -1 ? 'yes' : 'no'")
+    probe = (
+        "(() => { const t = document.body ? document.body.innerText : '';"
+        f" return (t.indexOf('{safe}') !== -1 ? 'yes' : 'no') + ':' + t.length; }})()"
+    )
+    deadline = time.monotonic() + float(timeout)
+    interval = 0.1
+    last_len = None
+    while True:
+        found, _, length = (_js(probe) or "").partition(":")
         if found == "yes":
             return f"Text '{text}' found on page"
-        time.sleep(0.25)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # Page changed since last poll → poll fast; quiescent → back off
+        interval = 0.1 if length != last_len else min(interval * 2, 1.0)
+        last_len = length
+        time.sleep(min(interval, remaining))
     return f"Text '{text}' NOT found after {timeout}s"
 
 
@@ -1006,7 +1026,9 @@ def act_run_js(code):
 def act_google(query):
     """Quick Google search: navigate and return results."""
     encoded = urllib.parse.quote_plus(query)
-    act_goto(f"https://www.google.com/search?q={encoded}")
+    result = act_goto(f"https://www.google.com/search?q={encoded}")
+    if result.startswith("ERROR:"):
+        return result  # Don't read whatever page was already showing
     time.sleep(1)
     text = act_read_page()
     return f"Google results for '{query}':\n\n{text[:6000]}"
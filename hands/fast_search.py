@@ -0,0 +1,620 @@
+"""
+╔══════════════════════════════════════════╗
+║       TARS — Hands: Fast Search          ║
+╚══════════════════════════════════════════╝
+
+In-process file search: `grep -rn`, `find -name` and `wc -l` without a shell.
+
+Patterns and glob sets are compiled once and reused; literal patterns skip
+the regex engine for find(). Each file is searched as one buffer, so files
+without a match never get split into lines; only hits are mapped back to
+line numbers.
+
+Results are memoized per (query, directory) and revalidated against the
+directory's own mtime and its children's, so a repeated search is a dict
+lookup. Deeper edits aren't visible to that check: callers that change
+files call clear_cache(), and entries expire after RESULT_CACHE_TTL anyway.
+
+Identifier queries also consult a per-directory word index, so a symbol that
+appears nowhere is ruled out without reading a file. The index is built only
+after a search has already walked the whole tree and missed, so it never
+costs a search that would have stopped early. It is kept and revalidated
+exactly like a memoized result: a false "absent" would hide real hits.
+search_many() looks for several literals in one walk, reading each file once.
+"""
+
+import os
+import re
+import time
+import fnmatch
+import threading
+from collections import Counter, OrderedDict
+from contextlib import closing
+from itertools import islice
+from functools import lru_cache, partial
+
+
+# Never worth descending into (mirrors the old `find -not -path` filters)
+SKIP_DIRS = frozenset({
+    ".git", "node_modules", "venv", ".venv", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".tox",
+})
+
+MAX_FILE_BYTES = 8 << 20    # Bigger files are data dumps or bundles, not source
+_BINARY_PROBE = 8192        # Like grep: a NUL early on means a binary file
+MAX_LINE_BYTES = 500        # Longer hit lines (minified bundles) are clipped
+_LINE_LEAD = 100            # How much of a clipped line to keep before the hit
+_GLOB_MAGIC = re.compile(r"[*?[]")
+_REGEX_META = re.compile(r"[.^$*+?()[\]{}|\\]")
+_IDENTIFIER = re.compile(r"\w+", re.ASCII)
+_WORD_RUN = re.compile(rb"\w+")
+
+RESULT_CACHE_TTL = 30.0     # Seconds a memoized result may be served
+RESULT_CACHE_MAX = 256
+
+_results = OrderedDict()    # key → (stamp, stored_at, result)
+_results_lock = threading.Lock()
+
+WORD_INDEX_MAX = 8          # Directories (and filter sets) with a word index kept
+_indexes = OrderedDict()    # key → (stamp, built_at, newline-joined word runs)
+
+
+@lru_cache(maxsize=256)
+def _expand(directory):
+    """(~-expanded directory, its normalized absolute form).
+
+    Agents pass the same few directories over and over, so the expansion
+    is memoized; relative paths are resolved afresh since they depend on
+    the working directory.
+    """
+    root = os.path.expanduser(directory)
+    return root, (os.path.normpath(root) if os.path.isabs(root) else None)
+
+
+def _resolve(directory):
+    root, absolute = _expand(directory)
+    return root, absolute or os.path.abspath(root)
+
+
+def _tree_stamp(root):
+    """Newest mtime_ns of root and its direct children (None if unreadable)."""
+    try:
+        stamp = os.stat(root).st_mtime_ns
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    stamp = max(stamp, entry.stat(follow_symlinks=False).st_mtime_ns)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return stamp
+
+
+def _memoized(key, root, compute):
+    """Serve compute()'s result from the cache while root looks unchanged."""
+    stamp = _tree_stamp(root)
+    if stamp is None:
+        return compute()
+    now = time.monotonic()
+    with _results_lock:
+        hit = _results.get(key)
+        if hit is not None and hit[0] == stamp and now - hit[1] < RESULT_CACHE_TTL:
+            _results.move_to_end(key)
+            return hit[2]
+    result = compute()
+    if result["success"]:
+        with _results_lock:
+            _results[key] = (stamp, now, result)
+            _results.move_to_end(key)
+            while len(_results) > RESULT_CACHE_MAX:
+                _results.popitem(last=False)
+    return result
+
+
+def clear_cache():
+    """Forget all memoized results (call after changing files)."""
+    with _results_lock:
+        _results.clear()
+        _indexes.clear()
+
+
+@lru_cache(maxsize=128)
+def _compile_content(pattern, ascii=True):
+    """Matcher for a grep pattern: a plain literal, or a compiled regex.
+
+    Patterns without regex metacharacters (most agent queries are an
+    identifier) stay literals and are found with find(), like grep -F;
+    anything else that won't compile falls back to a literal too.
+
+    By default the pattern is a bytes regex run on raw file bytes — the
+    byte-wise matching GNU grep only does under LC_ALL=C, with no decoding.
+    Non-ASCII literals still match their UTF-8 bytes; ascii=False gives a
+    str regex (Unicode \\w, \\b, ...) run on decoded text instead.
+    """
+    raw = pattern if not ascii else pattern.encode("utf-8", "surrogateescape")
+    if raw and not _REGEX_META.search(pattern):
+        return raw
+    try:
+        return re.compile(raw, re.MULTILINE)
+    except re.error:
+        return raw
+
+
+_SEED_MIN = 4
+_QUANT_OPTIONAL = "?*{"
+
+
+@lru_cache(maxsize=128)
+def _literal_seed(pattern):
+    """Longest literal run every match of a regex must contain, or None.
+
+    Deliberately conservative: only word characters outside any group,
+    class or escape count, and patterns with alternation or inline flags
+    get no seed. A run's last character is dropped when a quantifier
+    could make it optional.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return None
+    best, run = "", ""
+    depth, i, n = 0, 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            run, i = "", i + 2
+            continue
+        if c == "[":
+            j = i + 1
+            if pattern[j:j + 1] == "^":
+                j += 1
+            close = pattern.find("]", j + 1)  # A leading ] is a member
+            run, i = "", (n if close < 0 else close + 1)
+            continue
+        if c == "{":
+            close = pattern.find("}", i)
+            run, i = "", (n if close < 0 else close + 1)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth = max(depth - 1, 0)
+        if depth == 0 and (c.isalnum() or c == "_"):
+            if i + 1 < n and pattern[i + 1] in _QUANT_OPTIONAL:
+                run = ""
+            else:
+                run += c
+                if len(run) > len(best):
+                    best = run
+                i += 1
+                continue
+        if not (c.isalnum() or c == "_"):
+            run = ""
+        i += 1
+    return best if len(best) >= _SEED_MIN else None
+
+
+@lru_cache(maxsize=64)
+def _compile_globs(globs):
+    """Name predicate for a set of fnmatch globs, or None to match all.
+
+    Include lists are almost always `*.ext`; those become one str.endswith
+    over a suffix tuple, which is exactly what the glob means and skips the
+    regex engine per directory entry. Anything else is one joined regex.
+    """
+    if not globs or "*" in globs:
+        return None
+    if all(g[:1] == "*" and not _GLOB_MAGIC.search(g, 1) for g in globs):
+        suffixes = tuple(g[1:] for g in globs)
+        return lambda name: name.endswith(suffixes)
+    return re.compile("|".join(fnmatch.translate(g) for g in globs)).match
+
+
+def _listing(path):
+    """Directory entries sorted by name ([] if unreadable)."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(it, key=lambda e: e.name)
+    except OSError:
+        return []
+
+
+def _load_ignore(root):
+    """Matcher for root/.gitignore, or None (no file, or pathspec missing)."""
+    path = os.path.join(root, ".gitignore")
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _ignore_spec(path, mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _ignore_spec(path, mtime_ns):
+    # pathspec is optional: without it only SKIP_DIRS is pruned
+    try:
+        import pathspec
+    except ImportError:
+        return None
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return pathspec.GitIgnoreSpec.from_lines(f).match_file
+    except (OSError, ValueError):  # Unreadable file or a malformed pattern
+        return None
+
+
+def _walk(root, skip, max_depth=None, ignored=None):
+    """Yield (depth, DirEntry) under root in `find` order, skipped dirs pruned.
+
+    Depth-first pre-order over a stack of directory listings; root's own
+    entries are depth 1, and nothing deeper than max_depth is listed.
+    ignored, if given, is called with each root-relative path (dirs with a
+    trailing slash, as gitignore patterns expect); a hit is dropped and,
+    for a dir, never listed.
+    """
+    prefix = len(root.rstrip(os.sep)) + 1
+    stack = [iter(_listing(root))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir and entry.name in skip:
+            continue
+        if ignored is not None:
+            rel = entry.path[prefix:]
+            if ignored(rel + "/" if is_dir else rel):
+                continue
+        depth = len(stack)
+        yield depth, entry
+        if is_dir and (max_depth is None or depth < max_depth):
+            stack.append(iter(_listing(entry.path)))
+
+
+def _read(path, size):
+    """A file's first size bytes, as one bounded read.
+
+    Never mmap: a tree being searched is often being written too (npm
+    install, Agent Mode), and a mapped file truncated underneath us
+    kills the process with SIGBUS instead of raising.
+    """
+    with open(path, "rb") as f:
+        return f.read(size)
+
+
+def _grep_file(path, size, rx, seed=None):
+    """Yield `path:line:text` for each matching line of one file, lazily.
+
+    seed, if given, is a byte string every match contains: files without it
+    are rejected with one find() before the regex engine sees them.
+    """
+    raw = _read(path, size)
+    if b"\0" in raw[:_BINARY_PROBE]:
+        return
+    yield from _grep_buffer(path, raw, rx, seed)
+
+
+def _grep_buffer(path, raw, rx, seed=None):
+    """_grep_file's matching half, on bytes already read."""
+    if seed is not None and raw.find(seed) < 0:
+        return
+    if isinstance(getattr(rx, "pattern", rx), str):
+        buf, nl, cr = raw.decode("utf-8", "replace"), "\n", "\r"
+    else:
+        buf, nl, cr = raw, b"\n", b"\r"
+    if isinstance(rx, (bytes, str)):
+        find = partial(buf.find, rx)
+    else:
+        def find(pos, search=rx.search):
+            m = search(buf, pos)
+            return -1 if m is None else m.start()
+    # One hit per line: after each, resume the search at the next line
+    end = len(buf)
+    line_no, counted = 1, 0
+    start = find(0)
+    while start >= 0:
+        line_no += buf[counted:start].count(nl)
+        counted = start
+        line_start = buf.rfind(nl, 0, start) + 1
+        line_end = buf.find(nl, start)
+        if line_end < 0:
+            line_end = end
+        if line_end - line_start > MAX_LINE_BYTES:
+            # Only a window around the hit is copied out, like rg -M
+            lo = max(line_start, start - _LINE_LEAD)
+            hi = min(line_end, lo + MAX_LINE_BYTES)
+            text = buf[lo:hi].rstrip(cr)
+            if not isinstance(text, str):
+                text = text.decode("utf-8", "replace")
+            text = ("…" if lo > line_start else "") + text + ("…" if hi < line_end else "")
+        else:
+            text = buf[line_start:line_end].rstrip(cr)
+            if not isinstance(text, str):
+                text = text.decode("utf-8", "replace")
+        yield f"{path}:{line_no}:{text}"
+        if line_end + 1 >= end:
+            break
+        start = find(line_end + 1)
+
+
+def iter_content(pattern, directory, include=None, skip=SKIP_DIRS, ascii=True,
+                 gitignore=True):
+    """Yield `path:line:text` matches as they are found.
+
+    Nothing is scanned ahead of the consumer: stop iterating (or close the
+    generator) and the walk stops with it, mid-file if need be. Like rg,
+    paths matched by the directory's own .gitignore are skipped (when the
+    optional pathspec package is installed).
+    """
+    rx = _compile_content(pattern, ascii)
+    seed = None
+    if not isinstance(rx, (bytes, str)):
+        seed = _literal_seed(pattern)
+        seed = seed and seed.encode("utf-8")
+    name_ok = _compile_globs(tuple(include) if include else None)
+    root = _expand(directory)[0]
+    ignored = _load_ignore(root) if gitignore else None
+    for _, entry in _walk(root, skip, ignored=ignored):
+        if name_ok is not None and not name_ok(entry.name):
+            continue
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            size = entry.stat(follow_symlinks=False).st_size
+            if 0 < size <= MAX_FILE_BYTES:
+                yield from _grep_file(entry.path, size, rx, seed)
+        except OSError:
+            continue
+
+
+def search_content(pattern, directory, include=None, limit=50, skip=SKIP_DIRS, ascii=True,
+                   gitignore=True):
+    """Search file contents under directory, like `grep -rn` piped to head.
+
+    include is a tuple of filename globs (None or "*" searches every file).
+    Lines come back as `path:line:text`; the scan ends at the limit-th one.
+    Pass ascii=False for Unicode-aware character classes, gitignore=False
+    to search ignored files too.
+    """
+    include = tuple(include) if include else None
+    root, absolute = _resolve(directory)
+    if ascii and _absent(pattern, root, absolute, include, skip, gitignore):
+        return {"success": True, "content": "(no results)"}
+    key = ("content", pattern, root, absolute, include, limit, skip, ascii, gitignore)
+    result = _memoized(key, root, lambda: _search_content(
+        pattern, root, include, limit, skip, ascii, gitignore))
+    if ascii and result["content"] == "(no results)" and _IDENTIFIER.fullmatch(pattern):
+        _index_tree(root, absolute, include, skip, gitignore)
+    return result
+
+
+def _search_content(pattern, root, include, limit, skip, ascii, gitignore):
+    try:
+        with closing(iter_content(pattern, root, include, skip, ascii, gitignore)) as matches:
+            hits = list(islice(matches, limit))
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Search failed: {e}"}
+    return {"success": True, "content": "\n".join(hits) or "(no results)"}
+
+
+def search_many(patterns, directory, include=None, limit=30, skip=SKIP_DIRS, gitignore=True,
+                whole_word=False):
+    """Search for several fixed strings at once, like one `grep -F` each.
+
+    The tree is walked and each file read once for all of them; every
+    pattern still short of limit hits gets one find() pass over the buffer,
+    so overlapping patterns (`foo`, `foobar`) each see all their matches.
+    whole_word=True is `grep -Fw`: only hits not flanked by word characters,
+    i.e. references to an identifier rather than longer names containing it.
+    Output is grouped under a `## pattern` heading per pattern.
+    """
+    patterns = tuple(dict.fromkeys(p for p in patterns if p))
+    include = tuple(include) if include else None
+    root, absolute = _resolve(directory)
+    key = ("many", patterns, root, absolute, include, limit, skip, gitignore, whole_word)
+    result = _memoized(key, root, lambda: _search_many(
+        patterns, root, absolute, include, limit, skip, gitignore, whole_word))
+    if result["success"] and "\n(no results)" in result["content"]:
+        _index_tree(root, absolute, include, skip, gitignore)
+    return result
+
+
+@lru_cache(maxsize=128)
+def _compile_word(literal):
+    """Bytes regex for literal standing alone, like grep -w."""
+    return re.compile(rb"(?<!\w)" + re.escape(literal) + rb"(?!\w)")
+
+
+def _search_many(patterns, root, absolute, include, limit, skip, gitignore, whole_word):
+    hits = {p: [] for p in patterns}
+    pending = {}
+    for p in patterns:
+        if _absent(p, root, absolute, include, skip, gitignore):
+            continue
+        literal = p.encode("utf-8", "surrogateescape")
+        # A word match needs the literal: find() rejects files before the regex
+        pending[p] = (_compile_word(literal), literal) if whole_word else (literal, None)
+    name_ok = _compile_globs(include)
+    ignored = _load_ignore(root) if gitignore else None
+    try:
+        for _, entry in _walk(root, skip, ignored=ignored):
+            if not pending:
+                break
+            if name_ok is not None and not name_ok(entry.name):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+                if not 0 < size <= MAX_FILE_BYTES:
+                    continue
+                raw = _read(entry.path, size)
+            except OSError:
+                continue
+            if b"\0" in raw[:_BINARY_PROBE]:
+                continue
+            for pattern, (rx, seed) in list(pending.items()):
+                found = hits[pattern]
+                found.extend(islice(_grep_buffer(entry.path, raw, rx, seed),
+                                    limit - len(found)))
+                if len(found) >= limit:
+                    del pending[pattern]
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Search failed: {e}"}
+    sections = [f"## {p}\n" + ("\n".join(found) or "(no results)") for p, found in hits.items()]
+    return {"success": True, "content": "\n\n".join(sections) or "(no results)"}
+
+
+def _absent(pattern, root, absolute, include, skip, gitignore):
+    """True if pattern is an identifier the word index rules out.
+
+    Only an index that is already built and still current is consulted;
+    without one the caller just searches.
+    """
+    if not _IDENTIFIER.fullmatch(pattern):
+        return False
+    stamp = _tree_stamp(root)
+    with _results_lock:
+        hit = _indexes.get((root, absolute, include, skip, gitignore))
+    if (stamp is None or hit is None or hit[0] != stamp
+            or time.monotonic() - hit[1] >= RESULT_CACHE_TTL):
+        return False
+    return pattern.encode() not in hit[2]
+
+
+def _index_tree(root, absolute, include, skip, gitignore):
+    """Build the word index for a search that just walked the tree and missed."""
+    key = (root, absolute, include, skip, gitignore)
+    stamp = _tree_stamp(root)
+    if stamp is None:
+        return
+    now = time.monotonic()
+    with _results_lock:
+        hit = _indexes.get(key)
+        if hit is not None and hit[0] == stamp and now - hit[1] < RESULT_CACHE_TTL:
+            _indexes.move_to_end(key)
+            return
+    words = _word_index(root, include, skip, gitignore)
+    if words["success"]:
+        with _results_lock:
+            _indexes[key] = (stamp, now, words["content"])
+            _indexes.move_to_end(key)
+            while len(_indexes) > WORD_INDEX_MAX:
+                _indexes.popitem(last=False)
+
+
+def _word_index(root, include, skip, gitignore):
+    """Every distinct word run in the files a search would read, as one blob.
+
+    An identifier only ever occurs inside a maximal run of word bytes, so
+    it occurs in some file exactly when it is a substring of some run: one
+    `in` test on the newline-joined runs answers the query, substring
+    matches included, with no false negatives.
+    """
+    name_ok = _compile_globs(include)
+    ignored = _load_ignore(root) if gitignore else None
+    words = set()
+    try:
+        for _, entry in _walk(root, skip, ignored=ignored):
+            if name_ok is not None and not name_ok(entry.name):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+                if not 0 < size <= MAX_FILE_BYTES:
+                    continue
+                with open(entry.path, "rb") as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            if b"\0" not in raw[:_BINARY_PROBE]:
+                words.update(_WORD_RUN.findall(raw))
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Index failed: {e}"}
+    return {"success": True, "content": b"\n".join(words)}
+
+
+def find_files(pattern, directory, limit=50, skip=SKIP_DIRS):
+    """Find paths whose name matches a glob, like `find -name` piped to head."""
+    root, absolute = _resolve(directory)
+    key = ("name", pattern, root, absolute, limit, skip)
+    return _memoized(key, root, lambda: _find_files(pattern, root, limit, skip))
+
+
+def _find_files(pattern, root, limit, skip):
+    name_ok = _compile_globs((pattern,))
+    found = []
+    try:
+        for _, entry in _walk(root, skip):
+            if name_ok is None or name_ok(entry.name):
+                found.append(entry.path)
+                if len(found) >= limit:
+                    break
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Search failed: {e}"}
+    return {"success": True, "content": "\n".join(found) or "(no results)"}
+
+
+def count_lines(directory, include=None, skip=SKIP_DIRS, gitignore=True):
+    """Lines and files per extension under directory, like `find | xargs wc -l`.
+
+    Lines are counted as wc -l does (newline bytes), over the same walk and
+    filters as search_content; binary files are left out.
+    """
+    include = tuple(include) if include else None
+    root, absolute = _resolve(directory)
+    key = ("lines", root, absolute, include, skip, gitignore)
+    return _memoized(key, root, lambda: _count_lines(root, include, skip, gitignore))
+
+
+def _count_lines(root, include, skip, gitignore):
+    name_ok = _compile_globs(include)
+    ignored = _load_ignore(root) if gitignore else None
+    files, lines = Counter(), Counter()
+    try:
+        for _, entry in _walk(root, skip, ignored=ignored):
+            if name_ok is not None and not name_ok(entry.name):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+                if not 0 < size <= MAX_FILE_BYTES:
+                    continue
+                raw = _read(entry.path, size)
+            except OSError:
+                continue
+            if b"\0" in raw[:_BINARY_PROBE]:
+                continue
+            ext = os.path.splitext(entry.name)[1].lower() or entry.name
+            files[ext] += 1
+            lines[ext] += raw.count(b"\n")
+    except OSError as e:
+        return {"success": False, "error": True, "content": f"Count failed: {e}"}
+    if not files:
+        return {"success": True, "content": "(no results)"}
+    rows = [f"{ext:<12} {files[ext]:>7,} files {lines[ext]:>11,} lines"
+            for ext in sorted(files, key=lambda e: (-lines[e], e))]
+    rows.append(f"Total: {sum(files.values()):,} files, {sum(lines.values()):,} lines")
+    return {"success": True, "content": "\n".join(rows)}
+
+
+def tree(path, depth=3, limit=100, skip=SKIP_DIRS):
+    """Indented listing of path down to depth levels, like `find -maxdepth`."""
+    root = _expand(path)[0]
+    if not os.path.isdir(root):
+        return {"success": False, "error": True, "content": f"Not a directory: {path}"}
+    lines = [root]
+    for level, entry in _walk(root, skip, max_depth=depth):
+        if len(lines) >= limit:
+            break
+        try:
+            suffix = "/" if entry.is_dir(follow_symlinks=False) else ""
+        except OSError:
+            suffix = ""
+        lines.append("  " * level + entry.name + suffix)
+    return {"success": True, "content": "\n".join(lines)}
@@ -10,16 +10,26 @@ import os
 import shutil
 
 
+MAX_READ_CHARS = 50000   # Bigger files come back as head + tail
+_HEAD_CHARS = 25000
+_TAIL_CHARS = 15000
+_TRUNCATED = "\n\n... [file truncated] ...\n\n"
+
+
 def read_file(file_path):
     """Read a file's contents."""
     try:
         path = os.path.expanduser(file_path)
         with open(path, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
-
-        # Truncate very large files
-        if len(content) > 50000:
-            content = content[:25000] + "\n\n... [file truncated] ...\n\n" + content[-15000:]
+            # A UTF-8 char is at most 4 bytes, so a file over 4x the cap in
+            # bytes is certain to be truncated: read only the head and tail
+            if os.fstat(f.fileno()).st_size > 4 * MAX_READ_CHARS:
+                content = f.read(_HEAD_CHARS) + _TRUNCATED + _read_tail(path, _TAIL_CHARS)
+            else:
+                content = f.read()
+                # Truncate very large files
+                if len(content) > MAX_READ_CHARS:
+                    content = content[:_HEAD_CHARS] + _TRUNCATED + content[-_TAIL_CHARS:]
 
         return {"success": True, "content": content}
     except FileNotFoundError:
@@ -28,6 +38,17 @@ def read_file(file_path):
         return {"success": False, "error": True, "content": f"Error reading file: {e}"}
 
 
+def _read_tail(path, chars):
+    """Last chars characters of a file, reading at most 4 bytes per char."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - 4 * chars - 4, 0))
+        raw = f.read()
+    # A cut mid-character only garbles the first few chars, dropped by the slice
+    text = raw.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
+    return text[-chars:]
+
+
 def write_file(file_path, content):
     """Write content to a file, creating directories as needed."""
     try:
@@ -73,13 +94,16 @@ def list_directory(dir_path):
     try:
         path = os.path.expanduser(dir_path)
         entries = []
-        for entry in sorted(os.listdir(path)):
-            full = os.path.join(path, entry)
-            if os.path.isdir(full):
-                entries.append(f"📁 {entry}/")
+        # scandir's entries know their type from the listing itself, so
+        # only files cost a stat() (for the size), not every entry twice
+        with os.scandir(path) as it:
+            listing = sorted(it, key=lambda e: e.name)
+        for entry in listing:
+            if entry.is_dir():
+                entries.append(f"📁 {entry.name}/")
             else:
-                size = os.path.getsize(full)
-                entries.append(f"📄 {entry} ({_human_size(size)})")
+                size = entry.stat().st_size
+                entries.append(f"📄 {entry.name} ({_human_size(size)})")
         return {"success": True, "content": "\n".join(entries) if entries else "(empty directory)"}
     except Exception as e:
         return {"success": False, "error": True, "content": f"Error listing: {e}"}
@@ -4116,6 +4116,8 @@ def book_flight(
             print(f"    🌐 Opening {airline} booking page...")
             try:
                 goto_result = act_goto(airline_url)
+                if goto_result.startswith("ERROR:"):
+                    raise RuntimeError(goto_result)
                 time.sleep(3)
                 page_text = act_read_page()
                 
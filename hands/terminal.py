@@ -7,9 +7,43 @@ Runs shell commands and captures output.
 """
 
 import subprocess
+import shlex
 import os
 from utils.safety import is_destructive
 
+MAX_OUTPUT_CHARS = 10000   # Longer output keeps only its head and tail
+_HEAD_CHARS = 5000
+_TAIL_CHARS = 3000
+_TRUNCATED = "\n\n... [output truncated] ...\n\n"
+
+
+def _decode(data):
+    """bytes → str with text-mode newline handling."""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _decode_output(data):
+    """Decode captured output, truncated to head + tail when very long.
+
+    Output is captured as bytes so that a multi-MB stream only pays for
+    decoding the slices that are kept. Up to 4 bytes per character, so
+    anything shorter than 4x the cap is decoded whole and measured exactly.
+    """
+    if len(data) <= 4 * MAX_OUTPUT_CHARS:
+        return _truncate(_decode(data))
+    head = _decode(data[:4 * _HEAD_CHARS])[:_HEAD_CHARS]
+    tail = _decode(data[-4 * _TAIL_CHARS:])[-_TAIL_CHARS:]
+    return head + _TRUNCATED + tail
+
+
+def _truncate(text):
+    if len(text) <= MAX_OUTPUT_CHARS:
+        return text
+    return text[:_HEAD_CHARS] + _TRUNCATED + text[-_TAIL_CHARS:]
+
 
 def run_terminal(command, timeout=60, cwd=None):
     """Run a shell command and return the output."""
@@ -20,24 +54,33 @@ def run_terminal(command, timeout=60, cwd=None):
             "error": True,
             "content": f"⛔ BLOCKED: Destructive command detected: {command}\nIf you really need this, ask Abdullah for confirmation via send_imessage.",
         }
+    return _run(command, timeout, cwd, shell=True)
+
+
+def run_argv(argv, timeout=60, cwd=None):
+    """Run a program directly from an argv list — no shell in between.
+
+    For commands assembled from tool inputs (paths, names): nothing in them
+    is parsed by a shell, so no quoting is needed and none can be escaped.
+    Returns the same dict shape as run_terminal.
+    """
+    return _run(list(argv), timeout, cwd, shell=False)
+
+
+def _run(command, timeout, cwd, shell):
     try:
         result = subprocess.run(
             command,
-            shell=True,
+            shell=shell,
             capture_output=True,
-            text=True,
             timeout=timeout,
             cwd=cwd or os.getcwd(),
             env={**os.environ, "TERM": "dumb"},  # Prevent color codes
         )
 
-        output = result.stdout
+        output = _decode_output(result.stdout)
         if result.stderr:
-            output += f"\n[stderr]: {result.stderr}"
-
-        # Truncate very long output
-        if len(output) > 10000:
-            output = output[:5000] + "\n\n... [output truncated] ...\n\n" + output[-3000:]
+            output = _truncate(f"{output}\n[stderr]: {_decode_output(result.stderr)}")
 
         return {
             "success": result.returncode == 0,
@@ -47,10 +90,11 @@ def run_terminal(command, timeout=60, cwd=None):
         }
 
     except subprocess.TimeoutExpired:
+        label = command if shell else shlex.join(command)
         return {
             "success": False,
             "error": True,
-            "content": f"Command timed out after {timeout}s: {command}",
+            "content": f"Command timed out after {timeout}s: {label}",
         }
     except Exception as e:
         return {
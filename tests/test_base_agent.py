@@ -0,0 +1,272 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: Base Agent        ║
+╚══════════════════════════════════════════╝
+
+Tests the shared agent loop with a scripted LLM client (no API needed).
+"""
+
+import hashlib
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+import subprocess
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from agents import base_agent
+from agents.base_agent import BaseAgent
+
+
+def _tool(tid, name, **inp):
+    return SimpleNamespace(type="tool_use", id=tid, name=name, input=inp)
+
+
+class _ScriptedClient:
+    """Returns one canned response per step and records what it was sent."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=self.steps.pop(0), stop_reason="tool_use")
+
+
+class _ReadAgent(BaseAgent):
+    agent_name = "Read Agent"
+    agent_emoji = "📖"
+    system_prompt = "Read files."
+    tools = []
+    parallel_tools = frozenset(("read",))
+
+    def __init__(self, client):
+        super().__init__(client, model="test")
+        self.dispatched = []
+        self.threads = set()
+        self.files = {}
+
+    def _dispatch(self, name, inp):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(inp.get("delay", 0))
+        self.dispatched.append(inp["path"])
+        if name == "write":
+            self.files[inp["path"]] = inp["text"]
+            return "written"
+        return self.files.get(inp["path"], f"contents of {inp['path']}")
+
+
+class TestParallelTools(unittest.TestCase):
+    """Test concurrent dispatch of read-only tool calls."""
+
+    def test_results_in_block_order(self):
+        client = _ScriptedClient(
+            [_tool("1", "read", path="a", delay=0.1), _tool("2", "read", path="b")],
+            [_tool("3", "done", summary="Read both files a and b.")],
+        )
+        agent = _ReadAgent(client)
+        self.assertTrue(agent.run("read a and b")["success"])
+        self.assertEqual(agent.dispatched, ["b", "a"])  # b finished first...
+        results = client.calls[1]["messages"][2]["content"]
+        self.assertEqual([r["tool_use_id"] for r in results], ["1", "2"])  # ...but order kept
+        self.assertEqual([r["content"] for r in results], ["contents of a", "contents of b"])
+        self.assertTrue(all(t.startswith("agent-tool") for t in agent.threads))
+
+    def test_nothing_after_done_runs(self):
+        client = _ScriptedClient([
+            _tool("1", "read", path="a"),
+            _tool("2", "read", path="b"),
+            _tool("3", "done", summary="Read both files a and b."),
+            _tool("4", "read", path="c"),
+            _tool("5", "read", path="d"),
+        ])
+        agent = _ReadAgent(client)
+        self.assertTrue(agent.run("read a and b")["success"])
+        self.assertEqual(sorted(agent.dispatched), ["a", "b"])
+
+    def test_read_after_write_sees_write(self):
+        client = _ScriptedClient(
+            [_tool("1", "write", path="a", text="NEW", delay=0.1),
+             _tool("2", "read", path="a"), _tool("3", "read", path="b")],
+            [_tool("4", "done", summary="Rewrote a and read it back.")],
+        )
+        agent = _ReadAgent(client)
+        self.assertTrue(agent.run("rewrite a")["success"])
+        self.assertEqual(agent.dispatched, ["a", "a", "b"])
+        results = client.calls[1]["messages"][2]["content"]
+        self.assertEqual([r["content"] for r in results], ["written", "NEW", "contents of b"])
+
+    def test_only_leading_reads_prefetched(self):
+        client = _ScriptedClient(
+            [_tool("1", "read", path="a"), _tool("2", "read", path="b"),
+             _tool("3", "write", path="b", text="NEW", delay=0.1), _tool("4", "read", path="b")],
+            [_tool("5", "done", summary="Read a and b, then rewrote b.")],
+        )
+        agent = _ReadAgent(client)
+        self.assertTrue(agent.run("rewrite b")["success"])
+        results = client.calls[1]["messages"][2]["content"]
+        self.assertEqual([r["content"] for r in results],
+                         ["contents of a", "contents of b", "written", "NEW"])
+
+    def test_pool_shared_across_agents(self):
+        self.assertIs(_ReadAgent(None)._pool, _ReadAgent(None)._pool)
+        self.assertIs(_ReadAgent(None)._pool, base_agent._tool_pool)
+
+
+class TestHelpers(unittest.TestCase):
+    """Test the small per-step helpers of the agent loop."""
+
+    def test_is_transient(self):
+        self.assertTrue(base_agent._is_transient(SimpleNamespace(status_code=429)))
+        self.assertTrue(base_agent._is_transient(Exception("Error code: tool_use_failed")))
+        self.assertTrue(base_agent._is_transient(Exception("Rate limit reached")))
+        self.assertFalse(base_agent._is_transient(SimpleNamespace(status_code=400)))
+        self.assertFalse(base_agent._is_transient(ValueError("bad request")))
+
+    def test_short_input(self):
+        preview = base_agent._short_input({"path": "a.py", "content": "x" * 10_000})
+        self.assertLessEqual(len(preview), 120)
+        self.assertTrue(preview.startswith('{"path": "a.py", "content": "xxx'))
+        self.assertEqual(base_agent._short_input({"n": 3}), '{"n": 3}')
+
+    def test_tools_cached_once_per_class(self):
+        class _Agent(_ReadAgent):
+            tools = [{"name": "read", "input_schema": {}}]
+
+        first = _Agent(None)._tools_cached
+        self.assertIs(_Agent(None)._tools_cached, first)
+        self.assertEqual([t["name"] for t in first], ["read", "done", "stuck"])
+        self.assertEqual([t["name"] for t in _ReadAgent(None)._tools_cached],
+                         ["done", "stuck"])  # The parent keeps its own list
+
+
+class TestCompiledScript(unittest.TestCase):
+    """Test the cached .scpt build of the progress sender."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_path_tracks_source(self):
+        digest = hashlib.sha1(base_agent._SCPT_SOURCE.encode()).hexdigest()[:12]
+        self.assertEqual(os.path.basename(base_agent._SCPT_PATH), f"tars_progress_{digest}.scpt")
+
+    def test_built_once_then_reused(self):
+        path = os.path.join(self._tmp.name, "p.scpt")
+
+        def osacompile(argv, **kwargs):
+            with open(argv[2], "w") as f:
+                f.write(argv[4])
+
+        with mock.patch.object(base_agent, "_SCPT_PATH", path), \
+             mock.patch.object(base_agent.subprocess, "run", side_effect=osacompile) as run:
+            self.assertEqual(base_agent._compiled_script(), path)
+            self.assertEqual(base_agent._compiled_script(), path)
+        run.assert_called_once()
+        self.assertEqual(os.listdir(self._tmp.name), ["p.scpt"])  # No temp file left
+
+    def test_failed_build(self):
+        path = os.path.join(self._tmp.name, "p.scpt")
+        with mock.patch.object(base_agent, "_SCPT_PATH", path), \
+             mock.patch.object(base_agent.subprocess, "run"):
+            self.assertIsNone(base_agent._compiled_script())
+
+
+class TestOsaWorker(unittest.TestCase):
+    """Test the lines fed to the long-lived `osascript -i`, using a stand-in process."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.procs = []
+        real_popen = subprocess.Popen
+
+        def popen(argv, **kwargs):
+            self.assertEqual(argv, ["osascript", "-i"])
+            out = os.path.join(self._tmp.name, f"stdin{len(self.procs)}.txt")
+            proc = real_popen([sys.executable, "-c",
+                               f"import sys; open({out!r}, 'w').write(sys.stdin.read())"],
+                              **kwargs)
+            self.procs.append((proc, out))
+            return proc
+
+        patcher = mock.patch.object(base_agent.subprocess, "Popen", side_effect=popen)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.worker = base_agent._OsaWorker()
+        self.addCleanup(self.worker.close)
+
+    def _lines(self, i=0):
+        self.worker.close()
+        proc, out = self.procs[i]
+        proc.wait(timeout=5)
+        with open(out) as f:
+            return f.read().splitlines()
+
+    def test_precompiled_protocol(self):
+        with mock.patch.object(base_agent, "_compiled_script", return_value="/tmp/a \"b\".scpt"):
+            self.worker.send("+15550001", 'say "hi"\nback\\slash')
+            self.worker.send("+15550001", "again")
+        self.assertEqual(self._lines(), [
+            'set tarsProgress to load script (POSIX file "/tmp/a \\"b\\".scpt")',
+            'run script tarsProgress with parameters {"+15550001", "say \\"hi\\"\\nback\\\\slash"}',
+            'run script tarsProgress with parameters {"+15550001", "again"}',
+        ])
+        self.assertEqual(len(self.procs), 1)  # One process for every message
+
+    def test_inline_protocol_without_scpt(self):
+        with mock.patch.object(base_agent, "_compiled_script", return_value=None):
+            self.worker.send("+15550001", "hi")
+        self.assertEqual(self._lines(), [
+            'tell application "Messages" to send "hi" to participant "+15550001" of '
+            '(1st account whose service type = iMessage)',
+        ])
+
+    def test_respawns_dead_worker(self):
+        with mock.patch.object(base_agent, "_compiled_script", return_value=None):
+            self.worker.send("+15550001", "one")
+            first = self.procs[0][0]
+            first.stdin.close()
+            first.wait(timeout=5)
+            self.worker.send("+15550001", "two")
+        self.assertEqual(len(self.procs), 2)
+        self.assertIn('send "two"', self._lines(1)[0])
+
+
+class TestProgressQueue(unittest.TestCase):
+    """Test coalescing of queued progress updates and the exit-time drain."""
+
+    def test_burst_coalesced_per_phone_and_drained(self):
+        sent = []
+        with mock.patch.object(base_agent._osa_worker, "send",
+                               side_effect=lambda phone, msg: sent.append((phone, msg))), \
+             mock.patch.object(base_agent._osa_worker, "close") as close:
+            base_agent._send_progress("+1", "step 3")
+            base_agent._send_progress("+2", "other")
+            base_agent._send_progress("+1", "done")
+            base_agent._send_progress(None, "dropped")
+            base_agent._shutdown_progress(timeout=5)
+        close.assert_called_once()
+        self.assertEqual(sorted(sent), [("+1", "step 3\n---\ndone"), ("+2", "other")])
+
+    def test_shutdown_bounded(self):
+        release = threading.Event()
+        with mock.patch.object(base_agent._osa_worker, "send",
+                               side_effect=lambda *a: release.wait(5)), \
+             mock.patch.object(base_agent._osa_worker, "close") as close:
+            base_agent._send_progress("+1", "slow")
+            started = time.monotonic()
+            base_agent._shutdown_progress(timeout=0.3)
+            self.assertLess(time.monotonic() - started, 2)
+            close.assert_called_once()
+            release.set()
+            base_agent._shutdown_progress(timeout=5)  # Let the send finish before unpatching
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: Browser           ║
+╚══════════════════════════════════════════╝
+
+Tests where browser failures surface (no Chrome needed).
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from hands import browser
+from agents.browser_agent import BrowserAgent
+
+
+def _no_chrome():
+    raise ConnectionError("Chrome not reachable")
+
+
+class TestErrorBoundary(unittest.TestCase):
+    """act_* raise; only the agent's tool dispatch turns errors into text."""
+
+    def test_failed_goto_stops_google(self):
+        with mock.patch.object(browser, "_ensure", side_effect=_no_chrome), \
+             mock.patch.object(browser, "act_read_page") as read_page:
+            self.assertRaises(ConnectionError, browser.act_google, "tars")
+        read_page.assert_not_called()  # No stale page passed off as results
+
+    def test_navigation_error_stops_google(self):
+        with mock.patch.object(browser, "act_goto", return_value="ERROR: Navigation failed: x"), \
+             mock.patch.object(browser, "act_read_page") as read_page:
+            self.assertEqual(browser.act_google("tars"), "ERROR: Navigation failed: x")
+        read_page.assert_not_called()
+
+    def test_failed_goto_falls_back_in_booking(self):
+        from hands import flight_search
+        sender = mock.Mock()
+        with mock.patch.object(browser, "act_goto", side_effect=_no_chrome), \
+             mock.patch.object(browser, "act_read_page") as read_page, \
+             mock.patch.object(flight_search, "_get_airline_booking_url",
+                               return_value="https://www.united.com/book"), \
+             mock.patch.object(flight_search, "search_flights", return_value={"flights": []}), \
+             mock.patch("voice.imessage_send.IMessageSender", sender):
+            result = flight_search.book_flight("SFO", "JFK", "2026-12-01", airline="United")
+        self.assertFalse(result["success"])
+        read_page.assert_not_called()
+        sender.assert_not_called()  # No "Booking started!" for a page that never opened
+
+    def test_dispatch_reports_error(self):
+        agent = BrowserAgent.__new__(BrowserAgent)
+        with mock.patch.object(browser, "_ensure", side_effect=_no_chrome):
+            self.assertEqual(agent._dispatch("goto", {"url": "https://example.com"}),
+                             "ERROR: ConnectionError: Chrome not reachable")
+            self.assertEqual(agent._dispatch("look", {}),
+                             "ERROR: ConnectionError: Chrome not reachable")
+
+    def test_dispatch_missing_input(self):
+        agent = BrowserAgent.__new__(BrowserAgent)
+        self.assertEqual(agent._dispatch("goto", {}), "ERROR: missing required input 'url'")
+        self.assertEqual(agent._dispatch("nope", {}), "Unknown browser tool: nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
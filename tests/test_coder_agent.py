@@ -0,0 +1,57 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: Coder Agent       ║
+╚══════════════════════════════════════════╝
+
+Tests the Coder Agent's file editing (no LLM needed).
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from agents.coder_agent import CoderAgent
+
+
+class TestEditFile(unittest.TestCase):
+    """Test surgical string replacement."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "a.py")
+        self.agent = CoderAgent.__new__(CoderAgent)
+
+    def _edit(self, content, old, new):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        result = self.agent._edit_file(self.path, old, new)
+        with open(self.path, encoding="utf-8") as f:
+            return result, f.read()
+
+    def test_unique_match_replaced(self):
+        result, content = self._edit("a = 1\nb = 2\n", "b = 2", "b = 3")
+        self.assertTrue(result.startswith("✅"))
+        self.assertEqual(content, "a = 1\nb = 3\n")
+
+    def test_not_found(self):
+        result, content = self._edit("a = 1\n", "zzz", "y")
+        self.assertIn("not found", result)
+        self.assertEqual(content, "a = 1\n")
+
+    def test_duplicate_reports_count(self):
+        result, content = self._edit("x\nx\nx\n", "x", "y")
+        self.assertIn("found 3 times", result)
+        self.assertEqual(content, "x\nx\nx\n")
+
+    def test_overlapping_occurrence_is_unique(self):
+        # Like str.count: "aa" occurs once, non-overlapping, in "aaa"
+        result, content = self._edit("aaa", "aa", "b")
+        self.assertTrue(result.startswith("✅"))
+        self.assertEqual(content, "ba")
+
+
+if __name__ == "__main__":
+    unittest.main()
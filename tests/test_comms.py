@@ -0,0 +1,188 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: Agent Comms        ║
+╚══════════════════════════════════════════╝
+
+Tests inter-agent message log queries, handoff text,
+and the conversation log.
+"""
+
+import unittest
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from agents.comms import AgentComms
+
+
+class TestGetMessages(unittest.TestCase):
+    """Test filtered tail queries over the message log."""
+
+    def setUp(self):
+        self.comms = AgentComms()
+        for i in range(10):
+            sender = "browser" if i % 2 == 0 else "coder"
+            self.comms.send(sender, "brain", f"msg {i}", msg_type="info" if i < 5 else "result")
+
+    def test_limit_returns_newest_oldest_first(self):
+        msgs = self.comms.get_messages(limit=3)
+        self.assertEqual([m.content for m in msgs], ["msg 7", "msg 8", "msg 9"])
+
+    def test_filter_by_agent(self):
+        msgs = self.comms.get_messages(agent="browser", limit=2)
+        self.assertEqual([m.content for m in msgs], ["msg 6", "msg 8"])
+
+    def test_filter_by_agent_and_type(self):
+        msgs = self.comms.get_messages(agent="coder", msg_type="info")
+        self.assertEqual([m.content for m in msgs], ["msg 1", "msg 3"])
+
+    def test_to_agent_matches(self):
+        self.assertEqual(len(self.comms.get_messages(agent="brain", limit=50)), 10)
+
+    def test_zero_limit(self):
+        self.assertEqual(self.comms.get_messages(limit=0), [])
+
+
+class TestMessageWindow(unittest.TestCase):
+    """Test that the message log is bounded."""
+
+    def test_oldest_messages_dropped(self):
+        comms = AgentComms()
+        for i in range(AgentComms.MAX_MESSAGES + 5):
+            comms.send("a", "b", f"m{i}")
+        self.assertEqual(len(comms._messages), AgentComms.MAX_MESSAGES)
+        self.assertEqual(comms._messages[0].content, "m5")
+
+    def test_conversation_log_shows_last_30(self):
+        comms = AgentComms()
+        for i in range(40):
+            comms.send("a", "b", f"m{i}")
+        lines = comms.get_conversation_log().splitlines()
+        self.assertEqual(len(lines), 31)
+        self.assertTrue(lines[1].endswith("m10"))
+        self.assertTrue(lines[-1].endswith("m39"))
+
+
+class TestContentPreview(unittest.TestCase):
+    """Test eager truncation of stored message content."""
+
+    def test_long_content_truncated_by_default(self):
+        comms = AgentComms()
+        msg = comms.send("coder", "brain", "x" * 5000)
+        self.assertEqual(len(msg.content), AgentComms.PREVIEW_LEN)
+        self.assertEqual(msg.preview, msg.content)
+
+    def test_store_full_content_opt_in(self):
+        comms = AgentComms()
+        comms.STORE_FULL_CONTENT = True
+        msg = comms.send("coder", "brain", "x" * 5000)
+        self.assertEqual(len(msg.content), 5000)
+        self.assertEqual(len(msg.preview), AgentComms.PREVIEW_LEN)
+
+
+class TestHandoff(unittest.TestCase):
+    """Test handoff text assembly."""
+
+    def test_handoff_with_task(self):
+        comms = AgentComms()
+        text = comms.handoff("browser", "coder", "Found the login form.", task="Write the script")
+        self.assertEqual(text, (
+            "=== HANDOFF FROM BROWSER AGENT ===\n"
+            "Previous agent (browser) worked on this task and provides context:\n"
+            "Found the login form.\n"
+            "Task for you: Write the script\n"
+            "=== END HANDOFF ==="
+        ))
+        self.assertEqual(comms.get_handoff_context("coder"), text)
+
+    def test_handoff_without_task_includes_scratchpad(self):
+        comms = AgentComms()
+        comms.write_scratchpad("login_url", "https://x.test/login", "urls", "browser")
+        text = comms.handoff("browser", "coder", "ctx")
+        self.assertIn("ctx\n\n\n## Shared Scratchpad\n", text)
+        self.assertTrue(text.endswith("https://x.test/login\n=== END HANDOFF ==="))
+
+
+class TestDedupe(unittest.TestCase):
+    """Test folding of consecutive identical messages."""
+
+    def setUp(self):
+        self.comms = AgentComms()
+
+    def test_repeat_bumps_count(self):
+        first = self.comms.send("brain", "browser", "still waiting")
+        again = self.comms.send("brain", "browser", "still waiting")
+        self.assertIs(first, again)
+        self.assertEqual(len(self.comms._messages), 1)
+        self.assertEqual(first.metadata["count"], 2)
+        self.comms.send("brain", "browser", "still waiting")
+        self.assertEqual(first.metadata["count"], 3)
+        self.assertIn("still waiting (×3)", self.comms.get_conversation_log())
+
+    def test_different_field_appends(self):
+        self.comms.send("brain", "browser", "ping")
+        self.comms.send("brain", "coder", "ping")
+        self.comms.send("brain", "coder", "ping", msg_type="request")
+        self.comms.send("brain", "coder", "pong", msg_type="request")
+        self.assertEqual(len(self.comms._messages), 4)
+        self.assertNotIn("×", self.comms.get_conversation_log())
+
+    def test_same_preview_different_tail_appends(self):
+        prefix = "x" * 200
+        self.comms.send("coder", "brain", prefix + " RESULT: tests passed", msg_type="result")
+        self.comms.send("coder", "brain", prefix + " RESULT: tests FAILED", msg_type="result")
+        self.assertEqual(len(self.comms._messages), 2)
+        self.assertNotIn("×", self.comms.get_conversation_log())
+
+    def test_different_metadata_appends(self):
+        meta = {"step": 1}
+        self.comms.send("brain", "browser", "ping", metadata=meta)
+        self.comms.send("brain", "browser", "ping", metadata={"step": 2})
+        self.comms.send("brain", "browser", "ping", metadata={"step": 2})
+        self.assertEqual(len(self.comms._messages), 2)
+        self.assertEqual(self.comms._messages[-1].metadata, {"step": 2, "count": 2})
+        self.assertEqual(meta, {"step": 1})  # Caller's dict untouched
+
+    def test_non_consecutive_repeat_appends(self):
+        self.comms.send("brain", "browser", "ping")
+        self.comms.send("browser", "brain", "ack")
+        self.comms.send("brain", "browser", "ping")
+        self.assertEqual(len(self.comms._messages), 3)
+
+
+class TestThreadSafety(unittest.TestCase):
+    """Test concurrent senders and readers."""
+
+    def test_concurrent_send_and_read(self):
+        comms = AgentComms()
+        errors = []
+
+        def sender(n):
+            try:
+                for i in range(300):
+                    comms.send(f"agent{n}", "brain", f"{n}-{i}")
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(300):
+                    comms.get_messages(agent="brain", limit=50)
+                    comms.get_conversation_log()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=sender, args=(n,)) for n in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(comms._messages), 1200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,911 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: Dev Agent          ║
+╚══════════════════════════════════════════╝
+
+Tests the Dev Agent's local project helpers (no VS Code needed).
+"""
+
+import unittest
+import importlib.util
+import subprocess
+import time
+import threading
+import tempfile
+import sys
+import os
+from types import SimpleNamespace
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import agents.dev_agent as dev_agent
+from agents.dev_agent import DevAgent
+
+
+def _bare_agent():
+    """A DevAgent without an LLM client — enough for filesystem helpers."""
+    return DevAgent.__new__(DevAgent)
+
+
+class TestTakeSnapshot(unittest.TestCase):
+    """Test the file mtime snapshot used for change detection."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        for rel in ("a.py", "src/b.py", "src/deep/c.txt",
+                    "node_modules/x.js", ".git/HEAD", "src/__pycache__/b.pyc",
+                    ".venv/lib.py", "target/debug/app", ".pytest_cache/v"):
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(rel)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_collects_files_and_skips_dirs(self):
+        snap = _bare_agent()._take_snapshot(self.root)
+        rels = {os.path.relpath(p, self.root) for p in snap}
+        self.assertEqual(rels, {
+            "a.py", os.path.join("src", "b.py"),
+            os.path.join("src", "deep", "c.txt"),
+        })
+        a_py = os.path.join(self.root, "a.py")
+        self.assertEqual(snap.size(a_py), len("a.py"))
+        self.assertEqual(snap.mtime(a_py), os.stat(a_py).st_mtime)
+
+    def test_symlinked_dir_not_followed(self):
+        if not hasattr(os, "symlink"):
+            self.skipTest("no symlink support")
+        os.symlink(os.path.join(self.root, "src"), os.path.join(self.root, "link"))
+        snap = _bare_agent()._take_snapshot(self.root)
+        self.assertFalse(any("link" in p for p in snap))
+
+    def test_missing_path(self):
+        self.assertEqual(len(_bare_agent()._take_snapshot(os.path.join(self.root, "nope"))), 0)
+
+    def test_fallback_diff(self):
+        agent = _bare_agent()
+        agent._watchers = {}
+        agent._snapshots = {self.root: agent._take_snapshot(self.root)}
+        a_py = os.path.join(self.root, "a.py")
+        os.utime(a_py, (1, 1))
+        os.remove(os.path.join(self.root, "src", "b.py"))
+        with open(os.path.join(self.root, "n.py"), "w") as f:
+            f.write("n")
+        report = agent._get_file_change_report(self.root)
+        self.assertEqual(report, "\n".join([
+            "### File Changes",
+            "Modified (1): a.py",
+            "New (1): n.py",
+            f"Deleted (1): {os.path.join('src', 'b.py')}",
+        ]))
+        self.assertEqual(agent._get_file_change_report(self.root), "")
+
+    def test_fallback_refreshes_baseline_in_place(self):
+        agent = _bare_agent()
+        agent._watchers = {}
+        baseline = agent._take_snapshot(self.root)
+        agent._snapshots = {self.root: baseline}
+        n_py = os.path.join(self.root, "n.py")
+        with open(n_py, "w") as f:
+            f.write("n")
+        self.assertIn("New (1): n.py", agent._get_file_change_report(self.root))
+        os.utime(n_py, (1, 1))
+        self.assertEqual(agent._get_file_change_report(self.root),
+                         "### File Changes\nModified (1): n.py")
+        self.assertIs(agent._snapshots[self.root], baseline)
+        self.assertEqual(baseline.mtime(n_py), 1)
+
+
+class TestChangeFeedFilter(unittest.TestCase):
+    """Test skip-dir filtering of raw filesystem events."""
+
+    def _event(self, etype, path, is_directory=False, dest=None):
+        return mock.Mock(event_type=etype, src_path=path,
+                         is_directory=is_directory, dest_path=dest)
+
+    def test_filters_below_root_only(self):
+        root = "/home/u/build/app/"
+        feed = dev_agent._ChangeFeed(root)
+        for path in ("/home/u/build/app/src/a.py",
+                     "/home/u/build/app/node_modules/x/y.js",
+                     "/home/u/build/app/.git/index",
+                     "/home/u/build/app/dist.py",
+                     "/home/u/build/app/lib/__pycache__/m.pyc"):
+            feed.dispatch(self._event("modified", path))
+        feed.dispatch(self._event("deleted", "/home/u/build/app/node_modules", True))
+        feed.dispatch(self._event("deleted", "/home/u/build/app/old", True))
+        feed.dispatch(self._event("modified", "/home/u/build/app/src", True))
+        feed.dispatch(self._event("opened", "/home/u/build/app/src/b.py"))
+        files, dirs = feed.drain()
+        self.assertEqual(files, {"/home/u/build/app/src/a.py", "/home/u/build/app/dist.py"})
+        self.assertEqual(dirs, {"/home/u/build/app/old"})
+        self.assertEqual(feed.drain(), (set(), set()))
+
+    def test_move_records_both_ends(self):
+        feed = dev_agent._ChangeFeed("/p")
+        feed.dispatch(self._event("moved", "/p/a.tmp", dest="/p/a.py"))
+        self.assertEqual(feed.drain()[0], {"/p/a.tmp", "/p/a.py"})
+
+
+@unittest.skipUnless(importlib.util.find_spec("watchdog"), "watchdog not installed")
+class TestChangeFeed(unittest.TestCase):
+    """Test the event-driven file change report."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self._tmp.name)
+        for rel in ("keep.py", "edit.py", "drop.py", "olddir/x.py"):
+            self._write(rel, "v1")
+        self.agent = _bare_agent()
+        self.agent._snapshots = {}
+        feed = dev_agent._start_change_feed(self.root)
+        self.assertIsNotNone(feed)
+        self.agent._watchers = {self.root: feed}
+        self.agent._snapshots[self.root] = self.agent._take_snapshot(self.root)
+
+    def tearDown(self):
+        self.agent._stop_watchers()
+        self._tmp.cleanup()
+
+    def _write(self, rel, text):
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def _report(self):
+        time.sleep(0.5)  # let the observer thread deliver events
+        return self.agent._get_file_change_report(self.root)
+
+    def test_reports_only_changes(self):
+        time.sleep(0.05)
+        edit = self._write("edit.py", "v2 longer")
+        os.utime(edit, (1, 1))
+        self._write("src/new.py", "n")
+        self._write("node_modules/dep.js", "ignored")
+        os.remove(os.path.join(self.root, "drop.py"))
+
+        report = self._report()
+        self.assertIn("Modified (1): edit.py", report)
+        self.assertIn(f"New (1): {os.path.join('src', 'new.py')}", report)
+        self.assertIn("Deleted (1): drop.py", report)
+        self.assertNotIn("keep.py", report)
+        self.assertNotIn("node_modules", report)
+        self.assertEqual(self._report(), "")
+
+    def test_rename_over_existing_is_modified(self):
+        tmp = self._write("edit.py.tmp", "v2")
+        os.utime(tmp, (1, 1))
+        os.replace(tmp, os.path.join(self.root, "edit.py"))
+        report = self._report()
+        self.assertIn("Modified (1): edit.py", report)
+        self.assertNotIn("New", report)
+
+    def test_removed_directory(self):
+        import shutil
+        shutil.rmtree(os.path.join(self.root, "olddir"))
+        report = self._report()
+        self.assertIn(f"Deleted (1): {os.path.join('olddir', 'x.py')}", report)
+
+
+class TestScandirScans(unittest.TestCase):
+    """Test the os.scandir replacements for `find`."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        for rel in ("a.py", "old.py", "src/b.py", "src/deep/er/c.py",
+                    "node_modules/x.js", "venv/lib.py", ".git/HEAD"):
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        old = time.time() - 3600
+        os.utime(os.path.join(self.root, "old.py"), (old, old))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _rel(self, paths):
+        return {os.path.relpath(p, self.root) for p in paths}
+
+    def test_scan_recent(self):
+        recent = self._rel(dev_agent._scan_recent(self.root, max_age=120))
+        self.assertEqual(recent, {"a.py", os.path.join("src", "b.py"),
+                                  os.path.join("src", "deep", "er", "c.py")})
+        self.assertEqual(len(dev_agent._scan_recent(self.root, limit=2)), 2)
+        self.assertEqual(_bare_agent()._count_recent_files(self.root, minutes=2), 3)
+
+    def test_scan_project_tree_depth_and_skips(self):
+        lines, _ = dev_agent._scan_project(self.root, max_depth=3)
+        self.assertEqual(lines[0], self.root)
+        rels = self._rel(lines[1:])
+        self.assertIn("node_modules", rels)
+        self.assertNotIn(os.path.join("node_modules", "x.js"), rels)
+        self.assertIn(os.path.join("src", "deep", "er"), rels)
+        self.assertNotIn(os.path.join("src", "deep", "er", "c.py"), rels)
+        self.assertEqual(len(dev_agent._scan_project(self.root, limit=4)[0]), 4)
+
+    def test_scan_project_preorder(self):
+        lines, _ = dev_agent._scan_project(self.root, max_depth=3)
+        rels = [os.path.relpath(p, self.root) for p in lines[1:]]
+        under_src = [i for i, r in enumerate(rels) if r.startswith("src" + os.sep)]
+        start = rels.index("src") + 1
+        self.assertEqual(under_src, list(range(start, start + len(under_src))))
+
+    def test_scan_project_counts_past_limits(self):
+        self.assertEqual(dev_agent._scan_project(self.root, max_depth=1, limit=2)[1], 4)
+        self.assertEqual(dev_agent._scan_project(self.root, count_skip=frozenset())[1], 7)
+
+    def test_scan_project_prunes_build_output(self):
+        for rel in (".next/cache/a.js", "dist/bundle.js", ".venv/lib/x.py"):
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        with mock.patch.object(dev_agent, "_dir_entries", wraps=dev_agent._dir_entries) as ls:
+            lines, count = dev_agent._scan_project(self.root)
+        listed = {os.path.relpath(c.args[0], self.root) for c in ls.call_args_list}
+        self.assertFalse(listed & {".next", ".venv", os.path.join(".next", "cache")})
+        rels = self._rel(lines[1:])
+        self.assertTrue({".next", "dist", ".venv"} <= rels)
+        self.assertNotIn(os.path.join("dist", "bundle.js"), rels)
+        self.assertEqual(count, 5)  # dist/bundle.js still counts
+
+    def test_scan_project_counts_extensions(self):
+        os.makedirs(os.path.join(self.root, "web"))
+        for rel in ("README", os.path.join("web", "app.JS")):
+            open(os.path.join(self.root, rel), "w").close()
+        by_ext = dev_agent.Counter()
+        dev_agent._scan_project(self.root, by_ext=by_ext)
+        self.assertEqual(by_ext, {".py": 4, ".js": 1, "": 1})
+
+
+class TestGitReport(unittest.TestCase):
+    """Test the batched git report."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+        def git(*args):
+            subprocess.run(["git", "-C", self.root, *args], check=True,
+                           capture_output=True)
+        self.git = git
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_sections(self):
+        self.git("init", "-q")
+        self.git("config", "user.email", "t@example.com")
+        self.git("config", "user.name", "t")
+        with open(os.path.join(self.root, "a.txt"), "w") as f:
+            f.write("one\n")
+        self.git("add", "a.txt")
+        self.git("commit", "-qm", "first")
+        with open(os.path.join(self.root, "a.txt"), "w") as f:
+            f.write("two\n")
+        with open(os.path.join(self.root, "new.txt"), "w") as f:
+            f.write("x\n")
+
+        report = _bare_agent()._get_git_report(self.root)
+        self.assertIn("### Git Diff (unstaged)\n```\nM a.txt\n```", report)
+        self.assertNotIn("### Git Diff (staged)", report)
+        self.assertIn("### New Files\n```\nnew.txt\n```", report)
+        self.assertIn("### Recent Commits", report)
+        self.assertIn("first", report)
+        self.assertIn("+two", report)
+        self.assertNotIn("\0", report)
+
+    def test_diff_bounded(self):
+        self.git("init", "-q")
+        self.git("config", "user.email", "t@example.com")
+        self.git("config", "user.name", "t")
+        for name in ("app.py", "yarn.lock"):
+            with open(os.path.join(self.root, name), "w") as f:
+                f.write("a\n")
+        self.git("add", ".")
+        self.git("commit", "-qm", "first")
+        with open(os.path.join(self.root, "app.py"), "w") as f:
+            f.write("x" * 100000 + "\n")
+        with open(os.path.join(self.root, "yarn.lock"), "w") as f:
+            f.write("b\n")
+
+        report = _bare_agent()._get_git_report(self.root)
+        detail = report.split("### Diff Detail", 1)[1]
+        self.assertIn("app.py", detail)
+        self.assertNotIn("yarn.lock", detail)
+        self.assertLessEqual(len(detail), dev_agent._DIFF_MAX_BYTES + 100)
+        self.assertIn("M yarn.lock", report)  # still listed as changed
+
+    def test_staged_and_renamed(self):
+        self.git("init", "-q")
+        self.git("config", "user.email", "t@example.com")
+        self.git("config", "user.name", "t")
+        with open(os.path.join(self.root, "old name.txt"), "w") as f:
+            f.write("content\n" * 20)
+        self.git("add", ".")
+        self.git("commit", "-qm", "first")
+        self.git("mv", "old name.txt", "new name.txt")
+
+        report = _bare_agent()._get_git_report(self.root)
+        self.assertIn("### Git Diff (staged)\n```\nR new name.txt <- old name.txt\n```", report)
+        self.assertNotIn("(unstaged)", report)
+
+    def test_quote_in_path(self):
+        self.root = os.path.join(self.root, "it's here")
+        os.makedirs(self.root)
+        self.git("init", "-q")
+        with open(os.path.join(self.root, "new.txt"), "w") as f:
+            f.write("x\n")
+        report = _bare_agent()._get_git_report(self.root)
+        self.assertIn("### New Files\n```\nnew.txt\n```", report)
+        dev_agent._clear_cmd_cache()
+        self.assertIn("?? new.txt", dev_agent._git_sections(self.root)[0])
+
+    def test_not_a_repo(self):
+        report = _bare_agent()._get_git_report(self.root)
+        self.assertEqual(report, "### Git\nNo git changes detected.")
+
+    def test_wait_and_report_assembles_in_order(self):
+        agent = _bare_agent()
+        agent._pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(agent._pool.shutdown)
+        baseline = dev_agent._Snapshot()
+        baseline.add(os.path.join(self.root, "gone.txt"), 0.0, 1)
+        agent._snapshots = {self.root: baseline}
+        agent._watchers = {}
+        agent._last_reports = {}
+        with open(os.path.join(self.root, "a.txt"), "w") as f:
+            f.write("x")
+        with mock.patch.object(DevAgent, "_read_chat_output", return_value="chat says hi"):
+            report = agent._wait_and_report(self.root, max_wait=0)
+        git_at = report.index("### Git")
+        files_at = report.index("### File Changes")
+        chat_at = report.index("### Agent Mode Output\nchat says hi")
+        self.assertLess(git_at, files_at)
+        self.assertLess(files_at, chat_at)
+
+    def test_wait_and_report_skips_when_idle(self):
+        agent = _bare_agent()
+        agent._pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(agent._pool.shutdown)
+        agent._last_reports = {self.root: time.time()}
+        with mock.patch.object(DevAgent, "_is_vscode_active", return_value=False), \
+             mock.patch.object(DevAgent, "_get_git_report", return_value="### Git") as git_report, \
+             mock.patch.object(DevAgent, "_get_file_change_report", return_value=""), \
+             mock.patch.object(DevAgent, "_read_chat_output", return_value=""):
+            report = agent._wait_and_report(self.root, max_wait=0)
+            self.assertIn("skipping full diff scan", report)
+            git_report.assert_not_called()
+
+            touched = os.path.join(self.root, "new.txt")
+            open(touched, "w").close()
+            os.utime(touched, (time.time() + 5, time.time() + 5))
+            report = agent._wait_and_report(self.root, max_wait=0)
+            self.assertIn("## Agent Mode Report", report)
+            git_report.assert_called_once()
+
+
+class TestNotifyDebounce(unittest.TestCase):
+    """Test that bursts of notify_user calls go out as one iMessage."""
+
+    def setUp(self):
+        self.sender = mock.Mock()
+        patcher = mock.patch.object(dev_agent, "_load_project_scan_cache", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.agent = DevAgent(llm_client=None, model="m",
+                              imessage_sender=self.sender,
+                              imessage_reader=mock.Mock())
+        patcher = mock.patch.object(DevAgent, "NOTIFY_DEBOUNCE", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_coalesced(self):
+        self.assertEqual(self.agent._notify_user("one"), "Notification queued.")
+        self.agent._notify_user("two")
+        self.agent._notify_user("three")
+        self.agent._flush_notifications()
+        self.sender.send.assert_called_once_with("Dev Agent:\none\n---\ntwo\n---\nthree")
+
+    def test_sent_in_background(self):
+        self.agent._notify_user("later")
+        for _ in range(100):
+            if self.sender.send.called:
+                break
+            time.sleep(0.01)
+        self.sender.send.assert_called_once_with("Dev Agent:\nlater")
+
+    def test_batch_capped(self):
+        with mock.patch.object(DevAgent, "NOTIFY_DEBOUNCE", 5):
+            for i in range(DevAgent.NOTIFY_BATCH_MAX + 2):
+                self.agent._notify_user(str(i))
+            self.agent._flush_notifications()
+        sent = [c.args[0] for c in self.sender.send.call_args_list]
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(sent[0].count("---"), DevAgent.NOTIFY_BATCH_MAX - 1)
+        self.assertEqual(sent[1], "Dev Agent:\n8\n---\n9")
+
+    def test_ask_user_flushes_first(self):
+        self.agent._imessage_reader.wait_for_reply.return_value = {"success": True, "content": "yes"}
+        self.agent._notify_user("heads up")
+        self.agent._ask_user("ok?")
+        sent = [c.args[0] for c in self.sender.send.call_args_list]
+        self.assertEqual(sent, ["Dev Agent:\nheads up", "Dev Agent:\nok?"])
+
+    def test_done_flushes(self):
+        self.agent._notify_user("last")
+        self.agent._on_done("finished")
+        self.sender.send.assert_called_once_with("Dev Agent:\nlast")
+
+
+class TestParsePorcelainV2(unittest.TestCase):
+    """Test parsing of `git status --porcelain=v2 -z` records."""
+
+    def test_all_kinds(self):
+        h = "100644 100644 100644 abc abc"
+        data = "\0".join([
+            f"1 .M N... {h} src/a.py",
+            f"1 MM N... {h} b.py",
+            f"1 A. N... {h} with space.py",
+            f"2 R. N... {h} R100 new.py", "old.py",
+            f"u UU N... 100644 100644 100644 100644 a b c conflict.py",
+            "? untracked.txt",
+        ]) + "\0"
+        staged, unstaged, untracked = dev_agent._parse_porcelain_v2(data)
+        self.assertEqual(staged, ["M b.py", "A with space.py", "R new.py <- old.py"])
+        self.assertEqual(unstaged, ["M src/a.py", "M b.py", "U conflict.py"])
+        self.assertEqual(untracked, ["untracked.txt"])
+
+    def test_empty(self):
+        self.assertEqual(dev_agent._parse_porcelain_v2(""), ([], [], []))
+
+
+class TestPersistentShell(unittest.TestCase):
+    """Test the long-lived probe shell."""
+
+    def setUp(self):
+        self.shell = dev_agent._PersistentShell()
+        self.addCleanup(self.shell.close)
+
+    def test_output_and_exit_code(self):
+        self.assertEqual(self.shell.run("echo hi; echo err >&2"), (0, "hi\nerr\n"))
+        self.assertEqual(self.shell.run("printf 'no newline'; exit 3"), (3, "no newline"))
+        self.assertEqual(self.shell.run("true"), (0, ""))
+
+    def test_reuses_one_process(self):
+        pid = self.shell.run("echo $PPID")[1]
+        self.assertEqual(self.shell.run("echo $PPID")[1], pid)
+
+    def test_commands_isolated(self):
+        self.shell.run("cd /; X=1")
+        self.assertEqual(self.shell.run("pwd")[1], os.getcwd() + "\n")
+        self.assertEqual(self.shell.run("echo \"[$X]\"")[1], "[]\n")
+
+    def test_nul_bytes_pass_through(self):
+        self.assertEqual(self.shell.run("printf 'a\\0b'")[1], "a\0b")
+
+    def test_does_not_read_shell_stdin(self):
+        self.assertEqual(self.shell.run("cat; echo done")[1], "done\n")
+
+    def test_timeout_restarts(self):
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.shell.run("sleep 5", timeout=0.2)
+        self.assertEqual(self.shell.run("echo back"), (0, "back\n"))
+
+    def test_probe_terminal_shape(self):
+        r = dev_agent._probe_terminal("echo ok")
+        self.assertEqual(r, {"success": True, "content": "ok", "exit_code": 0, "error": False})
+        self.assertEqual(dev_agent._probe_terminal("exit 1")["content"], "(no output)")
+
+
+class TestCachedTerminal(unittest.TestCase):
+    """Test the short-TTL cache for read-only shell probes."""
+
+    def setUp(self):
+        dev_agent._clear_cmd_cache()
+        patcher = mock.patch.object(dev_agent, "run_terminal",
+                                    side_effect=lambda cmd, timeout=60: {"content": cmd})
+        self.run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(dev_agent._clear_cmd_cache)
+
+    def test_repeat_within_ttl_hits(self):
+        dev_agent._cached_terminal("git log")
+        self.assertEqual(dev_agent._cached_terminal("git log"), {"content": "git log"})
+        self.assertEqual(self.run.call_count, 1)
+
+    def test_expired_reruns(self):
+        dev_agent._cached_terminal("git log", ttl=0)
+        dev_agent._cached_terminal("git log", ttl=0)
+        self.assertEqual(self.run.call_count, 2)
+
+    def test_bounded(self):
+        for i in range(dev_agent._CMD_CACHE_MAX + 10):
+            dev_agent._cached_terminal(f"echo {i}")
+        self.assertEqual(len(dev_agent._cmd_cache), dev_agent._CMD_CACHE_MAX)
+        dev_agent._cached_terminal("echo 0")  # evicted — runs again
+        self.assertEqual(self.run.call_count, dev_agent._CMD_CACHE_MAX + 11)
+
+    def test_mutating_tools_invalidate(self):
+        agent = _bare_agent()
+        agent._dispatch("git", {"command": "status"})
+        agent._dispatch("git", {"command": "status"})
+        self.assertEqual(self.run.call_count, 1)
+        agent._dispatch("git", {"command": "commit -am x"})
+        agent._dispatch("git", {"command": "status"})
+        self.assertEqual(self.run.call_count, 3)
+        agent._dispatch("run_command", {"command": "touch f"})
+        agent._dispatch("git", {"command": "status"})
+        self.assertEqual(self.run.call_count, 5)
+
+
+class TestProjectScanCache(unittest.TestCase):
+    """Test the on-disk project scan cache."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self._tmp.name, "cache", "project_scan.json")
+        self.project = os.path.join(self._tmp.name, "proj")
+        os.makedirs(self.project)
+        with open(os.path.join(self.project, "requirements.txt"), "w") as f:
+            f.write("x\n")
+        patcher = mock.patch.object(dev_agent, "PROJECT_SCAN_CACHE_PATH", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _agent(self):
+        agent = _bare_agent()
+        agent._project_cache = dev_agent._load_project_scan_cache()
+        return agent
+
+    def _git(self, *args):
+        subprocess.run(["git", "-C", self.project, *args], check=True,
+                       capture_output=True)
+
+    def test_reused_across_agents(self):
+        scan = self._agent()._project_scan(self.project)
+        self.assertIn("Python (pip)", scan)
+        with mock.patch.object(dev_agent, "_scan_project") as tree:
+            self.assertEqual(self._agent()._project_scan(self.project), scan)
+        tree.assert_not_called()
+
+    def test_new_commit_invalidates(self):
+        self._git("init", "-q")
+        self._git("config", "user.email", "t@example.com")
+        self._git("config", "user.name", "t")
+        self._git("add", ".")
+        self._git("commit", "-qm", "first")
+        self._agent()._project_scan(self.project)
+        with mock.patch.object(dev_agent, "_scan_project", return_value=([], 0)) as tree:
+            self._agent()._project_scan(self.project)
+            tree.assert_not_called()
+            time.sleep(0.01)
+            self._git("commit", "-q", "--allow-empty", "-m", "second")
+            self._agent()._project_scan(self.project)
+            tree.assert_called_once()
+
+    def test_expired_entry_rescanned(self):
+        agent = self._agent()
+        agent._project_scan(self.project)
+        agent._project_cache[self.project]["ts"] -= dev_agent.PROJECT_SCAN_CACHE_TTL + 1
+        with mock.patch.object(dev_agent, "_scan_project", return_value=([], 0)) as tree:
+            agent._project_scan(self.project)
+        tree.assert_called_once()
+
+    def test_aliases_share_entry(self):
+        link = os.path.join(self._tmp.name, "link")
+        os.symlink(self.project, link)
+        agent = self._agent()
+        scan = agent._project_scan(self.project + "/")
+        with mock.patch.object(dev_agent, "_scan_project") as tree:
+            self.assertEqual(agent._project_scan(link), scan)
+        tree.assert_not_called()
+        self.assertEqual(list(agent._project_cache), [os.path.realpath(self.project)])
+
+    def test_child_change_invalidates(self):
+        os.makedirs(os.path.join(self.project, "src"))
+        agent = self._agent()
+        agent._project_scan(self.project)
+        new = os.path.join(self.project, "src", "new.py")
+        open(new, "w").close()
+        future = time.time() + 5
+        os.utime(os.path.join(self.project, "src"), (future, future))
+        with mock.patch.object(dev_agent, "_scan_project", return_value=([], 0)) as tree:
+            agent._project_scan(self.project)
+        tree.assert_called_once()
+
+    def test_grandchild_and_backdated_changes_invalidate(self):
+        os.makedirs(os.path.join(self.project, "src", "pkg"))
+        agent = self._agent()
+        agent._project_scan(self.project)
+        open(os.path.join(self.project, "src", "pkg", "new.py"), "w").close()
+        with mock.patch.object(dev_agent, "_scan_project", return_value=([], 0)) as tree:
+            agent._project_scan(self.project)
+            tree.assert_called_once()
+            past = time.time() - 3600
+            os.utime(os.path.join(self.project, "src"), (past, past))
+            agent._project_scan(self.project)
+            self.assertEqual(tree.call_count, 2)
+
+    def test_pycache_churn_keeps_entry(self):
+        agent = self._agent()
+        agent._project_scan(self.project)
+        os.makedirs(os.path.join(self.project, "__pycache__"))
+        with mock.patch.object(dev_agent, "_scan_project") as tree:
+            agent._project_scan(self.project)
+        tree.assert_not_called()
+
+    def test_git_sections_one_probe(self):
+        self._git("init", "-q")
+        self._git("config", "user.email", "t@t")
+        self._git("config", "user.name", "t")
+        open(os.path.join(self.project, "a.py"), "w").close()
+        self._git("add", ".")
+        self._git("commit", "-qm", "first")
+        open(os.path.join(self.project, "b.py"), "w").close()
+        dev_agent._clear_cmd_cache()
+        with mock.patch.object(dev_agent, "_probe_terminal",
+                               wraps=dev_agent._probe_terminal) as probe:
+            sections = dev_agent._git_sections(self.project)
+        probe.assert_called_once()
+        self.assertEqual(len(sections), 2)
+        self.assertIn("first", sections[0])
+        self.assertIn("?? b.py", sections[1])
+
+    def test_git_sections_outside_repo(self):
+        dev_agent._clear_cmd_cache()
+        self.assertEqual(dev_agent._git_sections(self.project), [])
+
+    def test_git_probes_run_during_walk(self):
+        started, walked = threading.Event(), threading.Event()
+
+        def git_sections(path):
+            started.set()
+            return ["### Git Status\n```\nok\n```\n"] if walked.wait(5) else []
+
+        def walk(*args, **kwargs):
+            self.assertTrue(started.wait(5))
+            walked.set()
+            return [], 0
+
+        with mock.patch.object(dev_agent, "_git_sections", side_effect=git_sections), \
+             mock.patch.object(dev_agent, "_scan_project", side_effect=walk):
+            self.assertIn("### Git Status", self._agent()._project_scan(self.project))
+
+    def test_entry_cap_evicts_least_recently_used(self):
+        cache = {f"/p{i}": {"key": "", "ts": 0, "scan": ""} for i in range(5)}
+        cache["/p0"] = cache.pop("/p0")  # just used
+        with mock.patch.object(dev_agent, "PROJECT_SCAN_CACHE_MAX_ENTRIES", 3):
+            dev_agent._save_project_scan_cache(cache)
+        self.assertEqual(list(dev_agent._load_project_scan_cache()), ["/p3", "/p4", "/p0"])
+
+    def test_stack_detection(self):
+        for name in ("package.json", "tsconfig.json", "next.config.js", "next.config.ts"):
+            open(os.path.join(self.project, name), "w").close()
+        scan = self._agent()._project_scan(self.project)
+        self.assertIn("Stack: Node.js, TypeScript, Python (pip), Next.js\n", scan)
+
+    def test_size_cap_evicts_oldest(self):
+        cache = {f"/p{i}": {"key": "", "ts": 0, "scan": "x" * 1000} for i in range(5)}
+        with mock.patch.object(dev_agent, "PROJECT_SCAN_CACHE_MAX_BYTES", 3500):
+            dev_agent._save_project_scan_cache(cache)
+        on_disk = dev_agent._load_project_scan_cache()
+        self.assertEqual(list(on_disk), ["/p2", "/p3", "/p4"])
+
+
+class TestVSCodeLaunch(unittest.TestCase):
+    """Test launching Agent Mode without the fixed post-open sleep."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project = os.path.join(self._tmp.name, "proj")
+        os.makedirs(self.project)
+        self.log = os.path.join(self._tmp.name, "calls.log")
+        self.cli = os.path.join(self._tmp.name, "code")
+        with open(self.cli, "w") as f:
+            f.write(f'#!/bin/sh\necho "$@" >> "{self.log}"\n')
+        os.chmod(self.cli, 0o755)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_open_then_chat_without_sleep(self):
+        agent = _bare_agent()
+        agent._vscode_cli = self.cli
+        agent._watchers = {}
+        agent._snapshots = {}
+        agent._agent_launches = 0
+        agent._launch_timestamps = []
+        agent._last_reports = {}
+        with mock.patch.object(dev_agent, "_start_change_feed", return_value=None), \
+             mock.patch.object(DevAgent, "_wait_for_vscode_window", return_value=True) as ready:
+            start = time.monotonic()
+            result = agent._vscode_agent("do it", project_path=self.project)
+            elapsed = time.monotonic() - start
+        self.assertIn("Agent Mode launched", result)
+        self.assertLess(elapsed, 1.5)
+        ready.assert_called_once()
+        with open(self.log) as f:
+            calls = f.read().splitlines()
+        self.assertEqual(calls, [f"{self.project} -r", "chat -m agent -r do it"])
+
+    def test_context_files_checked_once_per_bucket(self):
+        present = os.path.join(self._tmp.name, "a.py")
+        open(present, "w").close()
+        missing = os.path.join(self._tmp.name, "gone.py")
+        files = (present, missing)
+        dev_agent._context_file_args.cache_clear()
+        with mock.patch.object(dev_agent.os.path, "exists", wraps=os.path.exists) as exists:
+            self.assertEqual(dev_agent._context_file_args(files, 1), ("-a", present))
+            self.assertEqual(dev_agent._context_file_args(files, 1), ("-a", present))
+            self.assertEqual(exists.call_count, 2)
+            dev_agent._context_file_args(files, 2)
+            self.assertEqual(exists.call_count, 4)
+
+    def test_wait_for_window_polls_until_ready(self):
+        results = iter([(1, ""), (1, ""), (0, "")])
+        fake = lambda *a, **k: next(results)
+        with mock.patch.object(dev_agent._probe_shell, "run", side_effect=fake) as run, \
+             mock.patch.object(dev_agent.subprocess, "run") as spawn:
+            self.assertTrue(_bare_agent()._wait_for_vscode_window(timeout=1, interval=0.01))
+        self.assertEqual(run.call_count, 3)
+        spawn.assert_not_called()
+
+    def test_wait_for_window_times_out(self):
+        with mock.patch.object(dev_agent._probe_shell, "run", return_value=(1, "")):
+            start = time.monotonic()
+            self.assertFalse(_bare_agent()._wait_for_vscode_window(timeout=0.1, interval=0.02))
+        self.assertLess(time.monotonic() - start, 1)
+
+
+class TestTools(unittest.TestCase):
+    """Test the tool schema list handed to the client."""
+
+    def test_built_once(self):
+        agent = _bare_agent()
+        self.assertIs(agent.tools, agent.tools)
+        self.assertIs(agent.tools, _bare_agent().tools)
+
+    def test_names_unique_and_cover_parallel_tools(self):
+        names = [t["name"] for t in _bare_agent().tools]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertLessEqual(DevAgent.parallel_tools, set(names))
+        self.assertEqual(len(_bare_agent()._tools_cached), len(names))
+
+
+class TestToolOrdering(unittest.TestCase):
+    """Test that reads after a mutating call see its effect."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "a.py")
+        with open(self.path, "w") as f:
+            f.write("old\n")
+        dev_agent.clear_search_cache()
+
+    def _run(self, *calls):
+        def block(i, name, **inp):
+            return SimpleNamespace(type="tool_use", id=str(i), name=name, input=inp)
+
+        steps = [
+            [block(i, name, **inp) for i, (name, inp) in enumerate(calls)],
+            [block(len(calls), "done", summary="Edited a.py and checked the result.")],
+        ]
+        client = mock.Mock()
+        client.create.side_effect = lambda **kw: SimpleNamespace(content=steps.pop(0))
+        with mock.patch.object(dev_agent, "get_vscode_cli", return_value=None), \
+             mock.patch.object(dev_agent, "_load_project_scan_cache", return_value={}):
+            agent = DevAgent(client, model="test")
+        self.assertTrue(agent.run("edit a.py")["success"])
+        return [r["content"] for r in client.create.call_args.kwargs["messages"][2]["content"]]
+
+    def test_reads_after_run_command(self):
+        results = self._run(
+            ("run_command", {"command": f"sed -i.bak s/old/NEW/ '{self.path}'"}),
+            ("read_file", {"path": self.path}),
+            ("search_files", {"pattern": "NEW", "directory": self._tmp.name,
+                              "content_search": True}),
+        )
+        self.assertEqual(results[1], "NEW\n")
+        self.assertIn("a.py:1:NEW", results[2])
+
+
+class TestWatcherCleanup(unittest.TestCase):
+    """Test that file watchers stop on every way out of run()."""
+
+    def _agent(self, client, kill_event=None):
+        with mock.patch.object(dev_agent, "get_vscode_cli", return_value=None), \
+             mock.patch.object(dev_agent, "_load_project_scan_cache", return_value={}):
+            agent = DevAgent(client, model="test", kill_event=kill_event)
+        self.feed = mock.Mock()
+        agent._watchers["/p"] = self.feed
+        return agent
+
+    def test_killed(self):
+        kill = threading.Event()
+        kill.set()
+        result = self._agent(mock.Mock(), kill_event=kill).run("task")
+        self.assertEqual(result["stuck_reason"], "Killed by user")
+        self.feed.stop.assert_called_once()
+
+    def test_api_error(self):
+        client = mock.Mock()
+        client.create.side_effect = ValueError("bad request")
+        agent = self._agent(client)
+        self.assertTrue(agent.run("task")["stuck"])
+        self.feed.stop.assert_called_once()
+        self.assertEqual(agent._watchers, {})
+
+    def test_max_steps(self):
+        client = mock.Mock()
+        client.create.return_value = SimpleNamespace(content=[], stop_reason="end_turn")
+        agent = self._agent(client)
+        agent.max_steps = 1
+        self.assertIn("reached 1 steps", agent.run("task")["content"])
+        self.feed.stop.assert_called_once()
+
+    def test_exception(self):
+        agent = self._agent(mock.Mock())
+        with mock.patch.object(DevAgent, "_on_start", side_effect=RuntimeError("boom")):
+            self.assertRaises(RuntimeError, agent.run, "task")
+        self.feed.stop.assert_called_once()
+
+
+class TestVSCodeCLICache(unittest.TestCase):
+    """Test the on-disk cache in front of VS Code CLI discovery."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self._tmp.name, "tars", "vscode_cli_path")
+        self.cli = os.path.join(self._tmp.name, "code")
+        open(self.cli, "w").close()
+        patcher = mock.patch.object(dev_agent, "VSCODE_CLI_CACHE_PATH", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_skips_discovery(self):
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=self.cli) as disc:
+            self.assertEqual(dev_agent._find_vscode_cli(), self.cli)
+            self.assertEqual(dev_agent._find_vscode_cli(), self.cli)
+        self.assertEqual(disc.call_count, 1)
+        with open(self.cache) as f:
+            self.assertEqual(f.read(), self.cli)
+
+    def test_stale_path_rediscovers(self):
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=self.cli):
+            dev_agent._find_vscode_cli()
+        os.remove(self.cli)
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=None) as disc:
+            self.assertIsNone(dev_agent._find_vscode_cli())
+        disc.assert_called_once()
+
+    def test_expired_cache_rediscovers(self):
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=self.cli):
+            dev_agent._find_vscode_cli()
+        old = os.stat(self.cache).st_mtime - dev_agent.VSCODE_CLI_CACHE_TTL - 1
+        os.utime(self.cache, (old, old))
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=self.cli) as disc:
+            dev_agent._find_vscode_cli()
+        disc.assert_called_once()
+
+    def test_miss_not_cached(self):
+        with mock.patch.object(dev_agent, "_discover_vscode_cli", return_value=None):
+            self.assertIsNone(dev_agent._find_vscode_cli())
+        self.assertFalse(os.path.exists(self.cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
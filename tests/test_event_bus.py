@@ -7,11 +7,13 @@ Tests event emission, sync subscribers, stats tracking,
 history bounded deque, and thread safety.
 """
 
+import json
 import unittest
 import threading
 import time
 import sys
 import os
+from unittest import mock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from utils.event_bus import EventBus
@@ -95,6 +97,63 @@ class TestEventEmission(unittest.TestCase):
         self.assertEqual(history[0]["data"], {})
 
 
+class TestWebSocketFanOut(unittest.TestCase):
+    """Test that WebSocket subscribers are fed from the background fan-out thread."""
+
+    def setUp(self):
+        import asyncio
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        self.addCleanup(loop_thread.join, 2)
+        self.addCleanup(loop.call_soon_threadsafe, loop.stop)
+        self.bus = EventBus()
+        self.bus.set_loop(loop)
+        self.received = []
+
+        async def ws_send(message):
+            self.received.append(json.loads(message))
+
+        self.bus.subscribe(ws_send)
+
+    def _wait_for(self, n):
+        deadline = time.time() + 2
+        while len(self.received) < n and time.time() < deadline:
+            time.sleep(0.01)
+        return self.received
+
+    def test_ws_subscriber_receives_events_in_order(self):
+        for i in range(5):
+            self.bus.emit("agent_step", {"step": i})
+        self.assertEqual([e["data"]["step"] for e in self._wait_for(5)], [0, 1, 2, 3, 4])
+
+    def test_event_captured_at_emit(self):
+        data = {"step": 1}
+        with self.bus._cv:  # Hold the fan-out thread back while the caller mutates
+            self.bus.emit("agent_step", data)
+            data["step"] = 2
+            data["extra"] = object()
+        self.assertEqual(self._wait_for(1)[0]["data"], {"step": 1})
+
+    def test_bad_event_does_not_stop_fan_out(self):
+        self.bus.emit("agent_step", {"obj": object()})  # Not JSON — sent as str()
+        self.assertTrue(self._wait_for(1)[0]["data"]["obj"].startswith("<object"))
+        with mock.patch.object(self.bus, "_send", side_effect=RuntimeError("boom")) as send, \
+             self.assertLogs("tars.event_bus", "ERROR"):
+            self.bus.emit("agent_step", {"step": 1})
+            deadline = time.time() + 2
+            while not send.called and time.time() < deadline:
+                time.sleep(0.01)
+        self.bus.emit("agent_step", {"step": 2})
+        self.assertEqual(self._wait_for(2)[-1]["data"], {"step": 2})
+
+    def test_no_outbox_without_ws_subscribers(self):
+        bus = EventBus()
+        bus.emit("evt", {"x": 1})
+        self.assertEqual(len(bus._ring), 0)
+        self.assertIsNone(bus._pump)
+
+
 class TestStats(unittest.TestCase):
     """Test statistics tracking."""
 
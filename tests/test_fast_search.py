@@ -0,0 +1,489 @@
+"""
+╔══════════════════════════════════════════╗
+║    TARS — Test Suite: Fast Search        ║
+╚══════════════════════════════════════════╝
+
+Tests in-process content and filename search.
+"""
+
+import re
+import unittest
+import importlib.util
+from unittest import mock
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from hands import fast_search
+from hands.fast_search import search_content, search_many, find_files, count_lines
+
+
+class _TreeCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
+        fast_search.clear_cache()
+        self.addCleanup(fast_search.clear_cache)
+
+    def write(self, rel, data):
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+        return path
+
+
+class TestSearchContent(_TreeCase):
+    """Test grep -rn style output, filtering and limits."""
+
+    def test_line_numbers(self):
+        path = self.write("src/a.py", "import os\ndef foo():\n    foo()  # foo again\n")
+        result = search_content("foo", self.root)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["content"].splitlines(), [
+            f"{path}:2:def foo():",
+            f"{path}:3:    foo()  # foo again",
+        ])
+
+    def test_regex_and_anchors(self):
+        path = self.write("a.py", "class A:\n    class_ = 1\n")
+        result = search_content("^class", self.root)
+        self.assertEqual(result["content"], f"{path}:1:class A:")
+
+    def test_invalid_regex_is_literal(self):
+        path = self.write("a.py", "x = foo(\n")
+        self.assertEqual(search_content("foo(", self.root)["content"], f"{path}:1:x = foo(")
+
+    def test_bytewise_by_default(self):
+        path = self.write("a.txt", "caf\u00e9 = 1\n")
+        self.assertEqual(search_content("caf\u00e9", self.root)["content"], f"{path}:1:caf\u00e9 = 1")
+        self.assertEqual(search_content(r"caf\w\b", self.root)["content"], "(no results)")
+        self.assertEqual(search_content(r"caf\w\b", self.root, ascii=False)["content"],
+                         f"{path}:1:caf\u00e9 = 1")
+
+    def test_literal_patterns_skip_regex(self):
+        self.assertEqual(fast_search._compile_content("handle_event"), b"handle_event")
+        self.assertEqual(fast_search._compile_content("x-y z", False), "x-y z")
+        self.assertIsInstance(fast_search._compile_content("foo.*bar"), re.Pattern)
+        path = self.write("a.py", "a = 1\nhandle_event(handle_event)\n")
+        self.assertEqual(search_content("handle_event", self.root)["content"],
+                         f"{path}:2:handle_event(handle_event)")
+
+    def test_last_line_without_newline(self):
+        path = self.write("a.py", "x\nend")
+        self.assertEqual(search_content("end$", self.root)["content"], f"{path}:2:end")
+        self.assertEqual(len(search_content("", self.root)["content"].splitlines()), 2)
+
+    def test_literal_seed(self):
+        seed = fast_search._literal_seed
+        self.assertEqual(seed(r"def\s+handle_event"), "handle_event")
+        self.assertEqual(seed(r"class\s+(\w+)Handler"), "Handler")
+        self.assertEqual(seed(r"colou?r_name"), "r_name")
+        for pattern in ("foo|barbaz", "(?i)hello", "(group)?xyz", "ab{1234}",
+                        "[^]abcd]xy", r"\d+\.\d+"):
+            self.assertIsNone(seed(pattern), pattern)
+
+    def test_seed_prefilter(self):
+        hit = self.write("a.py", "class FooHandler:\n")
+        self.write("b.py", "class Foo:\n")
+        seen = []
+        real = fast_search._grep_file
+        with mock.patch.object(fast_search, "_grep_file",
+                               side_effect=lambda *a: seen.append(a[3]) or real(*a)):
+            result = search_content(r"class\s+\w+Handler", self.root)
+        self.assertEqual(result["content"], f"{hit}:1:class FooHandler:")
+        self.assertEqual(set(seen), {b"Handler"})
+
+    def test_include_globs(self):
+        self.write("a.py", "needle\n")
+        self.write("b.log", "needle\n")
+        result = search_content("needle", self.root, include=("*.py",))
+        self.assertEqual(len(result["content"].splitlines()), 1)
+        self.assertIn("a.py:1:", result["content"])
+
+    def test_skips_dirs_and_binaries(self):
+        self.write("node_modules/x/a.js", "needle\n")
+        self.write(".git/config", "needle\n")
+        self.write("blob.bin", b"\0\0needle\n")
+        self.write("empty.txt", "")
+        self.assertEqual(search_content("needle", self.root)["content"], "(no results)")
+
+    def test_limit(self):
+        self.write("a.txt", "hit\n" * 20)
+        self.write("b.txt", "hit\n")
+        result = search_content("hit", self.root, limit=5)
+        self.assertEqual(len(result["content"].splitlines()), 5)
+
+    def test_stops_at_limit(self):
+        self.write("a.txt", "hit\n" * 20)
+        self.write("b.txt", "hit\n")
+        opened = []
+        real = fast_search._grep_file
+        with mock.patch.object(fast_search, "_grep_file",
+                               side_effect=lambda p, *a: opened.append(p) or real(p, *a)):
+            search_content("hit", self.root, limit=5)
+        self.assertEqual([os.path.basename(p) for p in opened], ["a.txt"])
+
+    def test_iter_content_is_lazy(self):
+        self.write("a.txt", "hit\n" * 3)
+        matches = fast_search.iter_content("hit", self.root)
+        self.assertTrue(next(matches).endswith("a.txt:1:hit"))
+        matches.close()
+
+    def test_large_file(self):
+        path = self.write("big.txt", "x" * (2 << 20) + "\nneedle\n")
+        self.assertEqual(search_content("needle", self.root)["content"], f"{path}:2:needle")
+
+    def test_file_truncated_after_read(self):
+        path = self.write("package-lock.json", "x" * (2 << 20) + "\nneedle\n")
+        raw = fast_search._read(path, os.path.getsize(path))
+        os.truncate(path, 0)  # A mapped file would SIGBUS on the next access
+        self.assertGreater(raw.find(b"needle"), 0)
+
+    def test_file_shrunk_mid_search(self):
+        path = self.write("a.py", "needle\n" * 10)
+        self.assertEqual(fast_search._read(path, 1000), b"needle\n" * 10)  # Stale size is fine
+
+    def test_oversized_files_skipped(self):
+        self.write("small.txt", "needle\n")
+        self.write("huge.txt", "needle\n" + "x" * 100)
+        with mock.patch.object(fast_search, "MAX_FILE_BYTES", 50):
+            content = search_content("needle", self.root)["content"]
+        self.assertEqual([os.path.basename(l.split(":")[0]) for l in content.splitlines()],
+                         ["small.txt"])
+
+    def test_missing_directory(self):
+        result = search_content("x", os.path.join(self.root, "nope"))
+        self.assertEqual(result["content"], "(no results)")
+
+    def test_only_io_errors_become_results(self):
+        self.write("a.py", "needle\n")
+        with mock.patch.object(fast_search, "_walk", side_effect=PermissionError("denied")):
+            result = search_content("needle", self.root)
+        self.assertFalse(result["success"])
+        self.assertIn("denied", result["content"])
+        with mock.patch.object(fast_search, "_walk", side_effect=TypeError("bug")):
+            self.assertRaises(TypeError, search_content, "needle", self.root)
+
+    def test_long_line_clipped_around_hit(self):
+        line = "x" * 5000 + "needle" + "y" * 5000
+        self.write("bundle.js", line + "\n")
+        content = search_content("needle", self.root)["content"]
+        text = content.split(":", 2)[2]
+        self.assertIn("needle", text)
+        self.assertTrue(text.startswith("…") and text.endswith("…"))
+        self.assertLessEqual(len(text), fast_search.MAX_LINE_BYTES + 2)
+
+
+class TestGitignore(_TreeCase):
+    """Test .gitignore pruning in content search."""
+
+    def test_walk_consults_matcher(self):
+        self.write("build/out.js", "")
+        self.write("src/app.js", "")
+        self.write("src/app.log", "")
+        asked = []
+
+        def ignored(rel):
+            asked.append(rel)
+            return rel in ("build/", "src/app.log")
+
+        names = [os.path.relpath(e.path, self.root)
+                 for _, e in fast_search._walk(self.root, fast_search.SKIP_DIRS, ignored=ignored)]
+        self.assertEqual(names, ["src", os.path.join("src", "app.js")])
+        self.assertNotIn("build/out.js", asked)
+
+    @unittest.skipUnless(importlib.util.find_spec("pathspec"), "pathspec not installed")
+    def test_gitignore_respected(self):
+        self.write(".gitignore", "dist/\n*.log\n")
+        keep = self.write("src/a.py", "needle\n")
+        self.write("dist/a.py", "needle\n")
+        self.write("debug.log", "needle\n")
+        self.assertEqual(search_content("needle", self.root)["content"], f"{keep}:1:needle")
+        self.assertEqual(len(search_content("needle", self.root, gitignore=False)["content"]
+                             .splitlines()), 3)
+
+    def test_without_gitignore(self):
+        self.assertIsNone(fast_search._load_ignore(self.root))
+
+class TestGlobs(unittest.TestCase):
+    """Test that compiled glob sets agree with fnmatch."""
+
+    def test_matches_fnmatch(self):
+        import fnmatch
+        names = ["a.py", ".py", "a.pyc", "A.PY", "x.min.js", "js", "test_a.py", "a.yaml"]
+        for globs in [("*.py",), ("*.js", "*.yaml"), ("test_*.py",), ("?.py",), ("*.[jt]s",)]:
+            ok = fast_search._compile_globs(globs)
+            for name in names:
+                expected = any(fnmatch.fnmatchcase(name, g) for g in globs)
+                self.assertEqual(bool(ok(name)), expected, (globs, name))
+
+    def test_star_matches_all(self):
+        self.assertIsNone(fast_search._compile_globs(("*",)))
+        self.assertIsNone(fast_search._compile_globs(None))
+
+
+class TestCompiledOnce(_TreeCase):
+    """Test that patterns and globs are compiled per search, not per file."""
+
+    def test_regex_and_globs_hoisted(self):
+        for i in range(20):
+            self.write(f"d{i}/m.py", "def handler_%d(): pass\n" % i)
+        fast_search._compile_content.cache_clear()
+        fast_search._compile_globs.cache_clear()
+        with mock.patch.object(fast_search.re, "compile", wraps=re.compile) as compile_:
+            content = search_content(r"def handler_\d+", self.root, include=("*.py", "*.js"))["content"]
+        self.assertEqual(len(content.splitlines()), 20)
+        # One pattern; the *.ext include list is a str.endswith suffix tuple
+        self.assertEqual(compile_.call_count, 1)
+        self.assertEqual(fast_search._compile_content.cache_info().misses, 1)
+        self.assertEqual(fast_search._compile_globs.cache_info().misses, 1)
+
+
+class TestFindFiles(_TreeCase):
+    """Test find -name style globbing with pruned dirs."""
+
+    def test_glob(self):
+        a = self.write("a/test_one.py", "")
+        b = self.write("b/c/test_two.py", "")
+        self.write("b/other.py", "")
+        self.write("venv/lib/test_three.py", "")
+        result = find_files("test_*.py", self.root)
+        self.assertEqual(result["content"].splitlines(), [a, b])
+
+    def test_skipped_dirs_never_listed(self):
+        self.write("node_modules/pkg/deep/index.js", "")
+        self.write(".git/objects/ab/cd", "")
+        self.write("src/app.js", "")
+        listed = []
+        real = fast_search._listing
+        with mock.patch.object(fast_search, "_listing",
+                               side_effect=lambda p: listed.append(p) or real(p)):
+            find_files("*.js", self.root)
+            search_content("x", self.root)
+        self.assertEqual({os.path.relpath(p, self.root) for p in listed}, {".", "src"})
+
+    def test_matches_directories(self):
+        self.write("pkg/src/x.py", "")
+        result = find_files("src", self.root)
+        self.assertEqual(result["content"], os.path.join(self.root, "pkg", "src"))
+
+    def test_no_results(self):
+        self.assertEqual(find_files("*.rs", self.root)["content"], "(no results)")
+
+
+class TestCountLines(_TreeCase):
+    """Test wc -l style line counts per extension."""
+
+    def test_counts_like_wc(self):
+        self.write("a.py", "1\n2\n3\n")
+        self.write("pkg/b.PY", "1\nno newline")
+        self.write("c.js", "x\n")
+        self.write("Makefile", "all:\n")
+        self.write("blob.bin", b"\0\n\n")
+        self.write("node_modules/d.js", "x\n" * 100)
+        rows = count_lines(self.root)["content"].splitlines()
+        self.assertEqual([r.split()[:4] for r in rows[:-1]],
+                         [[".py", "2", "files", "4"], [".js", "1", "files", "1"],
+                          ["Makefile", "1", "files", "1"]])  # Ties by name
+        self.assertEqual(rows[-1], "Total: 4 files, 6 lines")
+
+    def test_include_and_large_files(self):
+        self.write("a.py", "x\n")
+        self.write("big.js", "y\n" * 600_000)
+        self.assertEqual(count_lines(self.root, include=["*.js"])["content"].splitlines()[-1],
+                         "Total: 1 files, 600,000 lines")
+        self.assertEqual(count_lines(os.path.join(self.root, "nope"))["content"],
+                         "(no results)")
+
+
+class TestTree(_TreeCase):
+    """Test the find -maxdepth style listing."""
+
+    def test_preorder_indented(self):
+        self.write("a/b/c/deep.txt", "")
+        self.write("a/x.txt", "")
+        self.write("z.txt", "")
+        self.write(".git/HEAD", "")
+        lines = fast_search.tree(self.root, depth=3)["content"].splitlines()
+        self.assertEqual(lines, [
+            self.root,
+            "  a/",
+            "    b/",
+            "      c/",
+            "    x.txt",
+            "  z.txt",
+        ])
+
+    def test_limit_and_missing(self):
+        for i in range(5):
+            self.write(f"f{i}.txt", "")
+        self.assertEqual(len(fast_search.tree(self.root, limit=3)["content"].splitlines()), 3)
+        self.assertFalse(fast_search.tree(os.path.join(self.root, "nope"))["success"])
+
+
+class TestResultCache(_TreeCase):
+    """Test memoized results and their invalidation."""
+
+    def test_repeat_served_from_cache(self):
+        self.write("a.py", "needle\n")
+        first = search_content("needle", self.root)
+        with mock.patch.object(fast_search, "_walk") as walk:
+            self.assertEqual(search_content("needle", self.root), first)
+        walk.assert_not_called()
+
+    def test_new_top_level_file_invalidates(self):
+        self.write("a.py", "needle\n")
+        search_content("needle", self.root)
+        path = self.write("b.py", "needle\n")
+        os.utime(path, ns=(0, os.stat(self.root).st_mtime_ns + 10**9))
+        self.assertIn("b.py:1:", search_content("needle", self.root)["content"])
+
+    def test_clear_cache(self):
+        self.write("sub/a.py", "old\n")
+        self.assertEqual(search_content("new", self.root)["content"], "(no results)")
+        self.write("sub/a.py", "new\n")
+        fast_search.clear_cache()
+        self.assertIn("a.py:1:new", search_content("new", self.root)["content"])
+
+    def test_expires(self):
+        self.write("sub/a.py", "old\n")
+        search_content("new", self.root)
+        self.write("sub/a.py", "new\n")
+        with mock.patch.object(fast_search, "RESULT_CACHE_TTL", 0):
+            self.assertIn("a.py:1:new", search_content("new", self.root)["content"])
+
+    def test_concurrent_searches(self):
+        from concurrent.futures import ThreadPoolExecutor
+        for i in range(8):
+            self.write(f"m{i}/a.py", f"name_{i} = {i}\n")
+        patterns = [f"name_{i}" for i in range(8)] * 2
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda p: search_content(p, self.root)["content"], patterns))
+        for pattern, content in zip(patterns, results):
+            self.assertEqual(len(content.splitlines()), 1)
+            self.assertIn(f":1:{pattern} =", content)
+
+    def test_home_and_relative_dirs(self):
+        self.write("a.py", "needle\n")
+        with mock.patch.dict(os.environ, {"HOME": self.root}):
+            fast_search._expand.cache_clear()
+            self.addCleanup(fast_search._expand.cache_clear)
+            self.assertEqual(search_content("needle", "~")["content"],
+                             os.path.join(self.root, "a.py") + ":1:needle")
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        self.assertEqual(find_files("*.py", ".")["content"], os.path.join(".", "a.py"))
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        self.assertNotEqual(find_files("*.py", ".")["content"], os.path.join(".", "a.py"))
+
+    def test_bounded(self):
+        with mock.patch.object(fast_search, "RESULT_CACHE_MAX", 3):
+            for i in range(5):
+                find_files(f"*.{i}", self.root)
+        self.assertEqual(len(fast_search._results), 3)
+
+
+class TestWordIndex(_TreeCase):
+    """Test that identifier misses are answered from the word index."""
+
+    def test_miss_reads_no_file(self):
+        self.write("a.py", "def handler(): pass\n")
+        search_content("other_symbol", self.root)  # Full walk, then index built
+        with mock.patch.object(fast_search, "_grep_file") as grep:
+            self.assertEqual(search_content("missing_symbol", self.root)["content"],
+                             "(no results)")
+        grep.assert_not_called()
+
+    def test_substring_of_word_still_found(self):
+        self.write("a.py", "x = foobar9\n")
+        self.assertIn("a.py:1:x = foobar9", search_content("oba", self.root)["content"])
+        self.assertIn("a.py:1:", search_content("9", self.root)["content"])
+
+    def test_respects_include(self):
+        self.write("a.py", "alpha\n")
+        self.write("b.txt", "bravo\n")
+        self.assertEqual(search_content("bravo", self.root, include=("*.py",))["content"],
+                         "(no results)")
+        self.assertIn("b.txt:1:bravo", search_content("bravo", self.root)["content"])
+
+    def test_hit_builds_no_index(self):
+        self.write("a.py", "handler\n")
+        with mock.patch.object(fast_search, "_word_index") as index:
+            self.assertIn("a.py:1:", search_content("handler", self.root, limit=1)["content"])
+        index.assert_not_called()  # The early exit isn't paid for with a full scan
+
+    def test_index_expires_with_results(self):
+        path = self.write("src/pkg/mod.py", "x = 1\n")
+        self.assertEqual(search_content("newSymbol", self.root)["content"], "(no results)")
+        with open(path, "a") as f:  # Deep in-place edit: the tree stamp can't see it
+            f.write("def newSymbol():\n")
+        with mock.patch.object(fast_search, "RESULT_CACHE_TTL", 0):
+            self.assertIn("mod.py:2:def newSymbol", search_content("newSymbol", self.root)["content"])
+
+    def test_index_bounded(self):
+        with mock.patch.object(fast_search, "WORD_INDEX_MAX", 2):
+            for i in range(4):
+                self.write(f"d{i}/a.py", "x\n")
+                search_content("missing_symbol", os.path.join(self.root, f"d{i}"))
+        self.assertEqual(len(fast_search._indexes), 2)
+
+    def test_rebuilt_after_clear_cache(self):
+        self.write("sub/a.py", "old\n")
+        search_content("renamed", self.root)
+        self.write("sub/a.py", "renamed\n")
+        fast_search.clear_cache()
+        self.assertIn("a.py:1:renamed", search_content("renamed", self.root)["content"])
+
+    def test_regex_bypasses_index(self):
+        self.write("a.py", "value = 42\n")
+        with mock.patch.object(fast_search, "_word_index") as index:
+            self.assertIn("a.py:1:", search_content(r"val\w+", self.root)["content"])
+        index.assert_not_called()
+
+
+class TestSearchMany(_TreeCase):
+    """Test several literals searched in one walk."""
+
+    def test_grouped_per_pattern(self):
+        self.write("a.py", "def foobar():\n    return foo\n")
+        self.write("b.py", "foo = 1\n")
+        content = search_many(["foo", "foobar", "nothing_here"], self.root)["content"]
+        groups = {g.split("\n", 1)[0]: g.split("\n")[1:] for g in content.split("\n\n")}
+        self.assertEqual(list(groups), ["## foo", "## foobar", "## nothing_here"])
+        self.assertEqual(len(groups["## foo"]), 3)  # Overlaps with foobar still count
+        self.assertEqual(groups["## foobar"], [os.path.join(self.root, "a.py") + ":1:def foobar():"])
+        self.assertEqual(groups["## nothing_here"], ["(no results)"])
+
+    def test_matches_single_searches(self):
+        for i in range(4):
+            self.write(f"d{i}/m.py", f"alpha {i}\nbeta.gamma {i}\n")
+        content = search_many(["alpha", "beta.gamma"], self.root, limit=3)["content"]
+        for pattern, group in zip(["alpha", "beta.gamma"], content.split("\n\n")):
+            fast_search.clear_cache()
+            single = search_content(pattern.replace(".", "\\."), self.root, limit=3)["content"]
+            self.assertEqual(group.split("\n", 1)[1], single)
+
+    def test_whole_word_references(self):
+        self.write("a.py", "user = get_user()\nusername = user.name\n")
+        self.write("b.py", "print(username)\n")
+        content = search_many(["user", "username"], self.root, whole_word=True)["content"]
+        user, username = (g.split("\n")[1:] for g in content.split("\n\n"))
+        self.assertEqual([l.split(":", 2)[1] for l in user], ["1", "2"])
+        self.assertEqual(len(username), 2)
+        self.assertEqual(search_many(["get"], self.root, whole_word=True)["content"],
+                         "## get\n(no results)")
+
+    def test_each_file_read_once(self):
+        self.write("a.py", "one two\n")
+        self.write("b.py", "two three\n")
+        with mock.patch.object(fast_search, "_read", wraps=fast_search._read) as read:
+            search_many(["one", "two", "three"], self.root)
+        self.assertEqual(read.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+╔══════════════════════════════════════════╗
+║    TARS — Test Suite: File Manager       ║
+╚══════════════════════════════════════════╝
+
+Tests file reading and its truncation of large files.
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from hands import file_manager
+from hands.file_manager import read_file, list_directory
+
+
+class TestReadFile(unittest.TestCase):
+    """Test head + tail truncation, with and without bounded reads."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "f.txt")
+
+    def _write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data.encode("utf-8"))
+
+    def _expected(self, text):
+        if len(text) <= file_manager.MAX_READ_CHARS:
+            return text
+        return (text[:file_manager._HEAD_CHARS] + file_manager._TRUNCATED
+                + text[-file_manager._TAIL_CHARS:])
+
+    def test_small_file_whole(self):
+        self._write("a\r\nb\n")
+        self.assertEqual(read_file(self.path)["content"], "a\nb\n")
+
+    def test_multibyte_file_under_cap_not_truncated(self):
+        text = "é" * 40000  # 80000 bytes, but only 40000 chars
+        self._write(text)
+        self.assertEqual(read_file(self.path)["content"], text)
+
+    def test_huge_file_matches_full_read(self):
+        for unit in ("line of text\r\n", "日本語\n", "😀x"):
+            text = "".join(f"{i}:{unit}" for i in range(60000))
+            self._write(text)
+            expected = self._expected(text.replace("\r\n", "\n"))
+            self.assertEqual(read_file(self.path)["content"], expected, unit)
+
+    def test_huge_file_read_is_bounded(self):
+        self._write("x" * 5_000_000)
+        tracemalloc.start()
+        try:
+            content = read_file(self.path)["content"]
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertIn(file_manager._TRUNCATED, content)
+        self.assertLess(peak, 1_000_000)  # Never holds the 5 MB file
+
+
+class TestListDirectory(unittest.TestCase):
+    """Test the directory listing format."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = self._tmp.name
+
+    def test_dirs_and_sizes_sorted(self):
+        os.makedirs(os.path.join(self.root, "b_dir"))
+        with open(os.path.join(self.root, "a.txt"), "wb") as f:
+            f.write(b"x" * 2048)
+        os.symlink(os.path.join(self.root, "b_dir"), os.path.join(self.root, "c_link"))
+        self.assertEqual(list_directory(self.root)["content"].splitlines(),
+                         ["📄 a.txt (2KB)", "📁 b_dir/", "📁 c_link/"])
+
+    def test_empty_and_missing(self):
+        self.assertEqual(list_directory(self.root)["content"], "(empty directory)")
+        self.assertFalse(list_directory(os.path.join(self.root, "nope"))["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+╔══════════════════════════════════════════╗
+║     TARS — Test Suite: LLM Client        ║
+╚══════════════════════════════════════════╝
+
+Tests request shaping done before any provider call (no API needed).
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from brain.llm_client import _with_prompt_cache, _EPHEMERAL
+
+
+class TestPromptCache(unittest.TestCase):
+    """Test cache_control breakpoints on the system prompt and latest turn."""
+
+    def test_system_prompt_marked(self):
+        system, _ = _with_prompt_cache("You are TARS.", [])
+        self.assertEqual(system, [{"type": "text", "text": "You are TARS.",
+                                   "cache_control": _EPHEMERAL}])
+
+    def test_empty_or_block_system_left_alone(self):
+        blocks = [{"type": "text", "text": "x"}]
+        self.assertEqual(_with_prompt_cache("", [])[0], "")
+        self.assertIs(_with_prompt_cache(blocks, [])[0], blocks)
+
+    def test_last_string_message_marked(self):
+        messages = [{"role": "user", "content": "first"},
+                    {"role": "assistant", "content": "ok"},
+                    {"role": "user", "content": "second"}]
+        _, out = _with_prompt_cache("s", messages)
+        self.assertEqual(out[:2], messages[:2])
+        self.assertEqual(out[-1], {"role": "user", "content": [
+            {"type": "text", "text": "second", "cache_control": _EPHEMERAL}]})
+        self.assertEqual(messages[-1]["content"], "second")  # Caller's list untouched
+
+    def test_tool_results_mark_only_last_block(self):
+        results = [{"type": "tool_result", "tool_use_id": "1", "content": "a"},
+                   {"type": "tool_result", "tool_use_id": "2", "content": "b"}]
+        messages = [{"role": "user", "content": "task"}, {"role": "user", "content": results}]
+        _, out = _with_prompt_cache("s", messages)
+        content = out[-1]["content"]
+        self.assertNotIn("cache_control", content[0])
+        self.assertEqual(content[1], dict(results[1], cache_control=_EPHEMERAL))
+        self.assertNotIn("cache_control", results[1])
+
+    def test_breakpoints_do_not_pile_up(self):
+        messages = [{"role": "user", "content": "task"}]
+        _with_prompt_cache("s", messages)
+        messages.append({"role": "assistant", "content": "ok"})
+        _, out = _with_prompt_cache("s", messages)
+        self.assertEqual(out[0], {"role": "user", "content": "task"})
+        self.assertEqual(sum("cache_control" in str(m) for m in out), 1)
+
+    def test_unmarkable_last_message(self):
+        messages = [{"role": "user", "content": ""}]
+        self.assertIs(_with_prompt_cache("s", messages)[1], messages)
+
+
+if __name__ == "__main__":
+    unittest.main()
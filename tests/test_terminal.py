@@ -0,0 +1,78 @@
+"""
+╔══════════════════════════════════════════╗
+║    TARS — Test Suite: Terminal Runner    ║
+╚══════════════════════════════════════════╝
+
+Tests output decoding and truncation in run_terminal.
+"""
+
+import unittest
+from unittest import mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from hands import terminal
+from hands.terminal import run_terminal, run_argv
+
+
+class TestDecodeOutput(unittest.TestCase):
+    """Test that only the kept head and tail of long output are decoded."""
+
+    def test_short_output_unchanged(self):
+        self.assertEqual(terminal._decode_output("héllo\r\nworld\n".encode()), "héllo\nworld\n")
+
+    def test_invalid_utf8_replaced(self):
+        self.assertEqual(terminal._decode_output(b"a\xffb"), "a�b")
+
+    def test_long_output_head_and_tail(self):
+        data = b"h" * 6000 + b"m" * 100000 + b"t" * 4000
+        with mock.patch.object(terminal, "_decode", wraps=terminal._decode) as dec:
+            out = terminal._decode_output(data)
+        self.assertEqual(out, "h" * 5000 + terminal._TRUNCATED + "t" * 3000)
+        self.assertLessEqual(sum(len(c.args[0]) for c in dec.call_args_list), 32000)
+
+    def test_multibyte_measured_in_chars(self):
+        text = "é" * 9000  # 18000 bytes but under the char cap
+        self.assertEqual(terminal._decode_output(text.encode()), text)
+        text = "é" * 11000
+        out = terminal._decode_output(text.encode())
+        self.assertEqual(out, "é" * 5000 + terminal._TRUNCATED + "é" * 3000)
+
+
+class TestRunTerminal(unittest.TestCase):
+    """Test run_terminal end to end."""
+
+    def test_stdout_and_stderr(self):
+        r = run_terminal("echo out; echo err 1>&2; exit 3")
+        self.assertFalse(r["success"])
+        self.assertEqual(r["exit_code"], 3)
+        self.assertEqual(r["content"], "out\n\n[stderr]: err")
+
+    def test_large_output_truncated(self):
+        r = run_terminal("yes x | head -c 200000")
+        self.assertIn("[output truncated]", r["content"])
+        self.assertLess(len(r["content"]), terminal.MAX_OUTPUT_CHARS)
+
+
+
+class TestRunArgv(unittest.TestCase):
+    """Test running argv lists without a shell."""
+
+    def test_arguments_not_shell_parsed(self):
+        r = run_argv(["echo", "'; echo pwned; '", "$HOME", "a b"])
+        self.assertTrue(r["success"])
+        self.assertEqual(r["content"], "'; echo pwned; ' $HOME a b")
+
+    def test_missing_program(self):
+        r = run_argv(["definitely-not-a-real-program-xyz"])
+        self.assertFalse(r["success"])
+        self.assertIn("Failed to run command", r["content"])
+
+    def test_timeout_label(self):
+        r = run_argv(["sleep", "5"], timeout=0.1)
+        self.assertEqual(r["content"], "Command timed out after 0.1s: sleep 5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,10 +10,13 @@ and message flows through here to the dashboard.
 import json
 import time
 import asyncio
+import logging
 import threading
 from datetime import datetime
 from collections import deque
 
+log = logging.getLogger("tars.event_bus")
+
 
 class EventBus:
     """Central event bus — all TARS events flow through here."""
@@ -24,6 +27,9 @@ class EventBus:
         self._sync_subs = {}           # event_type → [callable] for sync listeners
         self._sync_lock = threading.Lock()
         self.history = deque(maxlen=max_history)  # Recent events for new clients
+        self._ring = deque(maxlen=max_history)    # Outbox for WebSocket fan-out
+        self._cv = threading.Condition()
+        self._pump = None                         # Background fan-out thread (lazy)
         self._loop = None
         self._stats = {
             "total_events": 0,
@@ -60,8 +66,41 @@ class EventBus:
         # Store in history
         self.history.append(event)
 
-        # Send to all WebSocket subscribers (thread-safe)
-        message = json.dumps(event)
+        # Hand off to the fan-out thread — emit never schedules WebSocket
+        # sends on the caller's (agent loop) thread. The event is serialized
+        # here, though: callers may go on mutating the data dict they passed.
+        if self.subscribers:
+            message = json.dumps(event, default=str)
+            with self._cv:
+                self._ring.append(message)
+                self._cv.notify()
+
+        # Notify synchronous listeners (for in-process progress tracking)
+        with self._sync_lock:
+            for cb in self._sync_subs.get(event_type, []):
+                try:
+                    cb(data or {})
+                except Exception:
+                    pass
+
+    def _fan_out(self):
+        """Drain the outbox and push each event to all WebSocket subscribers."""
+        while True:
+            with self._cv:
+                while not self._ring:
+                    self._cv.wait()
+                batch = list(self._ring)
+                self._ring.clear()
+
+            for message in batch:
+                try:
+                    self._send(message)
+                except Exception:
+                    # Never let one bad event end fan-out for the process
+                    log.exception("Event fan-out failed")
+
+    def _send(self, message):
+        """Schedule one serialized event on every WebSocket subscriber."""
         dead = []
         with self._sub_lock:
             for ws_send in self.subscribers:
@@ -73,14 +112,6 @@ class EventBus:
             for d in dead:
                 self.subscribers.remove(d)
 
-        # Notify synchronous listeners (for in-process progress tracking)
-        with self._sync_lock:
-            for cb in self._sync_subs.get(event_type, []):
-                try:
-                    cb(data or {})
-                except Exception:
-                    pass
-
     def _update_stats(self, event_type, data):
         """Update running statistics."""
         if event_type == "tool_result":
@@ -117,6 +148,9 @@ class EventBus:
         """Add a WebSocket client."""
         with self._sub_lock:
             self.subscribers.append(ws_send)
+            if self._pump is None:
+                self._pump = threading.Thread(target=self._fan_out, daemon=True, name="event-bus-fanout")
+                self._pump.start()
 
     def unsubscribe(self, ws_send):
         """Remove a WebSocket client."""